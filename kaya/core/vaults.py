@@ -0,0 +1,53 @@
+# kaya/core/vaults.py
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+import json, re
+
+from .config import VAULTS_DIR, DEFAULT_VAULT, VAULTS_FILE
+from ..services.fs_items import FSPaths
+
+# Vault'lar: <VAULTS_DIR>/<ad>/workspace/{files,projects,agenda,media,database}
+# Listeleme sadece VAULTS_DIR'i okur; bir vault'un klasörleri ilk mount() çağrısında oluşturulur.
+_NAME_RE = re.compile(r"^[\w][\w .-]{0,63}$")
+
+@dataclass(frozen=True)
+class Vault:
+    name: str
+    root: Path
+
+    @property
+    def workspace(self) -> Path: return self.root / "workspace"
+
+    def paths(self) -> FSPaths:
+        w = self.workspace
+        return FSPaths(w / "files", w / "projects", w / "agenda", w / "media")
+
+    def exists(self) -> bool: return self.workspace.is_dir()
+
+    def mount(self) -> FSPaths:
+        """Klasörleri aç (yoksa) ve yolları döndür."""
+        p = self.paths()
+        for d in (p.files_dir, p.projects_dir, p.agenda_dir, p.media_dir): d.mkdir(parents=True, exist_ok=True)
+        return p
+
+def valid_name(name: str) -> bool:
+    return bool(_NAME_RE.match(name or "")) and name not in (".", "..")
+
+def get(name: str) -> Vault:
+    if not valid_name(name): raise ValueError(f"Invalid vault name: {name!r}")
+    return Vault(name, VAULTS_DIR / name)
+
+def names() -> list[str]:
+    """Mevcut vault'lar (workspace klasörü olanlar)."""
+    try: return sorted(d.name for d in VAULTS_DIR.iterdir() if (d / "workspace").is_dir())
+    except OSError: return []
+
+def current_name() -> str:
+    try: name = json.loads(VAULTS_FILE.read_text(encoding="utf-8")).get("current") or DEFAULT_VAULT
+    except Exception: name = DEFAULT_VAULT
+    return name if valid_name(name) else DEFAULT_VAULT
+
+def set_current(name: str):
+    VAULTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    VAULTS_FILE.write_text(json.dumps({"current": name}), encoding="utf-8")
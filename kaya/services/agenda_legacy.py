@@ -0,0 +1,228 @@
+# kaya/services/agenda_legacy.py
+from __future__ import annotations
+from datetime import date
+from pathlib import Path
+import json, os, re, threading, time
+from . import persist
+
+# Eski sürümlerin bıraktığı düzenler (öncelik sırasıyla; kanonik olan ilk sırada):
+#   journal:   journal/YYYY/MM/DD.md · journal/YYYY/MM/YYYY-MM-DD.md · YYYY-MM-DD.journal.md · journal_YYYY-MM-DD.md
+#   timeline:  timeline/YYYY-MM-DD.json · timeline/YYYY/MM/YYYY-MM-DD.json
+_ROOT_RES = [
+    ("journal", 2, re.compile(r"^(\d{4}-\d{2}-\d{2})\.journal\.md$")),
+    ("journal", 3, re.compile(r"^journal_(\d{4}-\d{2}-\d{2})\.md$")),
+]
+_JDAY_RE  = re.compile(r"^(\d{2})\.md$")
+_JFULL_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.md$")
+_TL_RE    = re.compile(r"^(\d{4}-\d{2}-\d{2})\.json$")
+_YEAR_RE  = re.compile(r"^\d{4}$")
+_MONTH_RE = re.compile(r"^\d{2}$")
+
+def _valid(day: str) -> bool:
+    try: date.fromisoformat(day); return True
+    except ValueError: return False
+
+class LayoutResolver:
+    """
+    Ajanda ağacını bir kez tarar ve {tür: {gün: [(öncelik, yol, boyut)]}} haritası kurar.
+    Harita taranan klasörlerin mtime'ları ile doğrulanır (en fazla `ttl` saniyede bir);
+    klasöre dosya eklenip silinince yeniden taranır. Aramalar diske dokunmaz.
+    """
+    def __init__(self, root: Path, ttl: float = 2.0):
+        self.root = Path(root); self.ttl = ttl
+        self._lock = threading.Lock()
+        self._map: dict[str, dict[str, list[tuple[int, Path, int]]]] | None = None
+        self._dirs: dict[Path, int] = {}
+        self._checked = 0.0
+
+    # ── tarama
+    def _scan(self):
+        found: dict[str, dict[str, list]] = {"journal": {}, "timeline": {}}
+        dirs: dict[Path, int] = {}
+        def listing(d: Path):
+            try:
+                dirs[d] = d.stat().st_mtime_ns
+                return list(os.scandir(d))
+            except OSError:
+                return []
+        def add(kind, day, prio, e):
+            if not _valid(day): return
+            try: size = e.stat().st_size
+            except OSError: return
+            found[kind].setdefault(day, []).append((prio, Path(e.path), size))
+
+        for e in listing(self.root):
+            for kind, prio, rx in _ROOT_RES:
+                m = rx.match(e.name)
+                if m and e.is_file(): add(kind, m.group(1), prio, e)
+        for e in listing(self.root / "timeline"):
+            m = _TL_RE.match(e.name)
+            if m and e.is_file(): add("timeline", m.group(1), 0, e)
+        for base, kind in ((self.root / "journal", "journal"), (self.root / "timeline", "timeline")):
+            for ye in listing(base):
+                if not (ye.is_dir() and _YEAR_RE.match(ye.name)): continue
+                for me in listing(Path(ye.path)):
+                    if not (me.is_dir() and _MONTH_RE.match(me.name)): continue
+                    for e in listing(Path(me.path)):
+                        if not e.is_file(): continue
+                        if kind == "journal":
+                            m = _JDAY_RE.match(e.name)
+                            if m: add(kind, f"{ye.name}-{me.name}-{m.group(1)}", 0, e); continue
+                            m = _JFULL_RE.match(e.name)
+                            if m: add(kind, m.group(1), 1, e)
+                        else:
+                            m = _TL_RE.match(e.name)
+                            if m: add(kind, m.group(1), 1, e)
+        for days in found.values():
+            for lst in days.values(): lst.sort(key=lambda x: x[0])
+        self._map, self._dirs = found, dirs
+
+    def _stale(self) -> bool:
+        for d, mt in self._dirs.items():
+            try:
+                if d.stat().st_mtime_ns != mt: return True
+            except OSError:
+                return True
+        # sonradan oluşan üst klasörler (timeline/, journal/ yoktu)
+        return any((self.root / n).exists() and (self.root / n) not in self._dirs for n in ("journal", "timeline"))
+
+    def _ensure(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            if self._map is None or (now - self._checked >= self.ttl and self._stale()):
+                self._scan()
+            if now - self._checked >= self.ttl: self._checked = now
+            return self._map
+
+    def invalidate(self):
+        with self._lock: self._map = None
+
+    # ── sorgular
+    def files(self, kind: str, d: date) -> list[Path]:
+        """O günün tüm dosyaları (öncelik sırasıyla)."""
+        return [p for _, p, _ in self._ensure()[kind].get(d.isoformat(), [])]
+
+    def find(self, kind: str, d: date) -> Path | None:
+        """İlk boş olmayan dosya."""
+        for _, p, size in self._ensure()[kind].get(d.isoformat(), []):
+            if size: return p
+        return None
+
+    def read(self, kind: str, d: date) -> str:
+        p = self.find(kind, d)
+        if p is None: return ""
+        try: return p.read_text(encoding="utf-8")
+        except Exception: return ""
+
+    def stamp(self, kind: str, d: date) -> int | None:
+        p = self.find(kind, d)
+        try: return p.stat().st_mtime_ns if p is not None else None
+        except OSError: return None
+
+    def days(self, kind: str) -> list[str]:
+        return sorted(day for day, lst in self._ensure()[kind].items() if any(size for _, _, size in lst))
+
+    def legacy(self) -> dict[str, dict[str, list[Path]]]:
+        """Kanonik olmayan dosyalar: {tür: {gün: [yol]}}."""
+        out = {}
+        for kind, days in self._ensure().items():
+            for day, lst in days.items():
+                old = [p for prio, p, _ in lst if prio > 0]
+                if old: out.setdefault(kind, {})[day] = old
+        return out
+
+    # ── tek seferlik birleştirme
+    def consolidate(self, store, dry: bool = False) -> list[tuple[str, str, list[Path]]]:
+        """
+        Kanonik olmayan dosyaları kanonik yere taşır ve siler.
+        journal ve timeline → store (aktif backend; yazım arka plandaki atomik yazıcıdan geçer).
+        Aynı gün için farklı içerikler birleştirilir (journal: paragraf olarak, timeline: liste birleşimi).
+        Okunamayan (utf-8 değil) ya da bozuk JSON timeline dosyaları yerinde bırakılır, silinmez.
+        Dönüş: [(tür, gün, taşınan dosyalar, bırakılan dosyalar)].
+        """
+        done, gone = [], []
+        for kind, days in sorted(self.legacy().items()):
+            for day, paths in sorted(days.items()):
+                d = date.fromisoformat(day)
+                texts, moved, kept = [], [], []
+                for p in paths:
+                    try:
+                        t = p.read_text(encoding="utf-8")
+                        if kind == "timeline" and t.strip(): json.loads(t)
+                    except Exception:
+                        kept.append(p); continue
+                    texts.append(t); moved.append(p)
+                if moved and not dry:
+                    if kind == "journal": self._merge_journal(store, d, texts)
+                    else: self._merge_timeline(store, d, texts)
+                    gone += moved
+                done.append((kind, day, moved, kept))
+        if gone:
+            persist.writer().drain()              # birleşik kayıtlar diske inmeden eski dosyalar silinmez
+            for p in gone: p.unlink(missing_ok=True)
+            for base in (self.root / "journal", self.root / "timeline"):
+                for dirpath, _, _ in sorted(os.walk(base), reverse=True):
+                    if Path(dirpath) != base:
+                        try: Path(dirpath).rmdir()   # sadece boşsa
+                        except OSError: pass
+            self.invalidate()
+        return done
+
+    @staticmethod
+    def _merge_journal(store, d: date, texts: list[str]):
+        cur = store.read("journal", d)
+        parts = [cur.strip()] if cur.strip() else []
+        for t in texts:
+            if t.strip() and t.strip() not in parts: parts.append(t.strip())
+        merged = "\n\n".join(parts)
+        if merged and merged != cur.strip(): store.write("journal", d, merged + "\n")
+
+    @staticmethod
+    def _merge_timeline(store, d: date, texts: list[str]):
+        cur = store.read("timeline", d)
+        items = []
+        for t in [cur] + texts:
+            try: data = json.loads(t) if t.strip() else []
+            except Exception: continue
+            for it in data if isinstance(data, list) else []:
+                if it not in items: items.append(it)
+        merged = json.dumps(items, ensure_ascii=False, indent=2) if items else ""
+        if merged != cur.strip(): store.write("timeline", d, merged)
+
+
+class LegacyView:
+    """
+    Salt okunur birleşik görünüm: store + eski düzen dosyaları (journal, timeline).
+    store'da kaydı olmayan günler eski dosyadan okunur; entries/scan bu günleri de listeler.
+    Aralık okumaları, arama ve todo indexleri store yerine bunu kullanır.
+    """
+    KINDS = ("journal", "timeline")
+
+    def __init__(self, store, legacy: LayoutResolver):
+        self.store, self.legacy = store, legacy
+
+    @property
+    def name(self) -> str: return self.store.name
+
+    def read(self, kind: str, d: date) -> str:
+        txt = self.store.read(kind, d)
+        return txt if txt or kind not in self.KINDS else self.legacy.read(kind, d)
+
+    def stamp(self, kind: str, d: date):
+        st = self.store.stamp(kind, d)
+        return st if st is not None or kind not in self.KINDS else self.legacy.stamp(kind, d)
+
+    def entries(self, kind: str) -> list[date]:
+        days = set(self.store.entries(kind))
+        if kind in self.KINDS: days |= {date.fromisoformat(x) for x in self.legacy.days(kind)}
+        return sorted(days)
+
+    def scan(self, kind: str, months: list[tuple[int, int]]) -> dict:
+        out = self.store.scan(kind, months)
+        if kind in self.KINDS:
+            keys = {f"{y:04d}-{m:02d}" for y, m in months}
+            for day in self.legacy.days(kind):
+                if day[:7] in keys and day not in out:
+                    st = self.legacy.stamp(kind, date.fromisoformat(day))
+                    if st is not None: out[day] = st
+        return out
@@ -0,0 +1,468 @@
+# kaya/services/agenda_store.py
+from __future__ import annotations
+from datetime import date
+from pathlib import Path
+import json, os, re, sqlite3, struct, threading, time, zlib
+
+from . import persist
+
+# Ajanda kayıt türleri (AgendaFS bunları okur/yazar)
+KINDS = ("journal", "plan", "tags", "timeline")
+BACKENDS = ("files", "packed", "sqlite")
+CONFIG_FILE = "agenda.json"          # <agenda_dir>/agenda.json → {"backend": "files" | "packed" | "sqlite"}
+
+_PLAN_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})\.md$")
+_TAGS_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})\.txt$")
+_TL_RE   = re.compile(r"^(\d{4})-(\d{2})-(\d{2})\.json$")
+_JDAY_RE = re.compile(r"^(\d{2})\.md$")
+
+def _ymd(d: date) -> str: return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+def _mkey(y: int, m: int) -> str: return f"{y:04d}-{m:02d}"
+
+def _to_date(y, m, dd) -> date | None:
+    try: return date(int(y), int(m), int(dd))
+    except ValueError: return None
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Klasik düzen: gün başına küçük dosyalar
+class FileStore:
+    """
+    Journal:  <root>/journal/YYYY/MM/DD.md
+    Plan:     <root>/YYYY-MM-DD.md
+    Tags:     <root>/tags/YYYY-MM-DD.txt
+    Timeline: <root>/timeline/YYYY-MM-DD.json
+    Boş metin için dosya açılmaz (ilk boş olmayan yazımda oluşur); boşaltılan kaydın dosyası silinir.
+    Yazım/silme arka plandaki yazıcıya (persist) gider; okuma, damga ve tarama kuyruktaki hali görür.
+    """
+    name = "files"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.wb = persist.writer()
+
+    def path(self, kind: str, d: date) -> Path:
+        if kind == "journal": return self.root / "journal" / f"{d.year:04d}" / f"{d.month:02d}" / f"{d.day:02d}.md"
+        if kind == "plan":    return self.root / f"{_ymd(d)}.md"
+        if kind == "tags":    return self.root / "tags" / f"{_ymd(d)}.txt"
+        if kind == "timeline": return self.root / "timeline" / f"{_ymd(d)}.json"
+        raise ValueError(f"Unknown agenda kind: {kind}")
+
+    def read(self, kind: str, d: date) -> str:
+        try: return self.wb.read_text(self.path(kind, d))
+        except Exception: return ""
+
+    def write(self, kind: str, d: date, txt: str) -> bool:
+        p = self.path(kind, d)
+        if not txt:
+            if not self.wb.exists(p): return False
+            self.wb.unlink(p)                 # boşaltılan bölme: 0 baytlık dosya bırakma (packed/sqlite gibi sil)
+            return True
+        self.wb.write_text(p, txt)
+        return True
+
+    def delete(self, kind: str, d: date):
+        self.wb.unlink(self.path(kind, d))
+
+    @staticmethod
+    def _pending_stamp(txt: str) -> int:
+        return -1 - zlib.crc32(txt.encode("utf-8"))      # negatif: gerçek mtime ile karışmaz
+
+    def stamp(self, kind: str, d: date) -> int | None:
+        p = self.path(kind, d)
+        txt = self.wb.pending(p)
+        if txt is not ...: return None if txt is None else self._pending_stamp(txt)
+        try: return p.stat().st_mtime_ns
+        except OSError: return None
+
+    def scan(self, kind: str, months: list[tuple[int,int]]) -> dict[str, int]:
+        """İstenen aylardaki mevcut kayıtlar {YYYY-MM-DD: stamp}; klasör başına tek listeleme."""
+        out = {}
+        if kind == "journal":
+            for y, m in months:
+                self._scan_dir(self.root / "journal" / f"{y:04d}" / f"{m:02d}", (), out,
+                               lambda n, y=y, m=m: f"{y:04d}-{m:02d}-{n[:2]}" if _JDAY_RE.match(n) else None)
+        else:
+            folder, rx = self._flat(kind)
+            self._scan_dir(folder, tuple(_mkey(y, m) + "-" for y, m in months), out,
+                           lambda n: n[:10] if rx.match(n) else None)
+        return self._overlay(kind, months, out)
+
+    def _overlay(self, kind: str, months, out: dict) -> dict:
+        """Kuyruktaki (henüz yazılmamış) kayıtlar: yeni günler eklenir, silinecekler çıkar."""
+        want = {(y, m) for y, m in months}
+        for p, txt in self.wb.pending_under(self.root):
+            k = self._day_of(kind, p)
+            if k is None or (int(k[:4]), int(k[5:7])) not in want: continue
+            if txt is None: out.pop(k, None)
+            else: out[k] = self._pending_stamp(txt)
+        return out
+
+    def _day_of(self, kind: str, p: Path) -> str | None:
+        """Kayıt yolu → YYYY-MM-DD (bu türe ait değilse None)."""
+        try: rel = p.relative_to(self.root).parts
+        except ValueError: return None
+        if kind == "journal":
+            if len(rel) == 4 and rel[0] == "journal" and _JDAY_RE.match(rel[3]): return f"{rel[1]}-{rel[2]}-{rel[3][:2]}"
+            return None
+        folder, rx = self._flat(kind)
+        return p.name[:10] if p.parent == folder and rx.match(p.name) else None
+
+    def _flat(self, kind: str) -> tuple[Path, re.Pattern]:
+        """Gün başına tek dosyalı (düz) türlerin klasörü ve dosya adı kalıbı."""
+        if kind == "plan":     return self.root, _PLAN_RE
+        if kind == "tags":     return self.root / "tags", _TAGS_RE
+        if kind == "timeline": return self.root / "timeline", _TL_RE
+        raise ValueError(f"Unknown agenda kind: {kind}")
+
+    @staticmethod
+    def _scan_dir(folder: Path, prefixes: tuple[str,...], out: dict, keyf):
+        try:
+            with os.scandir(folder) as it:
+                for e in it:
+                    if prefixes and not e.name.startswith(prefixes): continue
+                    k = keyf(e.name)
+                    if not k: continue
+                    try: out[k] = e.stat().st_mtime_ns   # sadece eşleşen dosyalar stat edilir
+                    except OSError: pass
+        except OSError:
+            pass
+
+    def entries(self, kind: str):
+        """Bu düzendeki tüm kayıtların tarihleri."""
+        if kind == "journal":
+            jr = self.root / "journal"
+            for yd in sorted(jr.glob("[0-9][0-9][0-9][0-9]")):
+                for md in sorted(yd.glob("[0-9][0-9]")):
+                    for f in sorted(md.iterdir()):
+                        if _JDAY_RE.match(f.name):
+                            d = _to_date(yd.name, md.name, f.name[:2])
+                            if d: yield d
+            return
+        folder, rx = self._flat(kind)
+        if not folder.exists(): return
+        for f in sorted(folder.iterdir()):
+            mt = rx.match(f.name)
+            if mt and f.is_file():
+                d = _to_date(*mt.groups())
+                if d: yield d
+
+    def sync(self): self.wb.drain()
+
+    def close(self): pass
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Paketli düzen: ay başına tek dosya
+_MAGIC = b"KPK1"
+_HDR = struct.Struct("<BBI")                  # kind kodu, gün, payload uzunluğu
+_CODE = {"journal": 1, "plan": 2, "tags": 3, "timeline": 4}
+
+class _Pack:
+    """Tek ay dosyasının bellek içi ofset tablosu: {(kod, gün): (ofset, uzunluk)}."""
+    __slots__ = ("path", "sig", "table", "end", "dead")
+    def __init__(self, path: Path):
+        self.path = path; self.sig = None; self.table = {}; self.end = 0; self.dead = 0
+
+class PackedStore:
+    """
+    <root>/packed/YYYY-MM.kpk — ay başına ekleme-dostu tek konteyner.
+
+    Dosya: "KPK1" + kayıtlar [kod:u8][gün:u8][uzunluk:u32][utf-8 metin].
+    Yazım her zaman sona eklenir; aynı (tür, gün) için son kayıt geçerlidir, boş kayıt silme
+    anlamına gelir. Açılışta sadece başlıklar okunarak ofset tablosu kurulur (payload'lar
+    atlanır); rastgele erişim tek seek + read. Ölü bayt canlı veriyi geçince dosya
+    geçici dosya + rename ile sıkıştırılır. Kayıt damgası = kaydın ofseti (her yazımda artar).
+    """
+    name = "packed"
+    COMPACT_MIN = 64 * 1024
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.dir = self.root / "packed"
+        self._packs: dict[str, _Pack] = {}
+        self._lock = threading.RLock()
+
+    def _pack(self, y: int, m: int) -> _Pack:
+        key = _mkey(y, m)
+        pk = self._packs.get(key)
+        if pk is None:
+            pk = self._packs[key] = _Pack(self.dir / f"{key}.kpk")
+        try:
+            st = pk.path.stat(); sig = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            sig = None
+        if sig != pk.sig:
+            self._load(pk); pk.sig = sig
+        return pk
+
+    def _load(self, pk: _Pack):
+        pk.table = {}; pk.end = 0; pk.dead = 0
+        try: f = open(pk.path, "rb")
+        except OSError: return
+        with f:
+            if f.read(len(_MAGIC)) != _MAGIC: return
+            size = os.fstat(f.fileno()).st_size
+            off = len(_MAGIC); pk.end = off
+            while True:
+                h = f.read(_HDR.size)
+                if len(h) < _HDR.size: break
+                code, day, n = _HDR.unpack(h)
+                if off + _HDR.size + n > size: break        # yarım kalmış kayıt (çökme)
+                f.seek(n, os.SEEK_CUR)
+                old = pk.table.pop((code, day), None)
+                if old: pk.dead += _HDR.size + old[1]
+                if n: pk.table[(code, day)] = (off + _HDR.size, n)
+                else: pk.dead += _HDR.size
+                off += _HDR.size + n; pk.end = off
+
+    def read(self, kind: str, d: date) -> str:
+        with self._lock:
+            pk = self._pack(d.year, d.month)
+            loc = pk.table.get((_CODE[kind], d.day))
+            if not loc: return ""
+            try:
+                with open(pk.path, "rb") as f:
+                    f.seek(loc[0]); return f.read(loc[1]).decode("utf-8")
+            except OSError:
+                return ""
+
+    def write(self, kind: str, d: date, txt: str) -> bool:
+        with self._lock:
+            pk = self._pack(d.year, d.month)
+            key = (_CODE[kind], d.day)
+            if not txt and key not in pk.table: return False
+            data = txt.encode("utf-8")
+            self.dir.mkdir(parents=True, exist_ok=True)
+            with open(pk.path, "r+b" if pk.path.exists() else "w+b") as f:
+                if pk.end == 0:
+                    f.truncate(0); f.write(_MAGIC); pk.end = len(_MAGIC)
+                f.truncate(pk.end)                  # yarım kalmış kuyruk varsa at
+                f.seek(pk.end); f.write(_HDR.pack(key[0], key[1], len(data))); f.write(data)
+            old = pk.table.pop(key, None)
+            if old: pk.dead += _HDR.size + old[1]
+            if data: pk.table[key] = (pk.end + _HDR.size, len(data))
+            else: pk.dead += _HDR.size
+            pk.end += _HDR.size + len(data)
+            st = pk.path.stat(); pk.sig = (st.st_mtime_ns, st.st_size)
+            if pk.dead > self.COMPACT_MIN and pk.dead > pk.end - pk.dead:
+                self._compact(pk)
+            return True
+
+    def delete(self, kind: str, d: date):
+        self.write(kind, d, "")
+
+    def _compact(self, pk: _Pack):
+        tmp = pk.path.with_suffix(".kpk.tmp")
+        with open(pk.path, "rb") as src, open(tmp, "wb") as dst:
+            dst.write(_MAGIC); off = len(_MAGIC); table = {}
+            for key, (o, n) in sorted(pk.table.items(), key=lambda kv: kv[1][0]):
+                src.seek(o); data = src.read(n)
+                dst.write(_HDR.pack(key[0], key[1], n)); dst.write(data)
+                table[key] = (off + _HDR.size, n); off += _HDR.size + n
+        os.replace(tmp, pk.path)
+        st = pk.path.stat()
+        pk.table = table; pk.end = off; pk.dead = 0; pk.sig = (st.st_mtime_ns, st.st_size)
+
+    def stamp(self, kind: str, d: date) -> int | None:
+        with self._lock:
+            loc = self._pack(d.year, d.month).table.get((_CODE[kind], d.day))
+            return loc[0] if loc else None
+
+    def scan(self, kind: str, months: list[tuple[int,int]]) -> dict[str, int]:
+        code = _CODE[kind]; out = {}
+        with self._lock:
+            for y, m in months:
+                for (c, day), (o, _n) in self._pack(y, m).table.items():
+                    if c == code: out[f"{y:04d}-{m:02d}-{day:02d}"] = o
+        return out
+
+    def entries(self, kind: str):
+        code = _CODE[kind]
+        if not self.dir.exists(): return
+        for f in sorted(self.dir.glob("[0-9][0-9][0-9][0-9]-[0-9][0-9].kpk")):
+            y, m = int(f.stem[:4]), int(f.stem[5:7])
+            with self._lock: days = sorted(day for c, day in self._pack(y, m).table if c == code)
+            for day in days:
+                d = _to_date(y, m, day)
+                if d: yield d
+
+    def remove_all(self):
+        """Tüm ay dosyalarını sil (geri taşıma sonrası)."""
+        with self._lock:
+            for f in self.dir.glob("*.kpk"): f.unlink(missing_ok=True)
+            self._packs.clear()
+            try: self.dir.rmdir()
+            except OSError: pass
+
+    def close(self):
+        with self._lock: self._packs.clear()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# SQLite: <workspace>/database/kaya.db içinde tablolar + FTS5
+SQL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agenda_entries(
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,          -- YYYY-MM-DD
+    kind TEXT NOT NULL,         -- journal | plan | tags | timeline
+    body TEXT NOT NULL,
+    rev INTEGER NOT NULL,       -- yazım damgası (time_ns)
+    UNIQUE(kind, day)
+);
+CREATE INDEX IF NOT EXISTS idx_agenda_entries_day ON agenda_entries(day);
+CREATE TABLE IF NOT EXISTS agenda_tags(
+    day TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_agenda_tags_tag_day ON agenda_tags(tag, day);
+CREATE INDEX IF NOT EXISTS idx_agenda_tags_day ON agenda_tags(day);
+CREATE VIRTUAL TABLE IF NOT EXISTS agenda_fts USING fts5(
+    body, content='agenda_entries', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS trg_agenda_ai AFTER INSERT ON agenda_entries BEGIN
+  INSERT INTO agenda_fts(rowid, body) VALUES (new.id, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_agenda_ad AFTER DELETE ON agenda_entries BEGIN
+  INSERT INTO agenda_fts(agenda_fts, rowid, body) VALUES ('delete', old.id, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_agenda_au AFTER UPDATE ON agenda_entries BEGIN
+  INSERT INTO agenda_fts(agenda_fts, rowid, body) VALUES ('delete', old.id, old.body);
+  INSERT INTO agenda_fts(rowid, body) VALUES (new.id, new.body);
+END;
+"""
+
+class SQLiteStore:
+    """
+    Kayıtlar workspace'in kaya.db dosyasında: agenda_entries (+ tarih indexi),
+    agenda_tags (tag, gün indexli; aralık sorguları için) ve agenda_fts (tam metin).
+    Bağlantı arka plan ön-yükleme thread'leriyle paylaşıldığı için kilitle korunur.
+    """
+    name = "sqlite"
+
+    def __init__(self, root: Path, db_path: Path | None = None, parse_tags=None):
+        self.root = Path(root)
+        self.db_path = Path(db_path) if db_path else self.root.parent / "database" / "kaya.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.parse_tags = parse_tags or (lambda txt: [])
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.executescript(SQL_SCHEMA)
+        self.conn.commit()
+
+    def read(self, kind: str, d: date) -> str:
+        with self._lock:
+            row = self.conn.execute("SELECT body FROM agenda_entries WHERE kind=? AND day=?", (kind, _ymd(d))).fetchone()
+        return row[0] if row else ""
+
+    def write(self, kind: str, d: date, txt: str) -> bool:
+        day = _ymd(d)
+        with self._lock, self.conn:
+            if not txt:
+                cur = self.conn.execute("DELETE FROM agenda_entries WHERE kind=? AND day=?", (kind, day))
+                if kind == "tags": self.conn.execute("DELETE FROM agenda_tags WHERE day=?", (day,))
+                return cur.rowcount > 0
+            self.conn.execute(
+                "INSERT INTO agenda_entries(day, kind, body, rev) VALUES(?,?,?,?) "
+                "ON CONFLICT(kind, day) DO UPDATE SET body=excluded.body, rev=excluded.rev",
+                (day, kind, txt, time.time_ns()))
+            if kind == "tags":
+                self.conn.execute("DELETE FROM agenda_tags WHERE day=?", (day,))
+                self.conn.executemany("INSERT INTO agenda_tags(day, tag, text) VALUES(?,?,?)",
+                                      [(day, tg, tx) for tg, tx in self.parse_tags(txt)])
+        return True
+
+    def delete(self, kind: str, d: date):
+        self.write(kind, d, "")
+
+    def stamp(self, kind: str, d: date) -> int | None:
+        with self._lock:
+            row = self.conn.execute("SELECT rev FROM agenda_entries WHERE kind=? AND day=?", (kind, _ymd(d))).fetchone()
+        return row[0] if row else None
+
+    def scan(self, kind: str, months: list[tuple[int,int]]) -> dict[str, int]:
+        out = {}
+        with self._lock:
+            for y, m in months:
+                k = _mkey(y, m)
+                out.update(self.conn.execute(
+                    "SELECT day, rev FROM agenda_entries WHERE kind=? AND day BETWEEN ? AND ?",
+                    (kind, k + "-01", k + "-31")).fetchall())
+        return out
+
+    def entries(self, kind: str):
+        with self._lock:
+            days = [r[0] for r in self.conn.execute("SELECT day FROM agenda_entries WHERE kind=? ORDER BY day", (kind,))]
+        for day in days:
+            yield date.fromisoformat(day)
+
+    # indexli sorgular
+    def search(self, query: str, kinds=None, limit: int = 50) -> list[tuple[str, str, str]]:
+        """FTS5 tam metin araması → [(gün, tür, snippet)], en alakalı önce."""
+        sql = ("SELECT e.day, e.kind, snippet(agenda_fts, 0, '[', ']', '…', 12) FROM agenda_fts "
+               "JOIN agenda_entries e ON e.id = agenda_fts.rowid WHERE agenda_fts MATCH ?")
+        args: list = [query]
+        if kinds:
+            sql += " AND e.kind IN (%s)" % ",".join("?" * len(kinds)); args += list(kinds)
+        sql += " ORDER BY rank LIMIT ?"; args.append(limit)
+        with self._lock:
+            return self.conn.execute(sql, args).fetchall()
+
+    def tag_range(self, tag: str | None, start: date, end: date) -> list[tuple[str, str, str]]:
+        """(tag, gün) indexinden aralık sorgusu → [(gün, tag, metin)]."""
+        sql, args = "SELECT day, tag, text FROM agenda_tags WHERE day BETWEEN ? AND ?", [_ymd(start), _ymd(end)]
+        if tag:
+            sql += " AND tag=?"; args.append(tag)
+        with self._lock:
+            return self.conn.execute(sql + " ORDER BY day", args).fetchall()
+
+    def remove_all(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM agenda_entries")
+            self.conn.execute("DELETE FROM agenda_tags")
+
+    def close(self):
+        with self._lock:
+            try: self.conn.close()
+            except Exception: pass
+
+# ────────────────────────────────────────────────────────────────────────────────
+# seçim / taşıma
+def read_config(root: Path) -> dict:
+    try: return json.loads((Path(root) / CONFIG_FILE).read_text(encoding="utf-8"))
+    except Exception: return {}
+
+def write_config(root: Path, **kv):
+    cfg = read_config(root); cfg.update(kv)
+    (Path(root) / CONFIG_FILE).write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
+
+def make_store(root: Path, backend: str, parse_tags=None):
+    if backend == "sqlite": return SQLiteStore(root, parse_tags=parse_tags)
+    if backend == "packed": return PackedStore(root)
+    if backend == "files":  return FileStore(root)
+    raise ValueError(f"Unknown agenda backend: {backend}")
+
+def open_store(root: Path, parse_tags=None):
+    """<agenda_dir>/agenda.json'daki backend'i aç (yoksa klasik dosya düzeni)."""
+    return make_store(root, read_config(root).get("backend") or "files", parse_tags=parse_tags)
+
+def migrate(src, dst, remove_source: bool = False) -> int:
+    """src → dst tüm kayıtları kopyalar, geri okuyarak doğrular; istenirse kaynağı temizler."""
+    n = 0; moved = []
+    for kind in KINDS:
+        for d in list(src.entries(kind)):
+            txt = src.read(kind, d)
+            if not txt: continue
+            dst.write(kind, d, txt)
+            moved.append((kind, d)); n += 1
+    if hasattr(dst, "sync"): dst.sync()           # arka plan yazımları diske insin, doğrulama diskten
+    for kind, d in moved:
+        if dst.read(kind, d) != src.read(kind, d):
+            raise IOError(f"Verification failed for {kind} {_ymd(d)}")
+    if remove_source:
+        if hasattr(src, "remove_all"): src.remove_all()
+        else:
+            for kind, d in moved: src.delete(kind, d)
+    return n
+
+def export_files(src, target: Path) -> int:
+    """Herhangi bir backend'i klasik dosya düzenine (journal/, tags/, timeline/, YYYY-MM-DD.md) dışa aktar."""
+    return migrate(src, FileStore(target))
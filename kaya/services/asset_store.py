@@ -0,0 +1,265 @@
+# kaya/services/asset_store.py
+from __future__ import annotations
+from pathlib import Path
+import hashlib, os, re, shutil, sqlite3, stat, threading, time, uuid
+
+# İçerik adresli varlık deposu: <workspace>/assets/<ab>/<özet><uzantı>
+#   özet = blake2b-160 (40 hex), ilk iki hane klasör; aynı içerik bir kez yazılır
+#   notlar blob'a göreli yol ile bağlanır (../assets/ab/abcd….png) — yol içerik değişmedikçe sabit
+#   blob'lar salt okunur; galeriye sabit bağlantı (hardlink) ile konur, yerinde düzenleme blob'u bozamaz
+# Referans sayımı: <workspace>/database/assets.db
+#   docs(doc, stamp)     metin belgeleri (göreli yol + mtime/boyut damgası)
+#   refs(doc, digest)    belgedeki blob referansları
+#   sayım = referans veren belge sayısı + (hardlink sayısı - 1); sıfır olan blob'lar collect() ile silinir
+CHUNK = 1 << 20
+TEXT_EXTS = {".md", ".markdown", ".txt"}
+SKIP_DIRS = {"assets", "database", "media"}
+
+SQL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs(doc TEXT PRIMARY KEY, stamp TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS refs(doc TEXT NOT NULL, digest TEXT NOT NULL, PRIMARY KEY(doc, digest));
+CREATE INDEX IF NOT EXISTS idx_refs_digest ON refs(digest);
+"""
+
+_REF_RE = re.compile(r"assets/[0-9a-f]{2}/([0-9a-f]{40})")
+_BLOB_RE = re.compile(r"^([0-9a-f]{40})(\.[\w]+)?$")
+
+def refs_in(text: str) -> set[str]:
+    return set(_REF_RE.findall(text))
+
+def file_digest(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK): h.update(chunk)
+    return h.hexdigest()
+
+class AssetStore:
+    """
+    put(kaynak) → blob yolu. Kaynak tek geçişte parça parça okunur: aynı anda özet hesaplanır ve
+    gizli geçici dosyaya yazılır; blob zaten varsa geçici dosya atılır (sadece mtime tazelenir).
+    Referans indexi artımlıdır: apply() izleyici olaylarıyla belge başına, reindex() damgalarla günceller.
+    """
+    GRACE = 3600.0          # yeni / yeniden kullanılan blob'lar bu süre toplanmaz (not henüz kaydedilmemiş olabilir)
+
+    def __init__(self, workspace: Path, db_path: Path | None = None):
+        self.workspace = Path(workspace)
+        self.root = self.workspace / "assets"
+        self.db_path = Path(db_path) if db_path else self.workspace / "database" / "assets.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.executescript(SQL_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self._lock: self.conn.close()
+
+    # ── blob'lar
+    def find(self, digest: str) -> Path | None:
+        d = self.root / digest[:2]
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.name.startswith(digest): return Path(e.path)
+        except OSError:
+            pass
+        return None
+
+    def put(self, src: Path) -> Path:
+        """Dosyayı depoya al (aynı içerik varsa yeniden yazmaz)."""
+        with open(src, "rb") as f:
+            return self.put_stream(f, Path(src).suffix)
+
+    def put_stream(self, fp, ext: str = "") -> Path:
+        tmp_dir = self.root / ".tmp"; tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp = tmp_dir / f"{uuid.uuid4().hex}.part"
+        h = hashlib.blake2b(digest_size=20)
+        try:
+            with open(tmp, "wb") as out:
+                while chunk := fp.read(CHUNK):
+                    h.update(chunk); out.write(chunk)
+                out.flush(); os.fsync(out.fileno())
+            digest = h.hexdigest()
+            have = self.find(digest)
+            if have is not None:
+                tmp.unlink(); os.utime(have)           # yeniden kullanım: toplama süresini tazele
+                return have
+            dst = self.root / digest[:2] / f"{digest}{ext.lower()}"
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp, dst)
+            return dst
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def link(self, blob: Path, dst: Path) -> Path:
+        """Blob'u dst'ye sabit bağlantı olarak koy (olmazsa parça parça kopya)."""
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        try: os.link(blob, dst)
+        except OSError:
+            with open(blob, "rb") as fi, open(dst, "wb") as fo: shutil.copyfileobj(fi, fo, CHUNK)
+        return dst
+
+    def import_into(self, src: Path, folder: Path, blob: Path | None = None) -> Path:
+        """Galeri içe aktarımı: klasörde aynı içerik varsa onu döndür, yoksa blob'u bağla."""
+        blob = blob or self.put(src)
+        digest = _BLOB_RE.match(blob.name).group(1)
+        size = blob.stat().st_size
+        try:
+            for e in os.scandir(folder):
+                if not e.is_file() or e.stat().st_size != size: continue
+                if os.path.samefile(e.path, blob) or file_digest(Path(e.path)) == digest: return Path(e.path)
+        except OSError:
+            pass
+        dst = folder / Path(src).name
+        i = 1
+        while dst.exists():
+            dst = folder / f"{Path(src).stem}_{i}{Path(src).suffix}"; i += 1
+        return self.link(blob, dst)
+
+    def ref(self, blob: Path, note: Path) -> str:
+        """Nottan blob'a göreli (markdown) yol."""
+        return Path(os.path.relpath(blob, Path(note).parent)).as_posix()
+
+    def blobs(self):
+        """(özet, yol, stat) — tüm blob'lar."""
+        if not self.root.is_dir(): return
+        for shard in os.scandir(self.root):
+            if not shard.is_dir() or shard.name.startswith("."): continue
+            for e in os.scandir(shard.path):
+                m = _BLOB_RE.match(e.name)
+                if m:
+                    try: yield m.group(1), Path(e.path), e.stat()
+                    except OSError: pass
+
+    # ── referans indexi
+    def _doc(self, path: Path) -> str | None:
+        try: rel = Path(path).relative_to(self.workspace)
+        except ValueError: return None
+        if not rel.parts or rel.parts[0] in SKIP_DIRS or any(p.startswith(".") for p in rel.parts): return None
+        return rel.as_posix() if rel.suffix.lower() in TEXT_EXTS else None
+
+    def _walk(self) -> dict[str, tuple[str, Path]]:
+        out = {}; stack = [self.workspace]
+        while stack:
+            d = stack.pop()
+            try: it = list(os.scandir(d))
+            except OSError: continue
+            for e in it:
+                if e.name.startswith("."): continue
+                if e.is_dir(follow_symlinks=False):
+                    if d != self.workspace or e.name not in SKIP_DIRS: stack.append(Path(e.path))
+                    continue
+                if os.path.splitext(e.name)[1].lower() not in TEXT_EXTS: continue
+                try: st = e.stat()
+                except OSError: continue
+                p = Path(e.path)
+                out[p.relative_to(self.workspace).as_posix()] = (f"{st.st_mtime_ns}:{st.st_size}", p)
+        return out
+
+    def _set_refs(self, doc: str, stamp: str, digests):
+        self.conn.execute("DELETE FROM refs WHERE doc=?", (doc,))
+        self.conn.executemany("INSERT INTO refs(doc, digest) VALUES(?,?)", [(doc, g) for g in digests])
+        self.conn.execute("INSERT INTO docs(doc, stamp) VALUES(?,?) ON CONFLICT(doc) DO UPDATE SET stamp=excluded.stamp", (doc, stamp))
+
+    def _drop_doc(self, doc: str):
+        self.conn.execute("DELETE FROM refs WHERE doc=?", (doc,))
+        self.conn.execute("DELETE FROM docs WHERE doc=?", (doc,))
+
+    def reindex(self) -> int:
+        """Belgeleri damgalarla doğrula; sadece değişenleri yeniden tara. Değişen belge sayısı."""
+        found = self._walk()
+        with self._lock, self.conn:
+            have = dict(self.conn.execute("SELECT doc, stamp FROM docs"))
+            gone = [d for d in have if d not in found]
+            for doc in gone: self._drop_doc(doc)
+            todo = [(doc, st, p) for doc, (st, p) in found.items() if have.get(doc) != st]
+            for doc, st, p in todo:
+                try: txt = p.read_text(encoding="utf-8", errors="replace")
+                except OSError: continue
+                self._set_refs(doc, st, refs_in(txt))
+        return len(gone) + len(todo)
+
+    def touch(self, path: Path):
+        doc = self._doc(path)
+        if doc is None: return
+        try:
+            st = Path(path).stat(); txt = Path(path).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            with self._lock, self.conn: self._drop_doc(doc)
+            return
+        with self._lock, self.conn: self._set_refs(doc, f"{st.st_mtime_ns}:{st.st_size}", refs_in(txt))
+
+    def drop(self, path: Path):
+        try: rel = Path(path).relative_to(self.workspace).as_posix()
+        except ValueError: return
+        pre = rel.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%"
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM refs WHERE doc=? OR doc LIKE ? ESCAPE '\\'", (rel, pre))
+            self.conn.execute("DELETE FROM docs WHERE doc=? OR doc LIKE ? ESCAPE '\\'", (rel, pre))
+
+    def apply(self, events):
+        """Vault izleyicisi partisi: değişen metin belgelerinin referanslarını güncelle."""
+        for e in events:
+            if e.src is not None: self.drop(e.src)
+            if e.kind == "deleted": self.drop(e.path)
+            elif e.is_dir:
+                if e.kind == "moved":                       # yeni klasörün çocukları ayrıca bildirilir
+                    for p in Path(e.path).rglob("*"):
+                        if p.is_file(): self.touch(p)
+            else: self.touch(e.path)
+
+    def refcounts(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.conn.execute("SELECT digest, COUNT(*) FROM refs GROUP BY digest"))
+
+    def refs_of(self, digest: str) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT doc FROM refs WHERE digest=? ORDER BY doc", (digest,))]
+
+    # ── toplama
+    def collect(self, dry: bool = False, grace: float | None = None, keep=()) -> tuple[int, int]:
+        """Referanssız blob'ları sil → (silinen, bayt). Önce index doğrulanır; keep: dosya dışı kaynaklardaki özetler."""
+        self.reindex()
+        counts = self.refcounts()
+        for g in keep: counts[g] = counts.get(g, 0) + 1
+        grace = self.GRACE if grace is None else grace
+        now = time.time(); n = size = 0
+        for digest, p, st in list(self.blobs()):
+            if counts.get(digest) or st.st_nlink > 1 or now - st.st_mtime < grace: continue
+            n += 1; size += st.st_size
+            if not dry:
+                try: os.chmod(p, stat.S_IWUSR | stat.S_IRUSR); p.unlink()
+                except OSError: n -= 1; size -= st.st_size
+        if not dry:
+            for d in (self.root.iterdir() if self.root.is_dir() else ()):
+                if d.name == ".tmp":
+                    for t in d.glob("*.part"):
+                        try:
+                            if now - t.stat().st_mtime > grace: t.unlink()
+                        except OSError: pass
+                elif d.is_dir():
+                    try: d.rmdir()                      # sadece boşsa
+                    except OSError: pass
+        return n, size
+
+    def stats(self) -> dict[str, int]:
+        self.reindex()
+        counts = self.refcounts()
+        blobs = list(self.blobs())
+        return {"blobs": len(blobs), "bytes": sum(st.st_size for _, _, st in blobs),
+                "referenced": sum(1 for g, _, st in blobs if counts.get(g) or st.st_nlink > 1),
+                "refs": sum(counts.values())}
+
+_stores: dict[Path, AssetStore] = {}
+
+def store_for(workspace: Path) -> AssetStore:
+    """Workspace başına tek depo."""
+    key = Path(workspace).resolve()
+    if key not in _stores: _stores[key] = AssetStore(key)
+    return _stores[key]
+
+def close_store(workspace: Path):
+    st = _stores.pop(Path(workspace).resolve(), None)
+    if st is not None: st.close()
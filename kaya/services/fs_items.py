@@ -13,7 +13,8 @@ class FSService:
         path.parent.mkdir(parents=True, exist_ok=True)
         if not path.exists(): path.write_text('', encoding='utf-8')
         return path
-    def day_note(self, ymd:str)->Path: return self.ensure_note(self.p.agenda_dir/f"{ymd}.md")
+    def day_note(self, ymd:str)->Path: return self.ensure_note(self.day_note_path(ymd))
+    def day_note_path(self, ymd:str)->Path: return self.p.agenda_dir/f"{ymd}.md"
     def new_note(self, rel:str, body:str='')->Path:
         q=(self.p.files_dir/rel).with_suffix('.md'); q.parent.mkdir(parents=True, exist_ok=True); q.write_text(body,encoding='utf-8'); return q
     def new_folder(self, rel:str)->Path:
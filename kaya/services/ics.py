@@ -0,0 +1,121 @@
+# kaya/services/ics.py
+from __future__ import annotations
+from datetime import date, datetime, timezone
+import hashlib
+
+# Akış halinde iCalendar (RFC 5545) okuma/yazma; sadece VEVENT ve ajandanın kullandığı alanlar.
+#   okuma: dosya satır satır okunur (katlanmış satırlar birleştirilir), olay başına bir dict üretilir
+#   yazma: olaylar tek tek yazılır, satırlar 75 oktette katlanır
+
+def _unescape(v: str) -> str:
+    out, i = [], 0
+    while i < len(v):
+        c = v[i]
+        if c == "\\" and i + 1 < len(v):
+            n = v[i + 1]; out.append("\n" if n in "nN" else n); i += 2; continue
+        out.append(c); i += 1
+    return "".join(out)
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+def _unfold(fp):
+    """Katlanmış satırları birleştirerek mantıksal satırlar üretir (dosya belleğe alınmaz)."""
+    cur = None
+    for raw in fp:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and cur is not None:
+            cur += line[1:]; continue
+        if cur is not None: yield cur
+        cur = line
+    if cur is not None: yield cur
+
+def _split(line: str) -> tuple[str, dict, str]:
+    """ "DTSTART;TZID=Europe/Istanbul:20251019T150000" → ("DTSTART", {"TZID": ...}, "20251019T150000")"""
+    head, _, value = line.partition(":")
+    while head.count('"') % 2:                      # tırnaklı parametre içinde ':' olabilir
+        more, _, value = value.partition(":"); head += ":" + more
+    name, *params = head.split(";")
+    return name.upper(), {k.upper(): v.strip('"') for k, _, v in (p.partition("=") for p in params)}, value
+
+def parse_when(value: str, params: dict) -> date | datetime | None:
+    """DATE → date, DATE-TIME → yerel (naive) datetime."""
+    v = value.strip()
+    try:
+        if params.get("VALUE", "").upper() == "DATE" or len(v) == 8:
+            return date(int(v[:4]), int(v[4:6]), int(v[6:8]))
+        dt = datetime(int(v[:4]), int(v[4:6]), int(v[6:8]), int(v[9:11]), int(v[11:13]), int(v[13:15] or 0))
+    except (ValueError, IndexError):
+        return None
+    if v.endswith("Z"):
+        return dt.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    if params.get("TZID"):
+        try:
+            from zoneinfo import ZoneInfo
+            return dt.replace(tzinfo=ZoneInfo(params["TZID"])).astimezone().replace(tzinfo=None)
+        except Exception:
+            pass
+    return dt
+
+def iter_events(fp):
+    """VEVENT'leri sırayla üret: {"summary","description","categories","uid","start","end"}."""
+    ev = None; depth = 0
+    for line in _unfold(fp):
+        if not line: continue
+        name, params, value = _split(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT" and ev is None: ev = {"categories": []}; depth = 0
+            elif ev is not None: depth += 1             # VALARM vb. iç bileşenler
+            continue
+        if name == "END":
+            if ev is not None and depth: depth -= 1; continue
+            if ev is not None and value.upper() == "VEVENT":
+                if ev.get("start") is not None: yield ev
+                ev = None
+            continue
+        if ev is None or depth: continue
+        if name == "SUMMARY": ev["summary"] = _unescape(value).strip()
+        elif name == "DESCRIPTION": ev["description"] = _unescape(value)
+        elif name == "UID": ev["uid"] = value.strip()
+        elif name == "CATEGORIES": ev["categories"] += [c.strip().lower() for c in _unescape(value).split(",") if c.strip()]
+        elif name == "DTSTART": ev["start"] = parse_when(value, params)
+        elif name == "DTEND": ev["end"] = parse_when(value, params)
+
+# ────────────────────────────────────────────────────────────────────────────────
+def _fold(line: str) -> str:
+    b = line.encode("utf-8")
+    if len(b) <= 75: return line + "\r\n"
+    parts, cur = [], b""
+    for ch in line:
+        e = ch.encode("utf-8")
+        if len(cur) + len(e) > (75 if not parts else 74):
+            parts.append(cur.decode("utf-8")); cur = b""
+        cur += e
+    parts.append(cur.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+class Writer:
+    """with Writer(f, prodid) as w: w.event(...)"""
+    def __init__(self, fp, prodid: str = "-//KAYA//Agenda//EN"):
+        self.fp = fp; self.prodid = prodid; self.count = 0
+        self._stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    def __enter__(self):
+        for ln in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{self.prodid}", "CALSCALE:GREGORIAN"):
+            self.fp.write(_fold(ln))
+        return self
+
+    def __exit__(self, *exc):
+        self.fp.write(_fold("END:VCALENDAR"))
+
+    def event(self, summary: str, start: date | datetime, end: date | datetime | None = None,
+              categories=(), description: str = "", uid: str | None = None):
+        fmt = lambda x: (f";VALUE=DATE:{x:%Y%m%d}" if not isinstance(x, datetime) else f":{x:%Y%m%dT%H%M%S}")
+        uid = uid or hashlib.blake2b(f"{start}|{summary}|{','.join(categories)}".encode("utf-8"), digest_size=10).hexdigest() + "@kaya"
+        lines = ["BEGIN:VEVENT", f"UID:{uid}", f"DTSTAMP:{self._stamp}", "DTSTART" + fmt(start)]
+        if end is not None: lines.append("DTEND" + fmt(end))
+        lines.append(f"SUMMARY:{_escape(summary)}")
+        if categories: lines.append("CATEGORIES:" + ",".join(_escape(c.upper()) for c in categories))
+        if description: lines.append(f"DESCRIPTION:{_escape(description)}")
+        lines.append("END:VEVENT")
+        self.fp.write("".join(_fold(ln) for ln in lines)); self.count += 1
@@ -0,0 +1,186 @@
+# kaya/services/persist.py
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+import os, threading, time
+from PySide6 import QtCore
+
+# Arka planda yazım (write-behind). Editörler diske doğrudan yazmaz:
+#   write_later(yol, metin_üretici)   debounce; süre dolunca metin UI thread'inde alınır, kuyruğa girer
+#   write_text(yol, metin)            hemen kuyruğa
+#   submit(anahtar, fn)               genel iş (ör. veritabanı güncellemesi), yazıcı thread'inde çalışır
+# Aynı yol/anahtar için kuyruktaki eski iş yenisiyle değiştirilir (birleştirme). Dosyalar atomik yazılır:
+# aynı klasörde gizli geçici dosya → fsync → os.replace; yarım kalan yazım notu bozmaz.
+# Uygulama kapanırken (aboutToQuit) önce flush kancaları, sonra bekleyen debounce'lar, sonra kuyruk boşaltılır.
+
+def atomic_write_text(path: Path, txt: str, encoding: str = "utf-8"):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.parent / f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "w", encoding=encoding, newline="") as f:
+            f.write(txt); f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try: tmp.unlink()
+        except OSError: pass
+        raise
+
+class WriteBehind(QtCore.QObject):
+    failed = QtCore.Signal(str, str)     # (anahtar/yol, hata)  — yazıcı thread'inden, kuyruklu bağlantı
+    written = QtCore.Signal(str)         # (anahtar/yol)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._jobs: OrderedDict = OrderedDict()        # anahtar → ("text", yol, metin) | ("unlink", yol) | ("call", fn)
+        self._cond = threading.Condition()
+        self._busy = None                              # yazılmakta olan (anahtar, iş)
+        self._later: dict = {}                         # anahtar → (zaman, üretici)
+        self._hooks: list = []
+        self._timer = QtCore.QTimer(self); self._timer.setSingleShot(True); self._timer.timeout.connect(self._fire_due)
+        self._thread = threading.Thread(target=self._run, name="kaya-writer", daemon=True)
+        self._thread.start()
+        app = QtCore.QCoreApplication.instance()
+        if app is not None: app.aboutToQuit.connect(self.flush)
+
+    # ── kuyruk
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.abspath(str(path))
+
+    def _put(self, key, job):
+        with self._cond:
+            self._jobs.pop(key, None); self._jobs[key] = job   # birleştir: en son iş, sona
+            self._cond.notify()
+
+    def write_text(self, path: Path, txt: str):
+        key = self._key(path); self._later.pop(key, None)
+        self._put(key, ("text", Path(path), txt))
+
+    def unlink(self, path: Path):
+        key = self._key(path); self._later.pop(key, None)
+        self._put(key, ("unlink", Path(path)))
+
+    def submit(self, key, fn):
+        self._later.pop(key, None)
+        self._put(key, ("call", fn))
+
+    # ── debounce (UI thread)
+    def write_later(self, path: Path, produce, delay: int = 600):
+        """produce() → metin; süre dolunca (ya da fire/flush ile) çağrılır."""
+        p = Path(path)
+        self._schedule(self._key(p), lambda: ("text", p, produce()), delay)
+
+    def submit_later(self, key, make_fn, delay: int = 600):
+        """make_fn() → fn; süre dolunca fn yazıcı thread'ine verilir."""
+        self._schedule(key, lambda: ("call", make_fn()), delay)
+
+    def _schedule(self, key, make_job, delay: int):
+        self._later[key] = (time.monotonic() + delay / 1000, make_job)
+        self._arm()
+
+    def _arm(self):
+        if not self._later: self._timer.stop(); return
+        due = min(t for t, _ in self._later.values())
+        self._timer.start(max(0, int((due - time.monotonic()) * 1000)))
+
+    def _fire_due(self):
+        now = time.monotonic()
+        for key in [k for k, (t, _) in self._later.items() if t <= now]: self.fire(key)
+        self._arm()
+
+    def fire(self, key):
+        """Bekleyen debounce'u hemen kuyruğa al (editör başka dosyaya geçerken)."""
+        if not isinstance(key, tuple): key = self._key(key)
+        ent = self._later.pop(key, None)
+        if ent is None: return
+        try: job = ent[1]()
+        except Exception as ex: self.failed.emit(str(key), str(ex)); return
+        self._put(key, job)
+
+    # ── okuma tarafı (kuyruktaki son hali görünür)
+    def pending(self, path: Path):
+        """Yol için kuyruktaki iş: metin (yazılacak), None (silinecek) ya da ... (iş yok)."""
+        key = self._key(path)
+        with self._cond:
+            job = self._jobs.get(key)
+            if job is None and self._busy is not None and self._busy[0] == key: job = self._busy[1]
+        if job is None or job[0] == "call": return ...
+        return job[2] if job[0] == "text" else None
+
+    def read_text(self, path: Path, encoding: str = "utf-8") -> str:
+        txt = self.pending(path)
+        if txt is None: raise FileNotFoundError(str(path))
+        if txt is not ...: return txt
+        return Path(path).read_text(encoding=encoding)
+
+    def exists(self, path: Path) -> bool:
+        txt = self.pending(path)
+        return Path(path).exists() if txt is ... else txt is not None
+
+    def pending_under(self, root: Path) -> list[tuple[Path, str | None]]:
+        """root altındaki kuyruktaki dosya işleri: [(yol, metin | None=silinecek)]."""
+        pre = self._key(root) + os.sep
+        with self._cond:
+            jobs = list(self._jobs.items())
+            if self._busy is not None and self._busy[0] not in self._jobs: jobs.insert(0, self._busy)
+        return [(job[1], job[2] if job[0] == "text" else None)
+                for key, job in jobs if job[0] != "call" and isinstance(key, str) and key.startswith(pre)]
+
+    def is_pending(self, key) -> bool:
+        if not isinstance(key, tuple): key = self._key(key)
+        with self._cond:
+            return key in self._later or key in self._jobs or (self._busy is not None and self._busy[0] == key)
+
+    # ── boşaltma
+    def on_flush(self, cb):
+        """flush() başında çağrılacak kanca (kendi debounce'unu tutan depolar için)."""
+        self._hooks.append(cb)
+
+    def off_flush(self, cb):
+        if cb in self._hooks: self._hooks.remove(cb)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Kancalar + bekleyen debounce'lar + kuyruk; kuyruk boşalana kadar bekler (en fazla timeout sn)."""
+        for cb in list(self._hooks):
+            try: cb()
+            except Exception as ex: self.failed.emit("flush", str(ex))
+        for key in list(self._later): self.fire(key)
+        self._timer.stop()
+        return self.drain(timeout)
+
+    def drain(self, timeout: float = 10.0) -> bool:
+        """Sadece kuyruğun boşalmasını bekle (herhangi bir thread'den çağrılabilir)."""
+        end = time.monotonic() + timeout
+        with self._cond:
+            while self._jobs or self._busy is not None:
+                left = end - time.monotonic()
+                if left <= 0: return False
+                self._cond.wait(left)
+        return True
+
+    # ── yazıcı thread'i
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._jobs: self._cond.wait()
+                key, job = self._jobs.popitem(last=False)
+                self._busy = (key, job)
+            try:
+                if job[0] == "text": atomic_write_text(job[1], job[2])
+                elif job[0] == "unlink": job[1].unlink(missing_ok=True)
+                else: job[1]()
+                self.written.emit(str(key))
+            except Exception as ex:
+                self.failed.emit(str(key), str(ex))
+            finally:
+                with self._cond:
+                    self._busy = None; self._cond.notify_all()
+
+_writer: WriteBehind | None = None
+
+def writer() -> WriteBehind:
+    """Uygulama geneli tek yazıcı."""
+    global _writer
+    if _writer is None: _writer = WriteBehind()
+    return _writer
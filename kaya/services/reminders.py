@@ -0,0 +1,110 @@
+# kaya/services/reminders.py
+from __future__ import annotations
+from datetime import date, datetime, timedelta
+import heapq, itertools, time
+from PySide6 import QtCore
+
+from . import agenda_store
+from .timeline import parse_hm
+from ..ui.commands_palette import show_toast     # toast widget'ı burada; theme.py sadece #toast stilini verir
+
+# Hatırlatılan tagler ve varsayılan öne alma süreleri (dakika).
+# Ayar: <agenda_dir>/agenda.json → "reminders": {"at": "09:00", "lead": {"exam": 1440, ...}}
+REMIND_TAGS = ("exam", "birthday", "event")
+DEFAULT_AT = "09:00"            # satırda saat yoksa olayın saati
+DEFAULT_LEAD = {"exam": 1440, "birthday": 0, "event": 60}
+
+class ReminderScheduler(QtCore.QObject):
+    """
+    Tag satırlarından hatırlatıcılar: min-heap [(zaman, sıra, anahtar)] + tek QTimer.
+    Zamanlayıcı sadece sıradaki hatırlatıcıya kurulur; dosya yoklaması yok.
+    Heap tag indexinden kurulur, write_tags_text ile gün gün güncellenir
+    (eski kayıtlar heap'ten silinmez, `_live` ile geçersiz sayılıp atlanır).
+    Satır metni "HH:MM ..." ile başlıyorsa olay saati o kabul edilir.
+    """
+    fired = QtCore.Signal(str, str, str)      # (gün, tag, metin)
+    MAX_WAIT = 6 * 3600 * 1000                 # uzun beklemeleri böl (uyku / saat değişimi)
+
+    def __init__(self, afs, window=None):
+        super().__init__(window)
+        self.afs = afs; self.window = window
+        cfg = agenda_store.read_config(afs.root).get("reminders") or {}
+        self.at = parse_hm(cfg.get("at") or DEFAULT_AT)
+        if self.at is None: self.at = parse_hm(DEFAULT_AT)
+        self.lead = {**DEFAULT_LEAD, **{k: int(v) for k, v in (cfg.get("lead") or {}).items()}}
+        self._heap: list[tuple[float, int, tuple]] = []
+        self._live: dict[tuple, tuple[float, int]] = {}   # anahtar (gün, tag, metin) → geçerli (zaman, sıra)
+        self._by_day: dict[str, list[tuple]] = {}
+        self._seq = itertools.count()
+        self._timer = QtCore.QTimer(self); self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+        afs.tag_listeners.append(self.update_day)
+        self.rebuild()
+
+    def stop(self):
+        """Vault kapanırken: zamanlayıcıyı durdur, tag dinleyicisinden çık."""
+        self._timer.stop()
+        if self.update_day in self.afs.tag_listeners: self.afs.tag_listeners.remove(self.update_day)
+
+    def fire_time(self, day: str, tag: str, text: str) -> float:
+        hm = parse_hm(text.split(None, 1)[0]) if text.strip() else None
+        start = datetime.combine(date.fromisoformat(day), datetime.min.time()) + timedelta(minutes=self.at if hm is None else hm)
+        return (start - timedelta(minutes=self.lead.get(tag, 0))).timestamp()
+
+    # ── heap
+    def _push(self, day: str, tag: str, text: str, now: float):
+        if tag not in REMIND_TAGS: return
+        t = self.fire_time(day, tag, text)
+        if t <= now: return
+        key = (day, tag, text)
+        if key in self._live: return
+        seq = next(self._seq)
+        self._live[key] = (t, seq); self._by_day.setdefault(day, []).append(key)
+        heapq.heappush(self._heap, (t, seq, key))
+
+    def rebuild(self):
+        """Heap'i tag indexinden (dünden itibaren) yeniden kur."""
+        self._heap.clear(); self._live.clear(); self._by_day.clear()
+        now = time.time()
+        for day, tag, text in self.afs.find_tags(None, date.today() - timedelta(days=1)):
+            self._push(day, tag, text, now)
+        self._arm()
+
+    def update_day(self, d: date, pairs):
+        """write_tags_text sonrası: o günün hatırlatıcılarını değiştir."""
+        day = d.isoformat(); now = time.time()
+        for key in self._by_day.pop(day, []): self._live.pop(key, None)
+        for tag, text in pairs: self._push(day, tag, text, now)
+        self._arm()
+
+    def _top(self):
+        while self._heap and self._live.get(self._heap[0][2]) != self._heap[0][:2]:
+            heapq.heappop(self._heap)          # geçersiz (düzenlenmiş / silinmiş) kayıt
+        return self._heap[0] if self._heap else None
+
+    def _arm(self):
+        if len(self._heap) > 2 * len(self._live) + 64:      # düzenlemelerden biriken geçersiz kayıtları at
+            self._heap = [(t, seq, key) for key, (t, seq) in self._live.items()]; heapq.heapify(self._heap)
+        top = self._top()
+        if top is None: self._timer.stop(); return
+        self._timer.start(int(min(self.MAX_WAIT, max(0.0, (top[0] - time.time()) * 1000))))
+
+    def _fire(self):
+        now = time.time()
+        while (top := self._top()) and top[0] <= now + 0.5:
+            heapq.heappop(self._heap); key = top[2]
+            self._live.pop(key, None)
+            day, tag, text = key
+            keys = self._by_day.get(day)
+            if keys is not None:
+                if key in keys: keys.remove(key)
+                if not keys: del self._by_day[day]
+            self.fired.emit(day, tag, text)
+            if self.window is not None:
+                try: show_toast(self.window, f"⏰ {tag} · {day} · {text}")
+                except Exception: pass
+        self._arm()
+
+    def upcoming(self, n: int = 10) -> list[tuple[datetime, str, str, str]]:
+        rows = sorted((ts, key) for key, ts in self._live.items())[:n]
+        return [(datetime.fromtimestamp(ts[0]), *key) for ts, key in rows]
@@ -0,0 +1,255 @@
+# kaya/services/search_index.py
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+import json, os, re, sqlite3, threading, time
+
+# Vault genelinde tam metin arama: <workspace>/database/search.db (SQLite FTS5)
+#   files     <files_dir>/**/*.md|*.txt              anahtar: göreli yol
+#   projects  <projects_dir>/**/*.md|*.txt           anahtar: göreli yol (proje = ilk klasör)
+#   agenda    agenda store kayıtları (journal/plan/tags)   anahtar: "<tür>/<YYYY-MM-DD>"
+# Her belge damgasıyla (mtime_ns+boyut / store damgası) saklanır; refresh() sadece değişenleri yeniden okur.
+SCOPES = ("files", "projects", "agenda")
+TEXT_EXTS = {".md", ".markdown", ".txt"}
+AGENDA_KINDS = ("journal", "plan", "tags")
+
+SQL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs(
+    id INTEGER PRIMARY KEY,
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    stamp TEXT NOT NULL,
+    UNIQUE(scope, key)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, body, content='docs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS trg_docs_ai AFTER INSERT ON docs BEGIN
+  INSERT INTO docs_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_docs_ad AFTER DELETE ON docs BEGIN
+  INSERT INTO docs_fts(docs_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_docs_au AFTER UPDATE ON docs BEGIN
+  INSERT INTO docs_fts(docs_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+  INSERT INTO docs_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+"""
+
+_HEAD_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_OPS_RE  = re.compile(r'["*()]|\b(?:AND|OR|NOT|NEAR)\b')
+
+@dataclass(frozen=True)
+class Hit:
+    scope: str
+    key: str            # files/projects: göreli yol, agenda: "journal/2025-10-01"
+    title: str
+    snippet: str
+    score: float        # bm25 (küçük = daha alakalı)
+
+def _title(key: str, body: str) -> str:
+    m = _HEAD_RE.search(body[:4000])
+    return m.group(1) if m else Path(key).stem
+
+def fts_query(q: str) -> str:
+    """Kullanıcı girdisi → FTS5 ifadesi. Operatör yoksa her kelime tırnaklanır (AND), son kelime ön ekle eşleşir."""
+    q = q.strip()
+    if _OPS_RE.search(q): return q
+    words = [w.replace('"', "") for w in q.split()]
+    return " ".join(f'"{w}"' for w in words[:-1]) + (f' "{words[-1]}"*' if words else "")
+
+class SearchIndex:
+    """
+    FTS5 tabanlı artımlı arama indexi. Kapsam damgaları en fazla `ttl` saniyede bir toplanır
+    (klasör yürüyüşü + stat, agenda için store.scan); touch()/drop() değişiklik olaylarıyla tek
+    belgeyi günceller, invalidate() bir sonraki sorguda kapsamın yeniden doğrulanmasını sağlar.
+    watched=True iken (vault izleyicisi olayları besliyor) doğrulanmış kapsam süre dolunca yeniden
+    taranmaz. İlk tam doğrulama start_build() ile arka planda; bu sırada aramalar eldeki indexten yanıtlanır.
+    Bağlantı thread'ler arasında paylaşılır, kilitle korunur.
+    """
+    BATCH = 200                                # arka plan yazımı: kilit bu kadar belgede bir bırakılır
+
+    def __init__(self, files_dir: Path, projects_dir: Path, store=None, db_path: Path | None = None, ttl: float = 10.0):
+        self.dirs = {"files": Path(files_dir), "projects": Path(projects_dir)}
+        self.store = store                     # agenda store (None → agenda kapsamı boş)
+        self.db_path = Path(db_path) if db_path else Path(files_dir).parent / "database" / "search.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.watched = False
+        self._lock = threading.RLock()
+        self._checked: dict[str, float] = {}
+        self._build: threading.Thread | None = None
+        self._cancel = threading.Event()
+        self._fresh: set[tuple[str, str]] = set()   # build sırasında olaylarla güncellenenler (üzerine yazılmaz)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.executescript(SQL_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self._cancel.set()
+        b = self._build
+        if b is not None: b.join()
+        with self._lock: self.conn.close()
+
+    # ── kaynaklar
+    def _walk(self, scope: str) -> dict[str, tuple[str, Path]]:
+        """{anahtar: (damga, yol)}; gizli klasörler atlanır."""
+        base = self.dirs[scope]; out = {}
+        stack = [base] if base.is_dir() else []
+        while stack:
+            try: it = list(os.scandir(stack.pop()))
+            except OSError: continue
+            for e in it:
+                if e.name.startswith("."): continue
+                if e.is_dir(follow_symlinks=False): stack.append(Path(e.path)); continue
+                if os.path.splitext(e.name)[1].lower() not in TEXT_EXTS: continue
+                try: st = e.stat()
+                except OSError: continue
+                p = Path(e.path)
+                out[p.relative_to(base).as_posix()] = (f"{st.st_mtime_ns}:{st.st_size}", p)
+        return out
+
+    def _agenda(self) -> dict[str, tuple[str, tuple[str, date]]]:
+        out = {}
+        if self.store is None: return out
+        for kind in AGENDA_KINDS:
+            months = sorted({(d.year, d.month) for d in self.store.entries(kind)})
+            for day, st in (self.store.scan(kind, months) if months else {}).items():
+                out[f"{kind}/{day}"] = (json.dumps(st), (kind, date.fromisoformat(day)))
+        return out
+
+    def _read(self, scope: str, ref) -> str:
+        try:
+            if scope == "agenda": return self.store.read(*ref)
+            return ref.read_text(encoding="utf-8", errors="replace")
+        except Exception:
+            return ""
+
+    def _upsert(self, rows):
+        self.conn.executemany(
+            "INSERT INTO docs(scope, key, title, body, stamp) VALUES(?,?,?,?,?) "
+            "ON CONFLICT(scope, key) DO UPDATE SET title=excluded.title, body=excluded.body, stamp=excluded.stamp", rows)
+
+    # ── güncelleme
+    def refresh(self, scopes=SCOPES, force: bool = False) -> int:
+        """Kapsamları damgalarla doğrula; değişen/silinen belge sayısını döndürür.
+        Dosyalar kilit dışında okunur, yazım BATCH'lerle yapılır → eşzamanlı aramalar beklemez."""
+        n = 0
+        for scope in scopes:
+            now = time.monotonic()
+            if not force and scope in self._checked and (self.watched or now - self._checked[scope] < self.ttl): continue
+            found = self._agenda() if scope == "agenda" else self._walk(scope)
+            with self._lock:
+                have = dict(self.conn.execute("SELECT key, stamp FROM docs WHERE scope=?", (scope,)))
+            gone = [(scope, k) for k in have if k not in found]
+            todo = [(k, st, ref) for k, (st, ref) in found.items() if have.get(k) != st]
+            with self._lock, self.conn:
+                self.conn.executemany("DELETE FROM docs WHERE scope=? AND key=?", gone)
+            n += len(gone)
+            for i in range(0, len(todo), self.BATCH):
+                if self._cancel.is_set(): return n
+                rows = []
+                for key, st, ref in todo[i:i + self.BATCH]:
+                    body = self._read(scope, ref)
+                    rows.append((scope, key, _title(key, body), body, st))
+                with self._lock:
+                    rows = [r for r in rows if (scope, r[1]) not in self._fresh]
+                    with self.conn: self._upsert(rows)
+                n += len(rows)
+            self._checked[scope] = now
+        return n
+
+    def start_build(self):
+        """İlk tam doğrulamayı arka plan thread'inde başlat (UI thread'i beklemez)."""
+        if self._build is not None or self._cancel.is_set(): return
+        def run():
+            try: self.refresh(force=True)
+            except Exception: pass                   # kapanışta bağlantı gitmiş olabilir; sonraki sorgu doğrular
+            finally:
+                with self._lock: self._fresh.clear(); self._build = None
+        self._build = threading.Thread(target=run, name="kaya-search-index", daemon=True)
+        self._build.start()
+
+    @property
+    def building(self) -> bool:
+        return self._build is not None
+
+    def invalidate(self, scope: str | None = None):
+        if scope is None: self._checked.clear()
+        else: self._checked.pop(scope, None)
+
+    def _locate(self, path: Path) -> tuple[str, str] | None:
+        path = Path(path)
+        for scope, base in self.dirs.items():
+            try: return scope, path.relative_to(base).as_posix()
+            except ValueError: continue
+        return None
+
+    def touch(self, path: Path):
+        """Tek dosya değişti (kaydetme / izleyici olayı): sadece onu yeniden indexle."""
+        loc = self._locate(path)
+        if loc is None or Path(path).suffix.lower() not in TEXT_EXTS: return
+        if not Path(path).is_file(): self.drop(path); return
+        scope, key = loc; st = Path(path).stat()
+        body = self._read(scope, Path(path))
+        with self._lock:
+            if self._build is not None: self._fresh.add((scope, key))
+            with self.conn: self._upsert([(scope, key, _title(key, body), body, f"{st.st_mtime_ns}:{st.st_size}")])
+
+    def touch_agenda(self, d: date, kinds=AGENDA_KINDS):
+        """Agenda günü değişti (kaydetme / harici değişiklik): o günün belgelerini store'dan güncelle."""
+        if self.store is None: return
+        for kind in kinds:
+            if kind not in AGENDA_KINDS: continue
+            key = f"{kind}/{d.isoformat()}"
+            st = self.store.stamp(kind, d)
+            body = self._read("agenda", (kind, d)) if st is not None else ""
+            with self._lock:
+                if self._build is not None: self._fresh.add(("agenda", key))
+                with self.conn:
+                    if st is None: self.conn.execute("DELETE FROM docs WHERE scope='agenda' AND key=?", (key,))
+                    else: self._upsert([("agenda", key, _title(key, body), body, json.dumps(st))])
+
+    def drop(self, path: Path):
+        """Dosya/klasör silindi: altındaki belgeleri indexten çıkar."""
+        loc = self._locate(path)
+        if loc is None: return
+        scope, key = loc
+        with self._lock, self.conn:
+            if self._build is not None: self._fresh.add((scope, key))
+            self.conn.execute("DELETE FROM docs WHERE scope=? AND (key=? OR key LIKE ? ESCAPE '\\')",
+                              (scope, key, key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%"))
+
+    def apply(self, events):
+        """Vault izleyicisinin olay partisi (VaultEvent listesi): dosya başına touch/drop."""
+        for e in events:
+            if e.src is not None: self.drop(e.src)
+            if e.kind == "deleted": self.drop(e.path)
+            elif e.is_dir:
+                loc = self._locate(e.path)
+                if loc: self.invalidate(loc[0])       # yeni/taşınan klasör: kapsam sonraki sorguda doğrulanır
+            else: self.touch(e.path)
+
+    # ── sorgu
+    def search(self, query: str, scopes=None, limit: int = 20) -> list[Hit]:
+        """Sıralı sonuçlar (bm25; başlık eşleşmesi 5 kat ağırlıklı) + vurgulu parça."""
+        scopes = tuple(scopes or SCOPES)
+        if self._build is None: self.refresh(scopes)
+        sql = ("SELECT d.scope, d.key, d.title, snippet(docs_fts, 1, '[', ']', '…', 12), bm25(docs_fts, 5.0, 1.0) AS r "
+               "FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid WHERE docs_fts MATCH ? "
+               "AND d.scope IN (%s) ORDER BY r LIMIT ?" % ",".join("?" * len(scopes)))
+        q = fts_query(query)
+        if not q: return []
+        with self._lock:
+            try: rows = self.conn.execute(sql, [q, *scopes, limit]).fetchall()
+            except sqlite3.OperationalError:         # bozuk operatör sözdizimi → düz kelimeler
+                q = fts_query(_OPS_RE.sub(" ", query))
+                rows = self.conn.execute(sql, [q, *scopes, limit]).fetchall() if q else []
+        return [Hit(*r) for r in rows]
+
+    def count(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.conn.execute("SELECT scope, COUNT(*) FROM docs GROUP BY scope"))
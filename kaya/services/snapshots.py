@@ -0,0 +1,198 @@
+# kaya/services/snapshots.py
+from __future__ import annotations
+from datetime import datetime
+from pathlib import Path
+import hashlib, json, os, shutil, sqlite3, threading
+from PySide6 import QtCore
+
+# Vault anlık görüntüleri: <vault>/snapshots/<id>/{workspace/…, manifest.json}
+#   id = YYYYMMDD-HHMMSS; klasör workspace dışında → izleyici ve asset taraması görmez
+#   manifest: {"files": {"göreli/yol": [boyut, mtime_ns, blake2b-160]}, "dirs": [...], …}
+# Artımlı: boyut + mtime önceki manifestle aynıysa dosya okunmaz, önceki görüntüdeki kopyaya sabit
+# bağlantı (hardlink) verilir. Değişenler kopyalanırken hashlenir; içerik aynı çıkarsa yine bağlanır.
+# SQLite dosyaları (*.db) kopyalanmaz, online backup API ile tutarlı bir kopyası alınır.
+# Bağlantılar sadece görüntüler arasındadır; canlı workspace'e geri yüklemede her zaman kopya yazılır.
+# Yarım kalan görüntü .<id>.part klasöründe kalır, bitince os.replace ile yayınlanır.
+
+CHUNK = 1 << 20
+DB_EXTS = {".db", ".sqlite", ".sqlite3"}
+SKIP_SUFFIXES = ("-wal", "-shm", "-journal", ".tmp", ".part")
+
+def snapshots_dir(vault_root: Path) -> Path:
+    return Path(vault_root) / "snapshots"
+
+def _new_id(root: Path) -> str:
+    sid = datetime.now().strftime("%Y%m%d-%H%M%S")
+    n, base = 1, sid
+    while (root / sid).exists(): n += 1; sid = f"{base}-{n}"
+    return sid
+
+def _copy_hash(src: Path, dst: Path) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(src, "rb") as fi, open(dst, "wb") as fo:
+        while chunk := fi.read(CHUNK): h.update(chunk); fo.write(chunk)
+    shutil.copystat(src, dst)
+    return h.hexdigest()
+
+def _hash(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK): h.update(chunk)
+    return h.hexdigest()
+
+def _backup_db(src: Path, dst: Path):
+    """Canlı veritabanının tutarlı kopyası (açık bağlantılar / WAL olsa da)."""
+    s = sqlite3.connect(f"{src.resolve().as_uri()}?mode=ro", uri=True)
+    d = sqlite3.connect(str(dst))
+    try: s.backup(d)
+    finally: d.close(); s.close()
+
+def _link(src: Path, dst: Path) -> bool:
+    try: os.link(src, dst); return True
+    except OSError: return False             # bağlantı sınırı / farklı disk → kopya
+
+def _walk(ws: Path, dirs_out: list):
+    for d, dirs, files in os.walk(ws):
+        dirs.sort()
+        if d != str(ws): dirs_out.append(Path(d).relative_to(ws).as_posix())
+        for n in sorted(files):
+            if n.endswith(SKIP_SUFFIXES): continue
+            p = Path(d) / n
+            yield p.relative_to(ws).as_posix(), p
+
+# ── okuma
+def load_manifest(root: Path, sid: str) -> dict | None:
+    try: return json.loads((root / sid / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError): return None
+
+def list_snapshots(root: Path) -> list[dict]:
+    """Tamamlanmış görüntüler, eskiden yeniye (dosya listesi olmadan)."""
+    out = []
+    if not root.is_dir(): return out
+    for d in sorted(root.iterdir()):
+        if d.name.startswith(".") or not d.is_dir(): continue
+        m = load_manifest(root, d.name)
+        if m: m.pop("files", None); out.append(m)
+    return out
+
+def latest(root: Path) -> dict | None:
+    ids = [m["id"] for m in list_snapshots(root)]
+    return load_manifest(root, ids[-1]) if ids else None
+
+# ── alma
+def take(ws: Path, root: Path, cancel: threading.Event | None = None) -> dict:
+    """workspace'in artımlı görüntüsünü al; manifest özetini döndür."""
+    ws = Path(ws); root.mkdir(parents=True, exist_ok=True)
+    for stale in root.glob(".*.part"): shutil.rmtree(stale, ignore_errors=True)
+    prev = latest(root)
+    prev_files = prev["files"] if prev else {}
+    prev_tree = root / prev["id"] / "workspace" if prev else None
+    sid = _new_id(root)
+    part = root / f".{sid}.part"; tree = part / "workspace"
+    files, dirs, copied, linked, nbytes = {}, [], 0, 0, 0
+    try:
+        tree.mkdir(parents=True)
+        for rel, src in _walk(ws, dirs):
+            if cancel is not None and cancel.is_set(): raise InterruptedError("cancelled")
+            try: st = src.stat()
+            except OSError: continue             # tarama sırasında silindi
+            dst = tree / rel; dst.parent.mkdir(parents=True, exist_ok=True)
+            old = prev_files.get(rel)
+            is_db = src.suffix.lower() in DB_EXTS
+            if old and not is_db and old[0] == st.st_size and old[1] == st.st_mtime_ns and _link(prev_tree / rel, dst):
+                files[rel] = old; linked += 1; continue
+            try:
+                if is_db: _backup_db(src, dst); digest = _hash(dst)
+                else: digest = _copy_hash(src, dst)
+            except (OSError, sqlite3.Error):
+                dst.unlink(missing_ok=True); continue
+            if old and old[2] == digest:            # dokunulmuş ama içerik aynı
+                dst.unlink()
+                if _link(prev_tree / rel, dst): linked += 1
+                else: _copy_hash(prev_tree / rel, dst); copied += 1; nbytes += dst.stat().st_size
+            else:
+                copied += 1; nbytes += dst.stat().st_size
+            files[rel] = [st.st_size, st.st_mtime_ns, digest]
+        meta = {"id": sid, "created": datetime.now().isoformat(timespec="seconds"), "parent": prev["id"] if prev else None,
+                "count": len(files), "copied": copied, "linked": linked, "bytes_copied": nbytes,
+                "bytes": sum(v[0] for v in files.values())}
+        (part / "manifest.json").write_text(json.dumps({**meta, "files": files, "dirs": dirs}, ensure_ascii=False), encoding="utf-8")
+        os.replace(part, root / sid)
+    except BaseException:
+        shutil.rmtree(part, ignore_errors=True)
+        raise
+    return meta
+
+# ── geri yükleme
+def stage_restore(root: Path, sid: str, staged: Path) -> int:
+    """Görüntüyü staged klasörüne kopyala (bağlantı değil: canlı dosyalar görüntüleri bozamaz)."""
+    m = load_manifest(root, sid)
+    if m is None: raise FileNotFoundError(f"No such snapshot: {sid}")
+    if staged.exists(): shutil.rmtree(staged)
+    src = root / sid / "workspace"
+    staged.mkdir(parents=True)
+    for rel in m.get("dirs", ()): (staged / rel).mkdir(parents=True, exist_ok=True)
+    for rel in m["files"]:
+        dst = staged / rel; dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src / rel, dst)
+    return len(m["files"])
+
+def swap(ws: Path, staged: Path):
+    """staged → workspace (eskisi yan klasöre taşınıp silinir). Vault bağlı değilken çağrılmalı."""
+    old = ws.parent / ".workspace.old"
+    if old.exists(): shutil.rmtree(old)
+    os.replace(ws, old)
+    try: os.replace(staged, ws)
+    except OSError:
+        os.replace(old, ws); raise
+    shutil.rmtree(old, ignore_errors=True)
+
+# ── arka plan işi
+class SnapshotJob(QtCore.QObject):
+    """Görüntü alma / geri yükleme hazırlığı ayrı thread'de; sonuçlar kuyruklu sinyallerle UI thread'ine."""
+    done = QtCore.Signal(str)            # mesaj
+    failed = QtCore.Signal(str)          # hata mesajı
+    staged = QtCore.Signal(str)          # geri yükleme: hazırlanan klasör (UI thread'inde swap edilir)
+
+    _running: dict = {}                  # vault kökü → iş (aynı vault'ta tek iş)
+
+    def __init__(self, vault_root: Path, parent=None):
+        super().__init__(parent)
+        self.vault_root = Path(vault_root)
+        self.root = snapshots_dir(vault_root)
+        self.cancel = threading.Event()
+
+    @classmethod
+    def busy(cls, vault_root: Path) -> bool:
+        return str(vault_root) in cls._running
+
+    def _start(self, fn):
+        key = str(self.vault_root)
+        if key in SnapshotJob._running: return False
+        SnapshotJob._running[key] = self
+        def run():
+            try: fn()
+            except Exception as ex: self.failed.emit(f"Snapshot failed: {ex}")
+            finally:
+                SnapshotJob._running.pop(key, None)
+                self.deleteLater()
+        threading.Thread(target=run, name="kaya-snapshot", daemon=True).start()
+        return True
+
+    def snapshot(self) -> bool:
+        def fn():
+            m = take(self.vault_root / "workspace", self.root, self.cancel)
+            self.done.emit(f"Snapshot {m['id']}: {m['count']} files, {m['copied']} copied "
+                           f"({m['bytes_copied'] / 1048576:.1f} MB), {m['linked']} linked")
+        return self._start(fn)
+
+    def restore(self, sid: str) -> bool:
+        """Önce mevcut durumun görüntüsü (geri alınabilsin), sonra hedef görüntü hazırlanır."""
+        def fn():
+            if load_manifest(self.root, sid) is None: raise FileNotFoundError(f"No such snapshot: {sid}")
+            m = take(self.vault_root / "workspace", self.root, self.cancel)
+            staged = self.vault_root / ".workspace.restore"
+            n = stage_restore(self.root, sid, staged)
+            self.done.emit(f"Saved current state as {m['id']}; restoring {sid} ({n} files)")
+            self.staged.emit(str(staged))
+        return self._start(fn)
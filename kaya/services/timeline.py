@@ -0,0 +1,250 @@
+# kaya/services/timeline.py
+from __future__ import annotations
+from datetime import date, datetime, timedelta
+from bisect import bisect_left
+import json, re
+
+# Gün kaydı (agenda store "timeline" türü):  [{"time": "09:00", "end": "10:30", "text": "..."}, ...]
+# "end" yoksa (eski kayıtlar) DEFAULT_LEN dakika sayılır. Aralıklar yarı açık: [başlangıç, bitiş).
+DAY = 1440
+DEFAULT_LEN = 60
+
+_HM_RE    = re.compile(r"^\s*(\d{1,2})[:.](\d{2})\s*$")
+_ENTRY_RE = re.compile(r"^\s*(\d{1,2}[:.]\d{2})(?:\s*-\s*(\d{1,2}[:.]\d{2}))?\s*(.*?)\s*$")
+
+def parse_hm(s) -> int | None:
+    m = _HM_RE.match(str(s or ""))
+    if not m: return None
+    h, mi = int(m.group(1)), int(m.group(2))
+    return h*60 + mi if (h < 24 and mi < 60) or (h == 24 and mi == 0) else None
+
+def fmt_hm(m: int) -> str: return f"{m // 60:02d}:{m % 60:02d}"
+
+def span(it: dict) -> tuple[int, int]:
+    """Kayıt → (başlangıç, bitiş) gün içi dakika."""
+    s = parse_hm(it.get("time")) or 0
+    e = parse_hm(it.get("end"))
+    if e is None or e <= s: e = min(DAY, s + DEFAULT_LEN)
+    return s, max(e, s + 1)
+
+def parse_day(txt: str) -> list[dict]:
+    """Gün JSON'u → geçerli kayıtlar, başlangıca göre sıralı."""
+    try: data = json.loads(txt) if txt and txt.strip() else []
+    except Exception: return []
+    out = [it for it in data if isinstance(it, dict) and parse_hm(it.get("time")) is not None] if isinstance(data, list) else []
+    return sorted(out, key=span)
+
+def dump_day(items) -> str:
+    items = sorted(items, key=span)
+    return json.dumps(items, ensure_ascii=False, indent=2) if items else ""
+
+def parse_entry(line: str) -> dict | None:
+    """ "09:00-10:30 Toplantı" / "14:00 Ders" → kayıt (bitişsizse DEFAULT_LEN)."""
+    m = _ENTRY_RE.match(line or "")
+    if not m or parse_hm(m.group(1)) is None: return None
+    s = parse_hm(m.group(1)); e = parse_hm(m.group(2)) if m.group(2) else None
+    if e is None or e <= s: e = min(DAY, s + DEFAULT_LEN)
+    return {"time": fmt_hm(s), "end": fmt_hm(e), "text": m.group(3)}
+
+def _iter_months(start: date, end: date):
+    cur = start.replace(day=1)
+    while cur <= end:
+        yield cur.year, cur.month
+        cur = (cur + timedelta(days=32)).replace(day=1)
+
+_KEY = lambda x: (x[0], x[1])
+
+def _dt(t: int) -> datetime:
+    """Mutlak dakika → datetime."""
+    return datetime.fromordinal(t // DAY) + timedelta(minutes=t % DAY)
+
+def clash_key(d: date, it: dict) -> tuple:
+    """Kaydı nesne kimliğinden bağımsız tanı (ağaçtaki ve editördeki kopyalar eşleşsin)."""
+    return d, it.get("time"), it.get("end"), it.get("text")
+
+# ────────────────────────────────────────────────────────────────────────────────
+class IntervalTree:
+    """
+    [başlangıç, bitiş, yük] aralıkları. Başlangıca göre sıralı diziler üzerinde örtük dengeli ağaç:
+    her orta düğüm kendi alt ağacının en büyük bitişini tutar (max-end). Örtüşme sorgusu
+    O(log n + k), sonraki kayıt O(log n). Ekleme/silme dizileri yeniden kurar (O(n)).
+    """
+    def __init__(self, items=()):
+        self._set(sorted(items, key=_KEY))
+
+    def _set(self, items: list):
+        self._items = items
+        self._starts = [x[0] for x in items]; self._ends = [x[1] for x in items]
+        self._max = [0] * len(items)
+        def build(lo, hi):
+            if lo >= hi: return -1
+            mid = (lo + hi) // 2
+            m = max(self._ends[mid], build(lo, mid), build(mid + 1, hi))
+            self._max[mid] = m
+            return m
+        build(0, len(items))
+
+    def __len__(self): return len(self._items)
+
+    def extend(self, items):
+        if items: self._set(sorted(self._items + list(items), key=_KEY))
+
+    def replace(self, lo: int, hi: int, items=()):
+        """Başlangıcı [lo, hi) içinde olanları çıkar, items'ı ekle."""
+        i, j = bisect_left(self._starts, lo), bisect_left(self._starts, hi)
+        self._set(sorted(self._items[:i] + self._items[j:] + list(items), key=_KEY))
+
+    def overlap(self, a: int, b: int) -> list:
+        """[a, b) ile kesişen aralıklar (başlangıca göre sıralı)."""
+        i, j = bisect_left(self._starts, a), bisect_left(self._starts, b)
+        # [a, b) içinde başlayanlar bitişik dilim; ağaç sadece a'dan önce başlayıp a'dan sonra bitenler için gezilir
+        out, stack = [], [(0, len(self._items))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= i or lo >= hi: continue
+            mid = (lo + hi) // 2
+            if self._max[mid] <= a: continue                 # alt ağaçtaki her şey a'dan önce bitiyor
+            stack.append((lo, mid))
+            if mid < i:
+                if self._ends[mid] > a: out.append(self._items[mid])
+                stack.append((mid + 1, hi))
+        if out: out.sort(key=_KEY)
+        return out + self._items[i:j]
+
+    def starting(self, lo: int, hi: int) -> list:
+        """Başlangıcı [lo, hi) içinde olanlar."""
+        return self._items[bisect_left(self._starts, lo):bisect_left(self._starts, hi)]
+
+    def next_after(self, t: int):
+        i = bisect_left(self._starts, t)
+        return self._items[i] if i < len(self._items) else None
+
+    def after(self, t: int, n: int) -> list:
+        """Başlangıcı t veya sonrası olan ilk n aralık."""
+        i = bisect_left(self._starts, t)
+        return self._items[i:i + n]
+
+# ────────────────────────────────────────────────────────────────────────────────
+class Timeline:
+    """
+    Zamanlı ajanda kayıtları tek aralık ağacında; mutlak dakika = gün.toordinal()*1440 + dakika.
+    Aylar ilk sorguda `load_month(y, m) -> {YYYY-MM-DD: json}` ile yüklenir; yazımlar set_day ile yansıtılır.
+    """
+    def __init__(self, load_month):
+        self._load = load_month
+        self._months: set[tuple[int, int]] = set()
+        self.tree = IntervalTree()
+
+    @staticmethod
+    def _intervals(d: date, items) -> list:
+        base = d.toordinal() * DAY
+        return [(base + s, base + e, (d, it)) for it in items for s, e in (span(it),)]
+
+    def ensure(self, start: date, end: date):
+        new = [ym for ym in _iter_months(start, end) if ym not in self._months]
+        if not new: return
+        items = []
+        for y, m in new:
+            for day, txt in self._load(y, m).items():
+                items += self._intervals(date.fromisoformat(day), parse_day(txt))
+            self._months.add((y, m))
+        self.tree.extend(items)
+
+    def set_day(self, d: date, items):
+        if (d.year, d.month) not in self._months: return    # ay henüz yüklenmedi; yüklenince store'dan gelir
+        base = d.toordinal() * DAY
+        self.tree.replace(base, base + DAY, self._intervals(d, items))
+
+    # ── sorgular
+    def day(self, d: date) -> list[dict]:
+        self.ensure(d, d); base = d.toordinal() * DAY
+        return [x[2][1] for x in self.tree.starting(base, base + DAY)]
+
+    def overlaps(self, d: date, start: int, end: int) -> list[tuple[date, dict]]:
+        """d gününün [start, end) dakikalarıyla çakışan kayıtlar (önceki günden taşanlar dahil)."""
+        self.ensure(d - timedelta(days=1), d); base = d.toordinal() * DAY
+        return [x[2] for x in self.tree.overlap(base + start, base + end)]
+
+    def conflicts(self, start: date, end: date) -> list[tuple[tuple[date, dict], tuple[date, dict]]]:
+        """[start, end] aralığında birbiriyle çakışan kayıt çiftleri."""
+        self.ensure(start, end)
+        xs = self.tree.overlap(start.toordinal() * DAY, (end.toordinal() + 1) * DAY)
+        out, active = [], []
+        for x in xs:                                          # başlangıca göre sıralı süpürme
+            active = [a for a in active if a[1] > x[0]]
+            out += [(a[2], x[2]) for a in active]
+            active.append(x)
+        return out
+
+    def conflict_keys(self, start: date, end: date) -> set[tuple]:
+        """conflicts() içindeki kayıtlar, clash_key ile (görünümlerde işaretlemek için)."""
+        return {clash_key(*x) for pair in self.conflicts(start, end) for x in pair}
+
+    def next_entry(self, after: datetime, horizon_days: int = 62) -> tuple[datetime, dict] | None:
+        rows = self.upcoming(after, 1, horizon_days)
+        return rows[0] if rows else None
+
+    def upcoming(self, after: datetime, n: int = 5, horizon_days: int = 62) -> list[tuple[datetime, dict]]:
+        """after anından (dahil) sonra başlayan ilk n kayıt; ufuk dışındaki aylar yüklenmez."""
+        d = after.date(); self.ensure(d, d + timedelta(days=horizon_days))
+        t = d.toordinal() * DAY + after.hour * 60 + after.minute
+        return [(_dt(x[0]), x[2][1]) for x in self.tree.after(t, n) if x[0] < t + (horizon_days + 1) * DAY]
+
+    def free_slots(self, start: date, end: date, min_len: int = 30,
+                   day_start: int = 8*60, day_end: int = 22*60) -> list[tuple[datetime, datetime]]:
+        """[start, end] günlerinde day_start–day_end arasındaki en az min_len dakikalık boşluklar."""
+        self.ensure(start - timedelta(days=1), end)
+        lo, hi = start.toordinal(), end.toordinal()
+        xs = self.tree.overlap(lo * DAY + day_start, hi * DAY + day_end)    # tek sorgu; kayıtlar gece yarısını geçmez
+        out, i = [], 0
+        for o in range(lo, hi + 1):
+            cur = o * DAY + day_start; stop = o * DAY + day_end
+            while i < len(xs) and xs[i][0] < stop:
+                s, e = xs[i][0], xs[i][1]; i += 1
+                if e <= cur: continue
+                if s - cur >= min_len: out.append((cur, s))
+                cur = max(cur, e)
+            if stop - cur >= min_len: out.append((cur, stop))
+            while i < len(xs) and xs[i][0] < (o + 1) * DAY: i += 1          # gün penceresinden sonrakiler
+        return [(_dt(a), _dt(b)) for a, b in out]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+def bench(months: int = 6, per_day: int = 16, runs: int = 200, seed: int = 1) -> dict[str, float]:
+    """Yoğun sentetik takvimde sorgu süreleri (µs, ortalama). `python -m kaya.services.timeline`"""
+    import random, time
+    rnd = random.Random(seed); start = date(2030, 1, 1)
+    days = {}
+    d = start
+    while d < start + timedelta(days=31 * months):
+        items = []
+        for _ in range(per_day):
+            s = rnd.randrange(6 * 60, 22 * 60, 5)
+            items.append({"time": fmt_hm(s), "end": fmt_hm(min(DAY, s + rnd.choice((15, 30, 45, 60, 90)))), "text": "x"})
+        days[d.isoformat()] = json.dumps(items)
+        d += timedelta(days=1)
+    tl = Timeline(lambda y, m: {k: v for k, v in days.items() if k.startswith(f"{y:04d}-{m:02d}")})
+    t0 = time.perf_counter(); tl.ensure(start, d); load = (time.perf_counter() - t0) * 1e6
+    days_l = [start + timedelta(days=rnd.randrange(31 * months - 31)) for _ in range(runs)]
+    def timed(fn):
+        t = time.perf_counter()
+        for x in days_l: fn(x)
+        return (time.perf_counter() - t) / runs * 1e6
+    return {
+        "entries": len(tl.tree), "load (once)": load,
+        "overlaps (1h)": timed(lambda x: tl.overlaps(x, 600, 660)),
+        "next_entry": timed(lambda x: tl.next_entry(datetime.combine(x, datetime.min.time()) + timedelta(hours=13))),
+        "upcoming (10)": timed(lambda x: tl.upcoming(datetime.combine(x, datetime.min.time()), 10)),
+        "free_slots (week)": timed(lambda x: tl.free_slots(x, x + timedelta(days=6))),
+        "free_slots (month)": timed(lambda x: tl.free_slots(x, x + timedelta(days=30))),
+        "conflicts (week)": timed(lambda x: tl.conflicts(x, x + timedelta(days=6))),
+        "conflicts (month)": timed(lambda x: tl.conflicts(x, x + timedelta(days=30))),
+    }
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Timeline sorgu ölçümü")
+    ap.add_argument("--months", type=int, default=6); ap.add_argument("--per-day", type=int, default=16)
+    a = ap.parse_args()
+    for k, v in bench(a.months, a.per_day).items():
+        print(f"{k:<20}{v:>12.1f}" + ("" if k == "entries" else " µs"))
@@ -0,0 +1,299 @@
+# kaya/services/todo_index.py
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+import json, os, re, threading, time
+from . import persist
+
+# Kaynaklar:
+#   <agenda_dir>/todos/YYYY-MM.json       {"YYYY-MM-DD": [{"done", "tag", "text"}, ...]}
+#   <agenda_dir>/todos_YYYY-MM-DD.json    [{"done", "tag", "text"}, ...]   (eski sürümlerden kalan tek gün dosyaları)
+#   journal kayıtları (agenda store)       "- [ ] ..." satırları, gün = journal günü
+#   <projects_dir>/**/*.md                 "- [ ] ..." satırları, proje = üst klasör
+# Index: <agenda_dir>/.index/todos.json → {kaynak: {"stamp": ..., "items": [[gün, tag, metin, satır], ...]}}
+# Sadece açık maddeler indexlenir; damgası değişmeyen kaynak yeniden ayrıştırılmaz.
+# Kaynaklar gruplara ayrılır: ay ("YYYY-MM": aylık dosya, tek gün dosyaları, journal günleri) ve "projects".
+# Sorgu sadece ihtiyaç duyduğu grupları doğrular (by_project → projeler, overdue → bugüne kadarki aylar);
+# doğrulanan grup, değişiklik olayı gelene kadar (VaultWatcher partisi / touch_journal) tekrar taranmaz.
+# İzleyici yoksa (terminal) gruplar en fazla TTL saniyede bir doğrulanır.
+
+_MONTH_RE = re.compile(r"^(\d{4})-(\d{2})\.json$")
+_STRAY_RE = re.compile(r"^todos_(\d{4}-\d{2}-\d{2})\.json$")
+_BOX_RE   = re.compile(r"^\s*[-*+]\s+\[(?P<mark>[ xX])\]\s+(?P<text>.+?)\s*$")
+_DUE_RE   = re.compile(r"(?:@|due:)(\d{4}-\d{2}-\d{2})")
+_HASH_RE  = re.compile(r"#(\w+)")
+_VERSION  = 1
+
+@dataclass(frozen=True)
+class Todo:
+    day: str | None          # YYYY-MM-DD (son tarih / journal günü), yoksa None
+    tag: str
+    text: str
+    project: str | None
+    source: str              # index anahtarı: "month:2025-10", "stray:2025-11-09", "journal:2025-10-01", "project:<rel>"
+    line: int = 0            # markdown kaynaklarında satır no (1 tabanlı)
+
+def parse_checkboxes(txt: str, day: str | None = None):
+    """Markdown metnindeki açık "- [ ]" maddeleri → [(gün, tag, metin, satır)]."""
+    out = []
+    for no, line in enumerate(txt.splitlines(), 1):
+        m = _BOX_RE.match(line)
+        if not m or m.group("mark") != " ": continue
+        text = m.group("text")
+        due = _DUE_RE.search(text); tag = _HASH_RE.search(text)
+        out.append((due.group(1) if due else day, tag.group(1).lower() if tag else "", text, no))
+    return out
+
+def _json_items(items, day: str | None) -> list:
+    out = []
+    for it in items if isinstance(items, list) else []:
+        if not isinstance(it, dict) or it.get("done"): continue
+        text = str(it.get("text") or "").strip()
+        if text: out.append((day, str(it.get("tag") or "").lower(), text, 0))
+    return out
+
+def _fstamp(p: Path):
+    try: st = p.stat(); return [st.st_mtime_ns, st.st_size]
+    except OSError: return None
+
+def _group(key: str) -> str:
+    """Kaynak anahtarı → grup ("YYYY-MM" | "projects")."""
+    kind, _, name = key.partition(":")
+    return "projects" if kind == "project" else name[:7]
+
+class TodoIndex:
+    """
+    Açık todo maddelerinin artımlı indexi. Sorgular bellekteki gün/tag/proje haritalarından yanıtlanır;
+    önce gereken gruplar doğrulanır (damga karşılaştırması, sadece değişenler ayrıştırılır).
+    """
+    TTL = 2.0          # izleyici yokken grup doğrulama aralığı (sn)
+
+    def __init__(self, agenda_dir: Path, projects_dir: Path, store=None, watched=None):
+        self.root = Path(agenda_dir); self.projects_dir = Path(projects_dir)
+        self.store = store                     # journal kayıtları için agenda store (None → journal atlanır)
+        self.watched = watched or (lambda: False)   # değişiklikler olay olarak geliyor mu (VaultWatcher)
+        self.path = self.root / ".index" / "todos.json"
+        self.wb = persist.writer()
+        self._lock = threading.RLock()
+        self._src: dict[str, dict] | None = None
+        self._months: set[str] | None = None   # kaynağı olan aylar
+        self._stray: dict[str, Path] = {}       # gün → todos_YYYY-MM-DD.json
+        self._checked: dict[str, float] = {}    # grup / "months" → son doğrulama (monotonic)
+        self._notes: set[str] = set()           # tek tek doğrulanacak proje notları (göreli yol)
+        self._stale = True                      # bellekteki haritalar yeniden kurulmalı
+        self._items: list[Todo] = []
+        self._by_tag: dict[str, list[Todo]] = {}
+        self._by_project: dict[str, list[Todo]] = {}
+
+    # ── geçersiz kılma (olaylar)
+    def _fresh(self, g: str) -> bool:
+        t = self._checked.get(g)
+        return t is not None and (self.watched() or time.monotonic() - t < self.TTL)
+
+    def invalidate(self, group: str | None = None):
+        """Grubu (None → hepsini) bir sonraki sorguda yeniden doğrula."""
+        with self._lock:
+            if group is None: self._checked.clear()
+            else: self._checked.pop(group, None)
+
+    def touch_journal(self, d: date):
+        """Journal yazıldı (her backend): o ay doğrulansın."""
+        with self._lock:
+            ym = d.isoformat()[:7]
+            if self._months is not None: self._months.add(ym)
+            self._checked.pop(ym, None)
+
+    def on_vault_events(self, events):
+        """VaultWatcher partisi: etkilenen ayları / proje notlarını kirli işaretle (disk okunmaz)."""
+        with self._lock:
+            for e in events:
+                for p in (e.path, e.src):
+                    if p is not None: self._on_path(p, e.is_dir)
+
+    def _on_path(self, p: Path, is_dir: bool):
+        try:
+            rel = p.relative_to(self.projects_dir).as_posix()
+            if is_dir or p == self.projects_dir: self._checked.pop("projects", None)
+            elif p.suffix.lower() == ".md": self._notes.add(rel)
+            return
+        except ValueError:
+            pass
+        try: parts = p.relative_to(self.root).parts
+        except ValueError: return
+        if not parts or parts[0] == ".index": return
+        if is_dir and parts[0] in ("todos", "journal", "packed"):
+            self._checked.clear(); return      # klasör taşındı / silindi
+        ym = None
+        if len(parts) == 2 and parts[0] == "todos" and (m := _MONTH_RE.match(parts[1])): ym = f"{m.group(1)}-{m.group(2)}"
+        elif len(parts) == 1 and (m := _STRAY_RE.match(parts[0])):
+            day = m.group(1); ym = day[:7]
+            if p.exists(): self._stray[day] = p
+            else: self._stray.pop(day, None)
+        elif len(parts) == 4 and parts[0] == "journal": ym = f"{parts[1]}-{parts[2]}"
+        elif len(parts) == 2 and parts[0] == "packed": ym = parts[1][:7]
+        if ym:
+            if self._months is not None: self._months.add(ym)
+            self._checked.pop(ym, None)
+
+    # ── kaynak damgaları (grup başına)
+    def _discover(self):
+        """Kaynağı olan aylar: todos/ listesi, kökteki tek gün dosyaları, journal kayıtlarının ayları."""
+        months, stray = set(), {}
+        tdir = self.root / "todos"
+        if tdir.is_dir():
+            for e in os.scandir(tdir):
+                m = _MONTH_RE.match(e.name)
+                if m and e.is_file(): months.add(f"{m.group(1)}-{m.group(2)}")
+        if self.root.is_dir():
+            for e in os.scandir(self.root):
+                m = _STRAY_RE.match(e.name)
+                if m and e.is_file(): stray[m.group(1)] = Path(e.path); months.add(m.group(1)[:7])
+        if self.store is not None:
+            months |= {f"{d.year:04d}-{d.month:02d}" for d in self.store.entries("journal")}
+        self._months, self._stray = months, stray
+        self._checked["months"] = time.monotonic()
+
+    def _month_stamps(self, ym: str) -> dict[str, tuple]:
+        out = {}
+        p = self.root / "todos" / f"{ym}.json"
+        if (st := _fstamp(p)): out[f"month:{ym}"] = (st, p)
+        for day, p in self._stray.items():
+            if day.startswith(ym) and (st := _fstamp(p)): out[f"stray:{day}"] = (st, p)
+        if self.store is not None:
+            for day, st in self.store.scan("journal", [(int(ym[:4]), int(ym[5:]))]).items():
+                out[f"journal:{day}"] = (st, day)
+        return out
+
+    def _project_stamps(self) -> dict[str, tuple]:
+        out = {}
+        if self.projects_dir.is_dir():
+            for dirpath, dirnames, filenames in os.walk(self.projects_dir):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                for fn in filenames:
+                    if not fn.lower().endswith(".md"): continue
+                    p = Path(dirpath) / fn; st = _fstamp(p)
+                    if st: out[f"project:{p.relative_to(self.projects_dir).as_posix()}"] = (st, p)
+        return out
+
+    def _parse(self, key: str, ref) -> list:
+        kind, _, name = key.partition(":")
+        try:
+            if kind == "month":
+                data = json.loads(self.wb.read_text(ref))
+                return [x for day, items in sorted(data.items()) for x in _json_items(items, day)] if isinstance(data, dict) else []
+            if kind == "stray":
+                return _json_items(json.loads(self.wb.read_text(ref)), name)
+            if kind == "journal":
+                return parse_checkboxes(self.store.read("journal", date.fromisoformat(name)), name)
+            if kind == "project":
+                return parse_checkboxes(self.wb.read_text(ref))
+        except Exception:
+            pass
+        return []
+
+    def _sync(self, keys, stamps: dict[str, tuple]) -> int:
+        """keys (grubun bilinen kaynakları) ile güncel damgaları eşitle; değişen kaynak sayısı."""
+        n = 0
+        for key in [k for k in keys if k not in stamps]:
+            del self._src[key]; n += 1
+        for key, (st, ref) in stamps.items():
+            ent = self._src.get(key)
+            if ent and ent.get("stamp") == st: continue
+            self._src[key] = {"stamp": st, "items": [list(x) for x in self._parse(key, ref)]}; n += 1
+        return n
+
+    # ── index
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.wb.read_text(self.path))
+            if data.get("version") == _VERSION: return data.get("sources", {})
+        except Exception:
+            pass
+        return {}
+
+    def _save(self):
+        self.wb.write_text(self.path, json.dumps({"version": _VERSION, "sources": self._src}, ensure_ascii=False))
+
+    def _ensure(self, months=None, projects: bool = True) -> int:
+        """Gerekli grupları doğrula. months: None → hepsi, aksi halde ay süzgeci (ym → bool)."""
+        with self._lock:
+            if self._src is None: self._src = self._load()
+            if self._months is None or not self._fresh("months"): self._discover()
+            known = {}
+            for key in self._src: known.setdefault(_group(key), []).append(key)
+            n = 0
+            for ym in sorted(self._months | (known.keys() - {"projects"})):
+                if months is not None and not months(ym): continue
+                if self._fresh(ym): continue
+                n += self._sync(known.get(ym, ()), self._month_stamps(ym))
+                self._checked[ym] = time.monotonic()
+            if projects:
+                if not self._fresh("projects"):
+                    n += self._sync(known.get("projects", ()), self._project_stamps())
+                    self._checked["projects"] = time.monotonic(); self._notes.clear()
+                elif self._notes:
+                    for rel in self._notes:
+                        key, p = f"project:{rel}", self.projects_dir / rel
+                        st = _fstamp(p)
+                        n += self._sync([key] if key in self._src else [], {key: (st, p)} if st else {})
+                    self._notes.clear()
+            if n or self._stale: self._rebuild(); self._stale = False
+            if n: self._save()
+            return n
+
+    def refresh(self) -> int:
+        """Tüm grupları şimdi doğrula (olay beklemeden); ayrıştırılan kaynak sayısını döndürür."""
+        self.invalidate(); return self._ensure()
+
+    def _rebuild(self):
+        items = []
+        for key, ent in self._src.items():
+            project = key.split(":", 1)[1].split("/", 1)[0] if key.startswith("project:") else None
+            for day, tag, text, line in ent["items"]:
+                items.append(Todo(day, tag, text, project, key, line))
+        items.sort(key=lambda t: (t.day or "9999-99-99", t.source, t.line))
+        by_tag, by_project = {}, {}
+        for t in items:
+            if t.tag: by_tag.setdefault(t.tag, []).append(t)
+            if t.project: by_project.setdefault(t.project, []).append(t)
+        self._items, self._by_tag, self._by_project = items, by_tag, by_project
+
+    # ── sorgular (açık maddeler, gün sıralı; günsüzler en sonda)
+    def open_items(self) -> list[Todo]:
+        self._ensure(); return list(self._items)
+
+    def overdue(self, today: date | None = None) -> list[Todo]:
+        # sadece bugünün ayına kadarki aylar + projeler doğrulanır (ay kaynaklarının maddesi kendi ayındadır;
+        # gelecek bir günün notundaki geçmiş tarihli @due istisnası bir sonraki tam sorguda görünür)
+        lim = (today or date.today()).isoformat()
+        self._ensure(months=lambda ym: ym <= lim[:7])
+        out = []
+        for t in self._items:          # gün sıralı: ilk bugün/günsüz maddede dur
+            if t.day is None or t.day >= lim: break
+            out.append(t)
+        return out
+
+    def between(self, start: date, end: date) -> list[Todo]:
+        """Günü [start, end] içinde olan açık maddeler (o aylar + projeler)."""
+        a, b = start.isoformat(), end.isoformat()
+        self._ensure(months=lambda ym: a[:7] <= ym <= b[:7])
+        return [t for t in self._items if t.day is not None and a <= t.day <= b]
+
+    def by_tag(self, tag: str) -> list[Todo]:
+        self._ensure(); return list(self._by_tag.get(tag.lower(), []))
+
+    def by_project(self, project: str) -> list[Todo]:
+        self._ensure(months=lambda ym: False); return list(self._by_project.get(project, []))
+
+    def tags(self) -> list[str]:
+        self._ensure(); return sorted(self._by_tag)
+
+    def projects(self) -> list[str]:
+        self._ensure(months=lambda ym: False); return sorted(self._by_project)
+
+    # ── tek ay (panel için: tamamlananlar dahil, sadece o ayın dosyası okunur)
+    def month(self, y: int, m: int) -> dict[str, list[dict]]:
+        try: data = json.loads(self.wb.read_text(self.root / "todos" / f"{y:04d}-{m:02d}.json"))
+        except Exception: return {}
+        return data if isinstance(data, dict) else {}
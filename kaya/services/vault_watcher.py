@@ -0,0 +1,188 @@
+# kaya/services/vault_watcher.py
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+import os, sys, time
+from PySide6 import QtCore
+
+# Vault değişiklik olayları. Klasörler QFileSystemWatcher ile izlenir; izlenemeyen klasörler
+# (ağ sürücüleri, watch limiti) POLL_MS'de bir yoklanır. Sinyal gelen klasör yeniden listelenir ve
+# önceki listeyle karşılaştırılır: yeni/silinen/değişen girişler (inode ile taşıma eşlemesi).
+# Klasör izlemesi yerinde yazımları (aynı inode) görmez; bu yüzden ilk FILE_LIMIT dosya ayrıca izlenir,
+# gerisi için değişiklik klasör sinyali (atomik kaydetme, oluşturma, silme) ya da yoklama ile yakalanır.
+# Olaylar DEBOUNCE_MS sessizlikten sonra (en geç MAX_DELAY_MS içinde) tek parti halinde yayınlanır.
+SKIP_NAMES = {".index", ".git", "__pycache__"}
+REMOTE_FS = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "fuse.sshfs", "sshfs", "9p", "afs", "davfs", "fuse.rclone"}
+
+@dataclass(frozen=True)
+class VaultEvent:
+    kind: str                 # "created" | "modified" | "deleted" | "moved"
+    path: Path
+    src: Path | None = None   # moved: eski yol
+    is_dir: bool = False
+
+    def under(self, root: Path) -> bool:
+        """Olay (taşımada kaynağı dahil) root altında mı?"""
+        return any(p is not None and (p == root or root in p.parents) for p in (self.path, self.src))
+
+def is_remote(path: Path) -> bool:
+    """Ağ bağlama noktası mı? (Windows: UNC yolu, Linux: /proc/mounts dosya sistemi türü)"""
+    s = str(path)
+    if sys.platform.startswith("win"): return s.startswith("\\\\")
+    try: mounts = Path("/proc/mounts").read_text().splitlines()
+    except OSError: return False
+    best, fstype = "", ""
+    for line in mounts:
+        parts = line.split()
+        if len(parts) < 3: continue
+        mnt = parts[1].replace("\\040", " ")
+        if (s == mnt or s.startswith(mnt.rstrip("/") + "/")) and len(mnt) > len(best): best, fstype = mnt, parts[2]
+    return fstype in REMOTE_FS
+
+def _listing(d: Path) -> dict[str, tuple[bool, int, int, int]] | None:
+    """{ad: (klasör mü, mtime_ns, boyut, inode)}; klasör yoksa None."""
+    out = {}
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                if e.name in SKIP_NAMES or e.name.startswith(".") and e.name not in (".kaya",): continue
+                try: st = e.stat(follow_symlinks=False)
+                except OSError: continue
+                isdir = e.is_dir(follow_symlinks=False)
+                out[e.name] = (isdir, 0 if isdir else st.st_mtime_ns, 0 if isdir else st.st_size, st.st_ino)
+    except OSError:
+        return None
+    return out
+
+class VaultWatcher(QtCore.QObject):
+    """
+    Tek vault izleyicisi: changed([VaultEvent]) partiler halinde yayınlanır.
+    Tüketiciler VaultEvent.under(kök) ile kendi alanlarını süzer ve sadece değişeni günceller.
+    Klasör olayları alt ağacı kapsar (silinen/taşınan klasör için çocuklar ayrıca bildirilmez).
+    """
+    changed = QtCore.Signal(list)
+    DEBOUNCE_MS = 250
+    MAX_DELAY_MS = 1500
+    POLL_MS = 2000
+    FILE_LIMIT = 4000
+
+    def __init__(self, root: Path, ignore=(), parent=None):
+        super().__init__(parent)
+        self.root = Path(root)
+        self.ignore = {Path(p) for p in ignore}
+        self._snap: dict[Path, dict] = {}
+        self._poll: set[Path] = set()            # yoklanan klasörler
+        self._dirty: set[Path] = set()
+        self._first = 0.0
+        self._w = QtCore.QFileSystemWatcher(self)
+        self._w.directoryChanged.connect(self._on_dir)
+        self._w.fileChanged.connect(lambda f: self.mark(Path(f).parent))
+        self._t = QtCore.QTimer(self); self._t.setSingleShot(True); self._t.setInterval(self.DEBOUNCE_MS)
+        self._t.timeout.connect(self.flush)
+        self._pt = QtCore.QTimer(self); self._pt.setInterval(self.POLL_MS)
+        self._pt.timeout.connect(self._on_poll)
+        self._remote = is_remote(self.root)
+        self._add_tree(self.root)
+
+    # ── izleme kümesi
+    def _skip(self, d: Path) -> bool:
+        return d in self.ignore or any(p in self.ignore for p in d.parents)
+
+    def _add_tree(self, top: Path, emit: list | None = None):
+        """top ve altındaki klasörleri listele + izlemeye al; emit verilirse içerik 'created' olarak eklenir."""
+        stack, added, files = [top], [], []
+        while stack:
+            d = stack.pop()
+            if self._skip(d): continue
+            lst = _listing(d)
+            if lst is None: continue
+            self._snap[d] = lst; added.append(d)
+            for name, (isdir, *_r) in lst.items():
+                if isdir: stack.append(d / name); continue
+                files.append(d / name)
+                if emit is not None: emit.append(VaultEvent("created", d / name))
+        if self._remote:
+            self._poll.update(added)
+        elif added:
+            failed = self._w.addPaths([str(d) for d in added])
+            self._poll.update(Path(f) for f in failed)
+            self._watch_files(files)
+        if self._poll and not self._pt.isActive(): self._pt.start()
+
+    def _watch_files(self, files):
+        room = self.FILE_LIMIT - len(self._w.files())
+        if room > 0 and files and not self._remote: self._w.addPaths([str(f) for f in files[:room]])
+
+    def _drop_tree(self, top: Path):
+        gone = [d for d in self._snap if d == top or top in d.parents]
+        for d in gone: self._snap.pop(d, None); self._poll.discard(d)
+        watched = set(self._w.directories())
+        rm = [str(d) for d in gone if str(d) in watched]
+        pre = str(top) + os.sep
+        rm += [f for f in self._w.files() if f.startswith(pre)]
+        if rm: self._w.removePaths(rm)
+
+    def close(self):
+        """İzlemeyi bırak (vault kapanırken); bekleyen olaylar atılır."""
+        self._t.stop(); self._pt.stop(); self._dirty.clear()
+        paths = self._w.directories() + self._w.files()
+        if paths: self._w.removePaths(paths)
+        self._snap.clear(); self._poll.clear()
+
+    def watched(self) -> tuple[int, int, int]:
+        """(izlenen klasör, izlenen dosya, yoklanan klasör) sayısı."""
+        return len(self._w.directories()), len(self._w.files()), len(self._poll)
+
+    # ── sinyaller
+    def _on_dir(self, path: str):
+        self.mark(Path(path))
+
+    def _on_poll(self):
+        for d in list(self._poll): self._dirty.add(d)
+        if self._dirty: self.flush()
+
+    def mark(self, d: Path):
+        """Klasörü kirli say (dışarıdan da çağrılabilir: kendi yazımlarımızı hemen yansıtmak için)."""
+        now = time.monotonic()
+        if not self._dirty: self._first = now
+        self._dirty.add(Path(d))
+        if (now - self._first) * 1000 >= self.MAX_DELAY_MS: self.flush()   # sürekli yazım: bekletme
+        else: self._t.start()
+
+    # ── karşılaştırma
+    def flush(self):
+        self._t.stop()
+        dirty, self._dirty = self._dirty, set()
+        created, deleted, events = [], [], []
+        for d in sorted(dirty, key=lambda p: len(p.parts)):
+            if d not in self._snap: continue                # üst klasörle birlikte silinmiş
+            new = _listing(d)
+            old = self._snap[d]
+            if new is None:                                  # klasörün kendisi gitti; üst klasör bildirir
+                self._drop_tree(d); continue
+            self._snap[d] = new
+            for name, meta in new.items():
+                o = old.get(name)
+                if o is None: created.append((d / name, meta))
+                elif o[0] != meta[0]: deleted.append((d / name, o)); created.append((d / name, meta))
+                elif not meta[0] and (o[3] != meta[3] or o[1:3] != meta[1:3]):
+                    events.append(VaultEvent("modified", d / name))   # yerinde yazım veya atomik değiştirme
+            for name, o in old.items():
+                if name not in new: deleted.append((d / name, o))
+        # taşıma: aynı inode bir yerden kaybolup başka yerde belirdi
+        by_ino = {(o[3], o[0]): p for p, o in deleted if o[3]}
+        moved = set()
+        for p, meta in created:
+            src = by_ino.pop((meta[3], meta[0]), None) if meta[3] else None
+            if src is not None:
+                events.append(VaultEvent("moved", p, src, meta[0])); moved.add(src)
+                if meta[0]: self._drop_tree(src); self._add_tree(p)
+            else:
+                events.append(VaultEvent("created", p, None, meta[0]))
+                if meta[0]: self._add_tree(p, emit=events)
+        for p, o in deleted:
+            if p in moved: continue
+            events.append(VaultEvent("deleted", p, None, o[0]))
+            if o[0]: self._drop_tree(p)
+        self._watch_files([e.path for e in events if e.kind in ("created", "modified", "moved") and not e.is_dir])
+        if events: self.changed.emit(events)
@@ -30,6 +30,58 @@ def _resolve_person_id(db, token: str) -> Optional[int]:
             return r["id"]
     return rows[0]["id"]
 
+# ===================== Agenda helpers =====================
+
+_AGENDAS: Dict[str, Any] = {}   # agenda dir → AgendaFS (commands without a main window)
+
+def _agenda_for(fs, main_window=None):
+    """Return the main window's shared AgendaFS, else one cached AgendaFS per agenda folder.
+
+    Each AgendaFS owns a prefetch pool, a write-behind timer and a flush hook, so command
+    calls reuse one instead of opening (and leaking) a new one every time.
+    """
+    afs = getattr(main_window, "afs", None)
+    if afs is not None:
+        return afs
+    key = str(Path(fs.p.agenda_dir).resolve())
+    afs = _AGENDAS.get(key)
+    if afs is None:
+        from ..ui.agenda_page import AgendaFS
+        afs = _AGENDAS[key] = AgendaFS(fs)
+    return afs
+
+_SEARCHES: Dict[str, Any] = {}  # files dir → SearchIndex (commands without a main window)
+
+def _search_for(fs, main_window=None):
+    """Return the main window's vault search index, else one cached index per workspace.
+
+    The window's index is kept current by the vault watcher; the cached one falls back
+    to TTL-based revalidation on query.
+    """
+    idx = getattr(main_window, "search", None)
+    if idx is not None:
+        return idx
+    key = str(Path(fs.p.files_dir).resolve())
+    idx = _SEARCHES.get(key)
+    if idx is None:
+        from ..services.search_index import SearchIndex
+        idx = _SEARCHES[key] = SearchIndex(fs.p.files_dir, fs.p.projects_dir)
+        _agenda_for(fs).attach_search(idx)
+    return idx
+
+# ===================== Asset helpers =====================
+
+def _assets_for(fs):
+    """Return the content-addressed AssetStore of <workspace>/assets."""
+    from ..services.asset_store import store_for
+    return store_for(Path(fs.p.files_dir).parent)
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
 # ===================== Project helpers =====================
 
 def _projects_root(fs) -> Path:
@@ -328,6 +380,381 @@ Usage:
 
         return f"Unknown subcommand: {sub}\n{cmd_project.__doc__}"
 
+    # -------- AGENDA --------
+    def cmd_agenda(p):
+        """
+Usage:
+  agenda prune [dry=1]                 remove empty (0 byte) day files
+  agenda consolidate [dry=1]           move legacy journal/timeline files to the canonical layout
+  agenda backend                       show the storage backend
+  agenda migrate files|packed|sqlite [keep=1]
+                                       move all entries to another backend
+  agenda export "<dir>"                write entries in the classic file layout
+  agenda search <text> [kind=journal|plan|tags]
+  agenda find [tag=exam] [from=YYYY-MM-DD] [to=YYYY-MM-DD] [text=...]
+                                       query tag lines from the tag index
+  agenda reminders                     upcoming exam/birthday/event reminders
+  agenda next [n=5]                    next timed (timeline) entries from now
+  agenda free [from=YYYY-MM-DD] [to=YYYY-MM-DD] [min=30] [start=08:00] [end=22:00]
+                                       free slots between timed entries (default: next 7 days)
+  agenda conflicts [from=YYYY-MM-DD] [to=YYYY-MM-DD]
+                                       overlapping timed entries (default: next 31 days)
+  agenda ics-import "<file.ics>"       merge calendar events into the agenda
+  agenda ics-export "<file.ics>" [from=YYYY-MM-DD] [to=YYYY-MM-DD]
+        """
+
+        pos = [x for x in p.get("pos", []) if x is not None]
+        kv  = p.get("kv", {})
+        if not pos:
+            return cmd_agenda.__doc__.strip()
+
+        sub = pos[0].lower()
+        afs = _agenda_for(fs, main_window)
+
+        if sub == "prune":
+            dry  = (kv.get("dry") or "").strip().lower() in ("1", "true", "yes")
+            gone = afs.prune_empty(dry=dry)
+            if not gone:
+                return "No empty agenda files."
+            verb = "Would remove" if dry else "Removed"
+            return f"{verb} {len(gone)} empty file(s)."
+
+        if sub == "consolidate":
+            dry  = (kv.get("dry") or "").strip().lower() in ("1", "true", "yes")
+            done = afs.consolidate(dry=dry)
+            if not done:
+                return "Nothing to consolidate."
+            verb = "Would move" if dry else "Moved"
+            lines = [f"{verb} {sum(len(x[2]) for x in done)} legacy file(s):"]
+            for kind, day, paths, _ in done:
+                if paths: lines.append(f"  {day} {kind:8} ← " + ", ".join(p.name for p in paths))
+            kept = [p for x in done for p in x[3]]
+            if kept:
+                lines.append(f"Kept {len(kept)} unreadable file(s) in place (not UTF-8 or invalid JSON):")
+                lines += [f"  {p.relative_to(afs.root).as_posix()}" for p in kept]
+            return "\n".join(lines)
+
+        if sub == "backend":
+            return f"Agenda backend: {afs.backend}"
+
+        if sub == "migrate":
+            from ..services.agenda_store import BACKENDS
+            target = pos[1].lower() if len(pos) > 1 else ""
+            if target not in BACKENDS:
+                return "Usage: agenda migrate " + "|".join(BACKENDS) + " [keep=1]"
+            if target == afs.backend:
+                return f"Already on '{target}'."
+            keep = (kv.get("keep") or "").strip().lower() in ("1", "true", "yes")
+            n = afs.set_backend(target, migrate=True, keep=keep)
+            return f"Migrated {n} entries to '{target}'."
+
+        if sub == "export":
+            if len(pos) < 2:
+                return 'Usage: agenda export "<dir>"'
+            dst = Path(pos[1]).expanduser()
+            if dst.exists() and any(dst.iterdir()):
+                return "Target folder is not empty."
+            n = afs.export_files(dst)
+            return f"Exported {n} entries to {dst}"
+
+        if sub == "search":
+            q = " ".join(pos[1:]).strip()
+            if not q:
+                return "Usage: agenda search <text> [kind=journal|plan|tags]"
+            kinds = [k.strip() for k in (kv.get("kind") or "").split(",") if k.strip()] or None
+            try:
+                rows = afs.search(q, kinds=kinds)
+            except Exception as ex:
+                return f"Search failed: {ex}"
+            if not rows:
+                return "No results."
+            out = ["Day        | Kind    | Match", "-" * 72]
+            for day, kind, snip in rows:
+                out.append(f"{day} | {kind:7} | {' '.join(snip.split())[:52]}")
+            return "\n".join(out)
+
+        if sub in ("ics-import", "ics-export"):
+            from datetime import date
+            if len(pos) < 2:
+                return f'Usage: agenda {sub} "<file.ics>"'
+            path = Path(pos[1]).expanduser()
+            if sub == "ics-import":
+                if not path.is_file():
+                    return f"File not found: {path}"
+                try:
+                    r = afs.import_ics(path)
+                except Exception as ex:
+                    return f"Import failed: {ex}"
+                return (f"Read {r['events']} event(s); updated {r['tag_days']} tag day(s) "
+                        f"and {r['timeline_days']} timeline day(s).")
+            try:
+                start = date.fromisoformat(kv["from"]) if kv.get("from") else None
+                end   = date.fromisoformat(kv["to"]) if kv.get("to") else None
+            except ValueError:
+                return "Dates must be YYYY-MM-DD."
+            n = afs.export_ics(path, start, end)
+            return f"Exported {n} event(s) to {path}"
+
+        if sub == "reminders":
+            sched = getattr(main_window, "reminders", None)
+            if sched is None:
+                return "Reminders are not running."
+            rows = sched.upcoming(15)
+            if not rows:
+                return "No upcoming reminders."
+            return "\n".join(f"{at:%Y-%m-%d %H:%M}  {tag:8} {day}  {text}" for at, day, tag, text in rows)
+
+        if sub in ("next", "free", "conflicts"):
+            from datetime import date, datetime, timedelta
+            from ..services.timeline import parse_hm
+            tl = afs.timeline
+            if sub == "next":
+                try:
+                    n = max(1, int(kv.get("n") or (pos[1] if len(pos) > 1 else 5)))
+                except ValueError:
+                    return "Usage: agenda next [n=5]"
+                rows = tl.upcoming(datetime.now(), n)
+                if not rows:
+                    return "No upcoming timed entries."
+                return "\n".join(f"{at:%Y-%m-%d %a %H:%M}–{it.get('end', '')}  {it.get('text', '')}" for at, it in rows)
+            today = date.today()
+            try:
+                start = date.fromisoformat(kv["from"]) if kv.get("from") else today
+                end   = date.fromisoformat(kv["to"]) if kv.get("to") else start + timedelta(days=6 if sub == "free" else 30)
+            except ValueError:
+                return "Dates must be YYYY-MM-DD."
+            if end < start:
+                return "'to' is before 'from'."
+            if sub == "conflicts":
+                pairs = tl.conflicts(start, end)
+                if not pairs:
+                    return f"No overlapping entries {start} → {end}."
+                fmt = lambda x: f"{x[1].get('time')}–{x[1].get('end', '')} {x[1].get('text', '')}"
+                out = [f"{a[0]}  {fmt(a)}  ⟷  {'' if b[0] == a[0] else f'{b[0]} '}{fmt(b)}" for a, b in pairs]
+                out.append(f"{len(pairs)} overlap(s)")
+                return "\n".join(out)
+            ds, de = parse_hm(kv.get("start") or "08:00"), parse_hm(kv.get("end") or "22:00")
+            if ds is None or de is None or de <= ds:
+                return "start/end must be HH:MM with start < end."
+            try:
+                mn = max(1, int(kv.get("min") or 30))
+            except ValueError:
+                return "min must be minutes."
+            slots = tl.free_slots(start, end, mn, ds, de)
+            if not slots:
+                return f"No free slots of {mn}+ min {start} → {end}."
+            return "\n".join(f"{a:%Y-%m-%d %a}  {a:%H:%M}–{b:%H:%M}  ({int((b - a).total_seconds()) // 60} min)" for a, b in slots)
+
+        if sub == "find":
+            from datetime import date
+            tag = (kv.get("tag") or (pos[1] if len(pos) > 1 else "")).strip().lstrip("#").lower() or None
+            try:
+                start = date.fromisoformat(kv["from"]) if kv.get("from") else None
+                end   = date.fromisoformat(kv["to"]) if kv.get("to") else None
+            except ValueError:
+                return "Dates must be YYYY-MM-DD."
+            rows = afs.find_tags(tag, start, end, text=(kv.get("text") or "").strip() or None)
+            if not rows:
+                return "No matching tags."
+            out = ["Day        | Tag       | Text", "-" * 72]
+            for day, tg, tx in rows:
+                out.append(f"{day} | {tg:9} | {tx[:52]}")
+            out.append(f"{len(rows)} line(s)")
+            return "\n".join(out)
+
+        return f"Unknown subcommand: {sub}\n{cmd_agenda.__doc__.strip()}"
+
+    def cmd_todos(p):
+        """
+Usage:
+  todos                     all open todos
+  todos overdue             open todos past their day
+  todos tag=<tag>           open todos with a tag (#tag in markdown, "tag" in json)
+  todos project=<name>      open checkboxes in a project's notes
+        """
+        pos = [x for x in p.get("pos", []) if x is not None]
+        kv  = p.get("kv", {})
+        idx = _agenda_for(fs, main_window).todos
+
+        if pos and pos[0].lower() in ("help", "?"):
+            return cmd_todos.__doc__.strip()
+        if pos and pos[0].lower() == "overdue":
+            rows, title = idx.overdue(), "Overdue"
+        elif kv.get("tag"):
+            rows, title = idx.by_tag(kv["tag"].lstrip("#")), f"Tag #{kv['tag'].lstrip('#')}"
+        elif kv.get("project"):
+            name = kv["project"]
+            proj = _find_project_by_name(fs, name)
+            rows, title = idx.by_project(proj.name if proj else name), f"Project {proj.name if proj else name}"
+        elif pos:
+            return f"Unknown subcommand: {pos[0]}\n{cmd_todos.__doc__.strip()}"
+        else:
+            rows, title = idx.open_items(), "Open"
+
+        if not rows:
+            return f"{title}: no open todos."
+        out = [f"{title}: {len(rows)} open", "Day        | Tag       | Text", "-" * 72]
+        for t in rows:
+            where = t.project or t.source.split(":", 1)[0]
+            out.append(f"{t.day or '-':10} | {t.tag or '-':9} | {t.text[:40]}  ({where})")
+        return "\n".join(out)
+
+    # -------- SEARCH --------
+    def cmd_search(p):
+        """
+Usage:
+  search "<query>" [in=files|projects|agenda] [limit=20]
+                            full-text search over the vault (ranked, with snippets)
+  search reindex            re-check every note against the index now
+  search stats              indexed documents per scope
+
+Query: plain words must all match (last word as prefix); "exact phrase", OR, NOT, NEAR and * are passed to FTS5.
+        """
+        pos = [x for x in p.get("pos", []) if x is not None]
+        kv  = p.get("kv", {})
+        if not pos or pos[0].lower() in ("help", "?"):
+            return cmd_search.__doc__.strip()
+        idx = _search_for(fs, main_window)
+
+        if len(pos) == 1 and pos[0].lower() == "reindex":
+            return f"Reindexed: {idx.refresh(force=True)} document(s) changed."
+        if len(pos) == 1 and pos[0].lower() == "stats":
+            counts = idx.count()
+            return "\n".join(f"{s:9} {counts.get(s, 0)}" for s in ("files", "projects", "agenda"))
+
+        scopes = None
+        if kv.get("in"):
+            scopes = [s.strip().lower() for s in kv["in"].split(",") if s.strip()]
+            bad = [s for s in scopes if s not in ("files", "projects", "agenda")]
+            if bad:
+                return f"Unknown scope: {', '.join(bad)} (use files, projects or agenda)"
+        try:
+            limit = max(1, int(kv.get("limit") or 20))
+        except ValueError:
+            return "limit must be a number."
+
+        query = " ".join(pos)
+        hits = idx.search(query, scopes=scopes, limit=limit)
+        if not hits:
+            return f"No matches for: {query}"
+        out = [f"{len(hits)} match(es) for: {query}"]
+        for h in hits:
+            out.append(f"[{h.scope}] {h.key}  — {h.title}")
+            out.append(f"    {' '.join(h.snippet.split())}")
+        return "\n".join(out)
+
+    # -------- VAULTS --------
+    def cmd_vault(p):
+        """
+Usage:
+  vault                     show the open vault
+  vault list                vaults under the vaults folder
+  vault open <name>         switch to a vault (pending saves are flushed, services restarted)
+  vault new <name>          create a vault and switch to it
+  vault snapshot            incremental snapshot of the open vault (runs in the background)
+  vault snapshots           list snapshots of the open vault
+  vault restore <id>        restore a snapshot (the current state is snapshotted first)
+        """
+        from ..core import vaults
+        pos = [x for x in p.get("pos", []) if x is not None]
+        cur = getattr(getattr(main_window, "vault", None), "name", None) or vaults.current_name()
+        if not pos:
+            return f"Vault: {cur}  ({Path(fs.p.files_dir).parent})"
+        sub = pos[0].lower()
+        if sub in ("help", "?"):
+            return cmd_vault.__doc__.strip()
+        if sub == "list":
+            names = vaults.names()
+            if not names:
+                return "No vaults yet."
+            return "\n".join(f"{'*' if n == cur else ' '} {n}" for n in names)
+        if sub in ("open", "new"):
+            if len(pos) < 2:
+                return f"Usage: vault {sub} <name>"
+            name = " ".join(pos[1:])
+            if not vaults.valid_name(name):
+                return f"Invalid vault name: {name}"
+            if sub == "new" and vaults.get(name).exists():
+                return f"Vault already exists: {name} (use: vault open {name})"
+            if not hasattr(main_window, "open_vault"):
+                return "Switching vaults needs the main window."
+            return main_window.open_vault(name, create=(sub == "new"))
+        if sub in ("snapshot", "snapshots", "restore"):
+            return _vault_snapshots(sub, pos[1:])
+        return cmd_vault.__doc__.strip()
+
+    def _vault_snapshots(sub, args):
+        from ..core import vaults
+        from ..services import persist, snapshots
+        vault = getattr(main_window, "vault", None) or vaults.get(vaults.current_name())
+        root = snapshots.snapshots_dir(vault.root)
+        if sub == "snapshots":
+            rows = snapshots.list_snapshots(root)
+            if not rows:
+                return "No snapshots yet."
+            return "\n".join(f"{m['id']}  {m['count']:>6} files  {_fmt_bytes(m['bytes']):>9}  "
+                             f"(+{m['copied']} copied, {_fmt_bytes(m['bytes_copied'])})" for m in rows)
+        if snapshots.SnapshotJob.busy(vault.root):
+            return "A snapshot job is already running for this vault."
+        if sub == "restore":
+            if not args:
+                return "Usage: vault restore <id>"
+            sid = args[0]
+            if snapshots.load_manifest(root, sid) is None:
+                return f"No such snapshot: {sid} (see: vault snapshots)"
+            if not hasattr(main_window, "restore_workspace"):
+                return "Restoring needs the main window."
+        persist.writer().flush()              # bekleyen yazımlar görüntüye girsin
+        job = snapshots.SnapshotJob(vault.root, parent=main_window)
+        log = getattr(getattr(main_window, "p_cons", None), "log", None)
+        if log is not None:
+            job.done.connect(log); job.failed.connect(log)
+        if sub == "restore":
+            job.staged.connect(main_window.restore_workspace)
+            job.restore(sid)
+            return f"Restoring snapshot {sid} in the background…"
+        job.snapshot()
+        return f"Snapshot of {vault.name} started in the background…"
+
+    # -------- ASSETS --------
+    def cmd_assets(p):
+        """
+Usage:
+  assets stats              blobs, bytes and references in <workspace>/assets
+  assets refs <digest>      notes that reference a blob
+  assets reindex            re-scan changed notes for asset references
+  assets gc [dry]           delete blobs no note or gallery uses (blobs newer than 1 hour are kept)
+        """
+        pos = [x for x in p.get("pos", []) if x is not None]
+        if not pos or pos[0].lower() in ("help", "?"):
+            return cmd_assets.__doc__.strip()
+        store = _assets_for(fs)
+        sub = pos[0].lower()
+
+        if sub == "stats":
+            st = store.stats()
+            return (f"Blobs: {st['blobs']} ({_fmt_bytes(st['bytes'])}), referenced: {st['referenced']}, "
+                    f"references: {st['refs']}")
+        if sub == "refs":
+            if len(pos) < 2:
+                return "Usage: assets refs <digest>"
+            docs = store.refs_of(pos[1].lower())
+            return "\n".join(docs) if docs else f"No references to {pos[1]}"
+        if sub == "reindex":
+            return f"Reindexed: {store.reindex()} document(s) changed."
+        if sub == "gc":
+            dry = len(pos) > 1 and pos[1].lower() in ("dry", "--dry")
+            keep = set()
+            afs = _agenda_for(fs, main_window)
+            if afs.store.name != "files":            # packed/sqlite kayıtları klasör taramasında görünmez
+                from ..services.asset_store import refs_in
+                for kind in ("journal", "plan"):
+                    for d in afs.store.entries(kind):
+                        keep |= refs_in(afs.store.read(kind, d))
+            n, size = store.collect(dry=dry, keep=keep)
+            return f"{'Would delete' if dry else 'Deleted'} {n} unused blob(s), {_fmt_bytes(size)}."
+        return cmd_assets.__doc__.strip()
+
     # register
     bus.register("new",      cmd_new)
     bus.register("mkdir",    cmd_mkdir)
@@ -335,3 +762,8 @@ Usage:
     bus.register("people",   cmd_people)
     bus.register("projects", cmd_projects)
     bus.register("project",  cmd_project)
+    bus.register("agenda",   cmd_agenda)
+    bus.register("todos",    cmd_todos)
+    bus.register("search",   cmd_search)
+    bus.register("assets",   cmd_assets)
+    bus.register("vault",    cmd_vault)
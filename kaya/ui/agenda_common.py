@@ -0,0 +1,21 @@
+# kaya/ui/agenda_common.py
+from PySide6 import QtWidgets
+
+# Ajanda sayfası ve sağ panelin ortak küçük parçaları (ajanda yığınını import etmeden kullanılır)
+
+# ---- Tagler ve renkleri ----
+TAG_COLORS = {
+    "exam":      "#E46060",
+    "homework":  "#E0C060",
+    "birthday":  "#60C070",
+    "event":     "#60B0E0",
+    "important": "#C080E0",
+}
+ALL_TAGS = list(TAG_COLORS.keys())
+
+def set_text_keep_cursor(w: QtWidgets.QPlainTextEdit, txt: str):
+    """Metni sinyal yaymadan değiştir; aynıysa dokunma, imleç konumunu koru."""
+    if w.toPlainText() == txt: return
+    pos = w.textCursor().position()
+    w.blockSignals(True); w.setPlainText(txt); w.blockSignals(False)
+    c = w.textCursor(); c.setPosition(min(pos, w.document().characterCount() - 1)); w.setTextCursor(c)
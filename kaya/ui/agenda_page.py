@@ -2,20 +2,30 @@
 from PySide6 import QtWidgets, QtCore, QtGui
 from pathlib import Path
 from datetime import date, datetime, timedelta
-import json, re
-
-# ---- Tagler ve renkleri ----
-TAG_COLORS = {
-    "exam":      "#E46060",
-    "homework":  "#E0C060",
-    "birthday":  "#60C070",
-    "event":     "#60B0E0",
-    "important": "#C080E0",
-}
-ALL_TAGS = list(TAG_COLORS.keys())
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import bisect, hashlib, json, os, re, threading
+
+from ..services import agenda_store, ics, persist
+from ..services.todo_index import TodoIndex
+from ..services.search_index import SearchIndex
+from ..services.agenda_legacy import LayoutResolver, LegacyView
+from ..services.timeline import Timeline, parse_day, dump_day, parse_entry, span, fmt_hm, clash_key, DAY, DEFAULT_LEN
+from .agenda_common import TAG_COLORS, ALL_TAGS, set_text_keep_cursor
 
 def ymd(d: date) -> str: return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
 def monday_of(d: date) -> date: return d - timedelta(days=d.weekday())
+def iter_months(start: date, end: date):
+    """[start, end] aralığına değen (yıl, ay) çiftleri."""
+    cur = start.replace(day=1)
+    while cur <= end:
+        yield cur.year, cur.month
+        cur = (cur + timedelta(days=32)).replace(day=1)
+def digest(txt: str) -> bytes: return hashlib.blake2b(txt.encode("utf-8"), digest_size=16).digest()
+def heat_level(jlen: int) -> int:
+    """Journal uzunluğu → 0..4 yoğunluk seviyesi (yıl görünümü)."""
+    return 0 if jlen <= 0 else 1 if jlen < 200 else 2 if jlen < 800 else 3 if jlen < 2000 else 4
 
 def iter_month_grid(y: int, m: int):
     first = date(y, m, 1)
@@ -24,13 +34,179 @@ def iter_month_grid(y: int, m: int):
         cur = start + timedelta(days=i)
         yield cur, (cur.month == m)
 
+# ────────────────────────────────────────────────────────────────────────────────
+# Gün önbelleği
+class DayCache(QtCore.QObject):
+    """
+    Son görülen günlerin LRU önbelleği: {date: (stamp, {"journal","plan","tags","timeline"})}.
+    Komşu günler arka plan thread'inde ön-yüklenir; stamp (dosya mtime'ları) değişmişse
+    gün yeniden okunur ve `refreshed(date)` yayınlanır (dışarıdan yapılan düzenlemeler için).
+    """
+    refreshed = QtCore.Signal(object)
+
+    def __init__(self, afs: "AgendaFS", size: int = 64):
+        super().__init__()
+        self.afs = afs; self.size = size
+        self._lru: OrderedDict[date, tuple] = OrderedDict()
+        self._gen: dict[date, int] = {}          # yazım sayacı: eski arka plan okumaları ezmesin
+        self._pending: set[date] = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agenda-prefetch")
+
+    def _load(self, d: date) -> tuple:
+        stamp = self.afs.day_stamp(d)
+        return stamp, {"journal": self.afs.read_journal(d), "plan": self.afs.read_plan(d),
+                       "tags": self.afs.read_tags_text(d), "timeline": self.afs.read_timeline_text(d)}
+
+    def _store(self, d: date, ent: tuple, gen: int) -> bool:
+        with self._lock:
+            if self._gen.get(d, 0) != gen: return False
+            self._lru[d] = ent; self._lru.move_to_end(d)
+            while len(self._lru) > self.size: self._lru.popitem(last=False)
+            return True
+
+    def get(self, d: date) -> dict[str, str]:
+        with self._lock:
+            ent = self._lru.get(d)
+            if ent is not None:
+                self._lru.move_to_end(d); return dict(ent[1])
+            gen = self._gen.get(d, 0)
+        ent = self._load(d); self._store(d, ent, gen)
+        return dict(ent[1])
+
+    def prefetch(self, days):
+        """Eksik günleri yükle, önbellekteki günleri doğrula (hepsi arka planda)."""
+        for d in days:
+            with self._lock:
+                if d in self._pending: continue
+                self._pending.add(d); gen = self._gen.get(d, 0)
+            self._pool.submit(self._bg_load, d, gen)
+
+    def _bg_load(self, d: date, gen: int):
+        try:
+            with self._lock: old = self._lru.get(d)
+            stamp = self.afs.day_stamp(d)
+            if old is not None and old[0] == stamp: return
+            ent = self._load(d)
+            if self._store(d, ent, gen) and old is not None and old[1] != ent[1]:
+                self.refreshed.emit(d)
+        except Exception:
+            pass
+        finally:
+            with self._lock: self._pending.discard(d)
+
+    def update(self, d: date, kind: str, txt: str):
+        """Yazımdan sonra: önbellekteki günü yerinde güncelle."""
+        with self._lock:
+            self._gen[d] = self._gen.get(d, 0) + 1
+            ent = self._lru.get(d)
+        if ent is None: return
+        texts = dict(ent[1]); texts[kind] = txt
+        self._store(d, (self.afs.day_stamp(d), texts), self._gen[d])
+
+    def stamp(self, d: date) -> tuple | None:
+        with self._lock:
+            ent = self._lru.get(d)
+        return ent[0] if ent is not None else None
+
+    def revalidate(self, d: date) -> bool:
+        """Damgası değişen günü yeniden oku; metinler aynıysa sadece damgayı sessizce güncelle
+        (arka planda tamamlanan kendi yazımlarımız). İçerik değiştiyse / önbellekte yoksa True."""
+        with self._lock:
+            old = self._lru.get(d); gen = self._gen.get(d, 0)
+        if old is None: return True
+        ent = self._load(d)
+        if ent[1] != old[1]: return True
+        self._store(d, ent, gen); return False
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def invalidate(self, d: date | None = None):
+        with self._lock:
+            if d is None:
+                for k in self._lru: self._gen[k] = self._gen.get(k, 0) + 1
+                self._lru.clear()
+            else:
+                self._gen[d] = self._gen.get(d, 0) + 1
+                self._lru.pop(d, None)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Ortak belge deposu (sağ panel + gün görünümü)
+class AgendaDocs(QtCore.QObject):
+    """
+    Düzenlenen gün metinlerinin tek kopyası. Kaydedilmiş hali DayCache'te, henüz yazılmamış
+    düzenlemeler {(gün, tür): metin} olarak burada durur; tüm editörler buradan okur ve buraya yazar.
+      changed(gün, tür, kaynak)  düzenleme / dış değişiklik (kaynak: düzenleyen widget, dışarıdansa None)
+      saved(gün, türler)         write-behind yazımından sonra
+    Depoya aktarım tek zamanlayıcı ile (DELAY ms) toplu yapılır; uygulama kapanırken yazıcı (persist)
+    kuyruğu boşaltmadan önce bekleyenler aktarılır.
+    """
+    changed = QtCore.Signal(object, str, object)
+    saved = QtCore.Signal(object, object)
+    KINDS = ("journal", "plan", "tags")
+    DELAY = 400
+
+    def __init__(self, afs: "AgendaFS"):
+        super().__init__()
+        self.afs = afs
+        self._dirty: dict[tuple[date, str], str] = {}
+        self._timer = QtCore.QTimer(self); self._timer.setSingleShot(True); self._timer.setInterval(self.DELAY)
+        self._timer.timeout.connect(self.flush)
+        afs.cache.refreshed.connect(self._on_refreshed)
+        persist.writer().on_flush(self.flush)
+
+    def text(self, d: date, kind: str) -> str:
+        txt = self._dirty.get((d, kind))
+        return self.afs.read_day(d)[kind] if txt is None else txt
+
+    def day(self, d: date) -> dict[str, str]:
+        texts = self.afs.read_day(d)
+        for kind in self.KINDS:
+            if (d, kind) in self._dirty: texts[kind] = self._dirty[(d, kind)]
+        return texts
+
+    def set(self, d: date, kind: str, txt: str, source=None):
+        if self.text(d, kind) == txt: return
+        self._dirty[(d, kind)] = txt; self._timer.start()
+        self.changed.emit(d, kind, source)
+
+    def pending(self) -> int: return len(self._dirty)
+
+    def flush(self):
+        self._timer.stop()
+        if not self._dirty: return
+        pending, self._dirty = self._dirty, {}
+        writers = {"journal": self.afs.write_journal, "plan": self.afs.write_plan, "tags": self.afs.write_tags_text}
+        written: dict[date, set[str]] = {}
+        with self.afs.bulk():
+            for (d, kind), txt in pending.items():
+                if txt == self.afs.read_day(d)[kind]: continue      # geri alınmış düzenleme
+                writers[kind](d, txt); written.setdefault(d, set()).add(kind)
+        for d, kinds in written.items(): self.saved.emit(d, kinds)
+
+    def _on_refreshed(self, d: date):
+        """Kayıt dışarıdan değişti: düzenlenmemiş türleri abonelere bildir."""
+        for kind in agenda_store.KINDS:
+            if (d, kind) not in self._dirty: self.changed.emit(d, kind, None)
+
 # ────────────────────────────────────────────────────────────────────────────────
 # FS katmanı
 class AgendaFS:
     """
-    Journal:  <agenda_dir>/journal/YYYY/MM/DD.md
-    Plan:     fs.day_note(YYYY-MM-DD)           (sağ panel ile aynı)
-    Tags:     <agenda_dir>/tags/YYYY-MM-DD.txt  (sadece tag kutusu)
+    Depolama `agenda_store` backend'ine devredilir (<agenda_dir>/agenda.json → "backend"):
+      files  (varsayılan)  journal/YYYY/MM/DD.md, YYYY-MM-DD.md (sağ panel ile aynı), tags/YYYY-MM-DD.txt
+      packed               packed/YYYY-MM.kpk (ay başına tek dosya)
+      sqlite               <workspace>/database/kaya.db (tarih indexleri + FTS5 tam metin arama)
+    Timeline: gün başına zamanlı kayıtlar ("timeline" türü, JSON); yüklenen aylar `self.timeline` aralık ağacında.
+    Index:    <agenda_dir>/.index/tags/YYYY-MM.json (ay bazlı tag index'i, kayıt damgası ile doğrulanır)
+              ters tag index (bellekte): tag → [(gün, metin)], ay indexlerinden kurulur
+              <agenda_dir>/.index/stats2-YYYY.json (gün başına [tag sayısı, journal uzunluğu]; yıl görünümü)
+
+    Eski düzenler (YYYY-MM-DD.journal.md, journal_YYYY-MM-DD.md, journal/YYYY/MM/YYYY-MM-DD.md, timeline/YYYY/MM/)
+    `LayoutResolver` ile bir kez taranır; boş journal okumaları bu haritaya düşer, `consolidate()` kanonik yere taşır.
+
+    Okumalar dosya oluşturmaz; gün kayıtları ilk boş olmayan yazımda açılır.
     """
     TAG_LINE = re.compile(
         r"^\s*(?:#(?P<tag1>\w+)|\[(?P<tag2>\w+)\]|(?P<tag3>\w+))[:\s]+\s*(?P<text>.+?)\s*$",
@@ -40,48 +216,394 @@ class AgendaFS:
     def __init__(self, fs):
         self.fs = fs
         self.root = Path(fs.p.agenda_dir)
-        (self.root / "journal").mkdir(parents=True, exist_ok=True)
-        (self.root / "tags").mkdir(parents=True, exist_ok=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.store = agenda_store.open_store(self.root, parse_tags=self.parse_tags_text)
+        self._files = agenda_store.FileStore(self.root)     # klasik düzenin yolları (dışa aktarım/bakım)
+        self.legacy = LayoutResolver(self.root)
+        self.view = LegacyView(self.store, self.legacy)       # store + eski düzen (aralık okuma, arama, todo)
+        self.timeline = Timeline(self._timeline_month)
+        self._tag_index: dict[str, dict] = {}
+        self._postings: dict[str, list[tuple[str,str]]] | None = None   # ilk tag sorgusunda kurulur
+        self._day_tags: dict[str, list[tuple[str,str]]] = {}
+        self._stats: dict[int, dict[str, list[int]]] = {}
+        self._todos: TodoIndex | None = None
+        self.watched = False                 # VaultWatcher olayları on_vault_events'e geliyor mu (ana pencere ayarlar)
+        self._vault_search: SearchIndex | None = None   # vault'un arama indexi (sahibi ana pencere; attach_search)
+        self.tag_listeners: list = []        # write_tags_text sonrası çağrılır: cb(gün, [(tag, metin)])
+        self._defer: set[tuple] | None = None  # bulk() içinde index kayıtları ertelenir
+        self.cache = DayCache(self)
+        self.docs = AgendaDocs(self)         # editörlerin ortak belge deposu (tek write-behind)
+        self.docs.saved.connect(self._search_saved)
+
+    @property
+    def backend(self) -> str: return self.store.name
+
+    def close(self):
+        """Vault kapanırken: bekleyen düzenlemeler yazılır, arka plan okumaları, store ve indexler kapanır."""
+        wb = persist.writer()
+        wb.off_flush(self.docs.flush)
+        self.docs.flush(); wb.drain()
+        self.cache.close()
+        self._vault_search = None
+        self.store.close(); self.tag_listeners.clear()
+
+    def set_watched(self, on: bool):
+        """İzleyici bağlandı/ayrıldı: olaylara güvenmeden önce todo gruplarını bir kez yeniden doğrula."""
+        self.watched = on
+        if self._todos is not None: self._todos.invalidate()
+
+    @property
+    def todos(self) -> TodoIndex:
+        """Açık todo indexi (todos/*.json, todos_*.json, journal ve proje notlarındaki "- [ ]" maddeleri)."""
+        if self._todos is None:
+            self._todos = TodoIndex(self.root, self.fs.p.projects_dir, self.view, watched=lambda: self.watched)
+        return self._todos
+
+    @property
+    def vault_search(self) -> SearchIndex | None:
+        return self._vault_search
+
+    def attach_search(self, idx: SearchIndex | None):
+        """Vault arama indexini bağla: agenda kayıtları (kaydetme, harici değişiklik, backend) ona bildirilir."""
+        self._vault_search = idx
+        if idx is not None: idx.store = self.view
+
+    def _search_saved(self, d: date, kinds):
+        if self._vault_search is not None: self._vault_search.touch_agenda(d, kinds)
+
+    def set_backend(self, name: str, migrate: bool = True, keep: bool = False) -> int:
+        """Backend değiştir; migrate=True ise kayıtlar yeni backend'e taşınır (keep=False → kaynak silinir)."""
+        if name == self.store.name: return 0
+        persist.writer().flush()           # bekleyen düzenlemeler + yazım kuyruğu: taşıma diskteki hali okur
+        dst = agenda_store.make_store(self.root, name, parse_tags=self.parse_tags_text)
+        n = agenda_store.migrate(self.store, dst, remove_source=not keep) if migrate else 0
+        self.store.close(); self.store = self.view.store = dst
+        if self._todos: self._todos.invalidate()
+        if self._vault_search: self._vault_search.invalidate("agenda")
+        self.timeline = Timeline(self._timeline_month)
+        agenda_store.write_config(self.root, backend=name)
+        self._tag_index.clear(); self._postings = None; self.cache.invalidate()
+        if not migrate:   # veri değişti: yıl özetleri yeniden kurulsun
+            self._stats.clear()
+            for p in (self.root / ".index").glob("stats*.json"): persist.writer().unlink(p)
+        return n
+
+    def export_files(self, target: Path) -> int:
+        """Geçerli backend'i klasik dosya düzeninde target klasörüne yaz."""
+        persist.writer().flush()
+        return agenda_store.export_files(self.store, Path(target))
+
+    # indexli sorgular (backend destekliyorsa indexten, yoksa kayıtlar taranır)
+    def search(self, query: str, kinds=None, limit: int = 50) -> list[tuple[str, str, str]]:
+        """Tam metin arama → [(gün, tür, parça)]."""
+        if hasattr(self.store, "search"):
+            return self.store.search(query, kinds=kinds, limit=limit)
+        q = query.lower(); out = []
+        for kind in kinds or agenda_store.KINDS:
+            for d in self.view.entries(kind):
+                txt = self.view.read(kind, d); i = txt.lower().find(q)
+                if i < 0: continue
+                out.append((ymd(d), kind, txt[max(0, i-30):i+len(q)+30].replace("\n", " ")))
+                if len(out) >= limit: return out
+        return out
+
+    def find_tags(self, tag: str | None = None, start: date | None = None, end: date | None = None,
+                  text: str | None = None) -> list[tuple[str, str, str]]:
+        """
+        Tag satırı sorgusu → [(gün, tag, metin)], gün sıralı. Kayıt okunmaz:
+        sqlite'ta (tag, gün) tablo indexinden, diğerlerinde bellekteki ters indexten yanıtlanır.
+        """
+        start, end = start or date.min, end or date.max
+        if hasattr(self.store, "tag_range"):
+            rows = self.store.tag_range(tag, start, end)
+        else:
+            post = self._tag_postings(); lo = ymd(start)
+            hi = ymd(end + timedelta(days=1)) if end < date.max else "9999-99"   # üst sınır: ertesi günün ilk satırı
+            rows = []
+            for tg in ([tag] if tag else sorted(post)):
+                lst = post.get(tg, [])
+                i = bisect.bisect_left(lst, (lo,)); j = bisect.bisect_left(lst, (hi,))
+                rows += [(day, tg, tx) for day, tx in lst[i:j]]
+            if not tag: rows.sort(key=lambda r: r[0])
+        if text:
+            q = text.casefold(); rows = [r for r in rows if q in r[2].casefold()]
+        return rows
+
+    # aralık okuma (akış)
+    def iter_range(self, start: date, end: date, kinds=agenda_store.KINDS, workers: int = 0, batch: int = 12):
+        """
+        [start, end] aralığındaki dolu günleri tarih sırasıyla üretir: (date, {tür: metin}).
+        Listelemeler `batch` aylık gruplar halinde yapılır (klasör başına tek listeleme),
+        sadece var olan kayıtlar okunur (eski düzen dosyaları dahil). workers>0 ise okumalar thread havuzuna dağıtılır;
+        sonuçlar yine tarih sırasıyla, ay ay akar.
+        """
+        kinds = tuple(kinds); lo, hi = ymd(start), ymd(end)
+        months = list(iter_months(start, end))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agenda-range") if workers > 0 else None
+        read = lambda job: self.view.read(job[1], date.fromisoformat(job[0]))
+        try:
+            for i in range(0, len(months), batch):
+                chunk = months[i:i+batch]
+                found: dict[str, list[str]] = {}
+                for kind in kinds:
+                    for day in self.view.scan(kind, chunk):
+                        if lo <= day <= hi: found.setdefault(day, []).append(kind)
+                for y, m in chunk:
+                    key = f"{y:04d}-{m:02d}"
+                    jobs = [(day, kind) for day in sorted(found) if day.startswith(key) for kind in found[day]]
+                    texts = pool.map(read, jobs) if pool else map(read, jobs)
+                    cur, bucket = None, {}
+                    for (day, kind), txt in zip(jobs, texts):
+                        if day != cur:
+                            if cur: yield date.fromisoformat(cur), bucket
+                            cur, bucket = day, dict.fromkeys(kinds, "")
+                        bucket[kind] = txt
+                    if cur: yield date.fromisoformat(cur), bucket
+        finally:
+            if pool: pool.shutdown(wait=False, cancel_futures=True)
+
+    # gün (önbellekli)
+    def read_day(self, d: date) -> dict[str, str]:
+        """{"journal","plan","tags"} metinleri; önbellekte yoksa senkron okunur."""
+        return self.cache.get(d)
+    def prefetch_around(self, d: date):
+        """Önceki/sonraki gün + haftanın kalanını arka planda ısıt; d'nin kendisini de doğrula."""
+        mon = monday_of(d)
+        days = [d, d + timedelta(days=1), d - timedelta(days=1)]
+        days += [mon + timedelta(days=i) for i in range(7) if mon + timedelta(days=i) not in days]
+        self.cache.prefetch(days)
+    def day_stamp(self, d: date) -> tuple:
+        return tuple(self.view.stamp(k, d) for k in agenda_store.KINDS)
 
     # journal
     def journal_path(self, d: date) -> Path:
-        return self.root / "journal" / f"{d.year:04d}" / f"{d.month:02d}" / f"{d.day:02d}.md"
+        return self._files.path("journal", d)
     def read_journal(self, d: date) -> str:
-        p = self.journal_path(d)
-        try: return p.read_text(encoding="utf-8")
-        except: return ""
+        return self.store.read("journal", d) or self.legacy.read("journal", d)
     def write_journal(self, d: date, txt: str):
-        p = self.journal_path(d); p.parent.mkdir(parents=True, exist_ok=True); p.write_text(txt, encoding="utf-8")
+        self.store.write("journal", d, txt); self.cache.update(d, "journal", txt)
+        if self._todos is not None: self._todos.touch_journal(d)
+        self._drop_legacy("journal", d)
+        self._bump_stats(d, 1, len(txt.strip()))
+
+    # timeline: [{"time","end","text"}] (JSON); sorgular self.timeline üzerinden
+    def read_timeline_text(self, d: date) -> str:
+        txt = self.store.read("timeline", d)
+        if parse_day(txt): return txt
+        for p in self.legacy.files("timeline", d):      # eski düzen (timeline/YYYY/MM/)
+            try: old = p.read_text(encoding="utf-8")
+            except Exception: continue
+            if parse_day(old): return old
+        return txt
+    def read_timeline(self, d: date) -> list[dict]:
+        return parse_day(self.read_day(d)["timeline"])
+    def write_timeline(self, d: date, items):
+        txt = dump_day(items)
+        self.store.write("timeline", d, txt); self.cache.update(d, "timeline", txt)
+        self._drop_legacy("timeline", d)
+        self.timeline.set_day(d, parse_day(txt))
+    def _timeline_month(self, y: int, m: int) -> dict[str, str]:
+        days = self.view.scan("timeline", [(y, m)])
+        return {day: self.read_timeline_text(date.fromisoformat(day)) for day in days}
+
+    def _drop_legacy(self, kind: str, d: date):
+        """
+        Gün yeni düzende yazıldı: aynı günün eski düzen dosyaları (okumada yedek) artık gölge.
+        Silme yazıcı kuyruğuna girer ve yeni kayıt diske indikten sonra çalışır (files backend'de
+        kayıt hâlâ kuyruktaysa iş onun arkasına yeniden sıralanır). Okunamayan dosyalar bırakılır.
+        """
+        keep = self._files.path(kind, d)
+        old = []
+        for p in self.legacy.files(kind, d):
+            if p == keep: continue
+            try: p.read_text(encoding="utf-8"); old.append(p)
+            except Exception: pass
+        if not old: return
+        wb = persist.writer(); key = ("drop-legacy", kind, ymd(d))
+        def drop():
+            if wb.pending(keep) is not ...: wb.submit(key, drop); return
+            for p in old: p.unlink(missing_ok=True)
+            self.legacy.invalidate()
+        wb.submit(key, drop)
 
     # plan (sync)
     def plan_path(self, d: date) -> Path:
-        return self.fs.day_note(ymd(d))
+        return self.fs.day_note_path(ymd(d))
     def read_plan(self, d: date) -> str:
-        p = self.plan_path(d)
-        try: return p.read_text(encoding="utf-8")
-        except: return ""
+        return self.store.read("plan", d)
     def write_plan(self, d: date, txt: str):
-        self.plan_path(d).write_text(txt, encoding="utf-8")
+        self.store.write("plan", d, txt); self.cache.update(d, "plan", txt)
 
     # tags
     def tags_path(self, d: date) -> Path:
-        return self.root / "tags" / f"{ymd(d)}.txt"
+        return self._files.path("tags", d)
     def read_tags_text(self, d: date) -> str:
-        p = self.tags_path(d)
-        try: return p.read_text(encoding="utf-8")
-        except: return ""
+        return self.store.read("tags", d)
     def write_tags_text(self, d: date, txt: str):
-        self.tags_path(d).write_text(txt, encoding="utf-8")
+        written = self.store.write("tags", d, txt); self.cache.update(d, "tags", txt)
+        if not written: return
+        # index'i yerinde güncelle (sonraki ay çiziminde kayıt tekrar okunmasın)
+        key = ymd(d)[:7]
+        idx = self._load_tag_index(key)
+        pairs = self.parse_tags_text(txt)
+        idx[ymd(d)] = {"mtime": self.store.stamp("tags", d) or 0, "tags": [list(x) for x in pairs]}
+        self._save_tag_index(key); self._post_day(ymd(d), pairs)
+        self._bump_stats(d, 0, len(pairs))
+        for cb in self.tag_listeners: cb(d, pairs)
+
+    @contextmanager
+    def bulk(self):
+        """Toplu yazım: ay tag indexleri ve yıl özetleri gün başına değil, sonunda bir kez kaydedilir."""
+        if self._defer is not None: yield; return
+        self._defer = set()
+        try: yield
+        finally:
+            pending, self._defer = self._defer, None
+            for kind, key in pending:
+                if kind == "tags": self._save_tag_index(key)
+                else: self._save_stats(key)
+
+    # iCalendar
+    def import_ics(self, path: Path) -> dict[str, int]:
+        """
+        .ics dosyasını akış halinde okur; olaylar güne göre gruplanır, her gün en fazla bir kez yazılır.
+        Tüm gün olayları → tag satırı (#kategori, yoksa #event); saatli olaylar → timeline
+        (kategori bilinen bir tag ise ayrıca "#tag HH:MM başlık"). Mevcut satırlarla birleştirilir;
+        birleşik metnin hash'i değişmeyen gün yazılmaz (aynı dosyayı tekrar almak hiçbir şey yazmaz).
+        """
+        tags: dict[date, list[tuple[str,str]]] = {}; tl: dict[date, list[dict]] = {}; n = 0
+        with open(path, encoding="utf-8", errors="replace", newline="") as f:
+            for ev in ics.iter_events(f):
+                n += 1; start, end = ev["start"], ev.get("end")
+                title = " ".join((ev.get("summary") or "(untitled)").split())
+                tag = next((c for c in ev["categories"] if c in ALL_TAGS), None)
+                if isinstance(start, datetime):
+                    d = start.date(); s0 = start.hour*60 + start.minute
+                    e0 = (end.hour*60 + end.minute if end.date() == d else DAY) if isinstance(end, datetime) else s0 + DEFAULT_LEN
+                    tl.setdefault(d, []).append({"time": fmt_hm(s0), "end": fmt_hm(min(DAY, max(e0, s0 + 1))), "text": title})
+                    if tag: tags.setdefault(d, []).append((tag, f"{fmt_hm(s0)} {title}"))
+                else:
+                    tags.setdefault(start, []).append((tag or "event", title))
+        out = {"events": n, "tag_days": 0, "timeline_days": 0}
+        with self.bulk():
+            for d, pairs in sorted(tags.items()):
+                cur = self.read_tags_text(d); have = set(self.parse_tags_text(cur))
+                add = [f"#{tg} {tx}" for tg, tx in dict.fromkeys(pairs) if (tg, tx) not in have]
+                merged = "\n".join(([cur.rstrip("\n")] if cur.strip() else []) + add)
+                if add and digest(merged) != digest(cur):
+                    self.write_tags_text(d, merged); out["tag_days"] += 1
+            for d, items in sorted(tl.items()):
+                cur = parse_day(self.read_timeline_text(d)); have = {(it.get("time"), it.get("text")) for it in cur}
+                merged = list(cur)
+                for it in items:
+                    if (it["time"], it["text"]) in have: continue
+                    have.add((it["time"], it["text"])); merged.append(it)
+                if digest(dump_day(merged)) != digest(dump_day(cur)):
+                    self.write_timeline(d, merged); out["timeline_days"] += 1
+        return out
+
+    def export_ics(self, path: Path, start: date | None = None, end: date | None = None) -> int:
+        """Tag satırları → tüm gün olayları (CATEGORIES=tag), timeline → saatli olaylar. Akış halinde yazılır."""
+        lo, hi = start or date.min, end or date.max
+        with open(path, "w", encoding="utf-8", newline="") as f, ics.Writer(f) as w:
+            for day, tag, text in self.find_tags(None, start, end):
+                d = date.fromisoformat(day)
+                w.event(text, d, d + timedelta(days=1), categories=[tag])
+            days = {d for d in self.view.entries("timeline") if lo <= d <= hi}
+            for d in sorted(days):
+                base = datetime.combine(d, datetime.min.time())
+                for it in parse_day(self.read_timeline_text(d)):
+                    s0, e0 = span(it)
+                    w.event(it.get("text") or "", base + timedelta(minutes=s0), base + timedelta(minutes=e0))
+        return w.count
+
+    # bakım: eski düzenleri kanonik düzene taşı
+    def consolidate(self, dry: bool = False) -> list[tuple[str, str, list[Path], list[Path]]]:
+        """Eski journal/timeline dosyalarını birleştirip kanonik yere yazar (journal → aktif backend)."""
+        if not dry: self.docs.flush()
+        done = self.legacy.consolidate(self.store, dry=dry)
+        if done and not dry:
+            self.cache.invalidate(); self._stats.clear(); self.timeline = Timeline(self._timeline_month)
+        return done
+
+    # vault izleyicisi: ajanda ağacında dışarıdan yapılan değişiklikler
+    _EV_DAY_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+    _EV_JDAY_RE = re.compile(r"^journal/(\d{4})/(\d{2})/(\d{2})\.md$")
+    _EV_MONTH_RE = re.compile(r"^packed/(\d{4})-(\d{2})\.kpk$")
+
+    def _event_days(self, p: Path) -> list[date]:
+        try: rel = p.relative_to(self.root).as_posix()
+        except ValueError: return []
+        try:
+            m = self._EV_JDAY_RE.match(rel) or self._EV_DAY_RE.search(p.name)
+            if m: return [date(int(m.group(1)), int(m.group(2)), int(m.group(3)))]
+            m = self._EV_MONTH_RE.match(rel)
+            if m:
+                y, mo = int(m.group(1)), int(m.group(2))
+                return sorted({d for d in self.cache._lru if (d.year, d.month) == (y, mo)} | {date(y, mo, 1)})
+        except ValueError:
+            pass
+        return []
+
+    def on_vault_events(self, events):
+        """
+        VaultWatcher partisi: etkilenen günler önbellekte doğrulanır (değişmişse `cache.refreshed`),
+        timeline ağacı, ters tag indexi ve arama indexinin agenda kayıtları gün gün düzeltilir.
+        """
+        if self._todos is not None: self._todos.on_vault_events(events)
+        mine = [e for e in events if e.under(self.root)]
+        if not mine: return
+        if any(e.kind != "modified" for e in mine): self.legacy.invalidate()
+        days = sorted({d for e in mine for p in (e.path, e.src) if p is not None for d in self._event_days(p)})
+        days = [d for d in days if self.cache.stamp(d) != self.day_stamp(d) and self.cache.revalidate(d)]   # kendi yazımlarımız
+        if self._vault_search is not None:
+            for d in days: self._vault_search.touch_agenda(d)
+        for d in days:
+            self.cache.invalidate(d)
+            self.timeline.set_day(d, parse_day(self.read_timeline_text(d)))
+        idx = {}
+        for y, m in sorted({(d.year, d.month) for d in days}):
+            idx.update(self._refresh_tag_index(f"{y:04d}-{m:02d}", self.store.scan("tags", [(y, m)])))
+        for d in days:
+            pairs = [tuple(x) for x in idx.get(ymd(d), {}).get("tags", [])]
+            self._bump_stats(d, 0, len(pairs)); self._bump_stats(d, 1, len(self.read_journal(d).strip()))
+            for cb in self.tag_listeners: cb(d, pairs)
+            self.cache.refreshed.emit(d)
+
+    # bakım: eski sürümlerin bıraktığı 0 baytlık gün dosyalarını sil
+    def prune_empty(self, dry: bool = False) -> list[Path]:
+        """Ajanda ağacındaki boş .md/.txt dosyalarını (ve boşalan journal klasörlerini) siler."""
+        gone = []
+        for dirpath, dirnames, filenames in os.walk(self.root, topdown=False):
+            here = Path(dirpath)
+            if ".index" in here.relative_to(self.root).parts: continue
+            for fn in filenames:
+                p = here / fn
+                if p.suffix.lower() not in (".md", ".txt"): continue
+                try:
+                    if p.stat().st_size: continue
+                    if not dry: p.unlink()
+                    gone.append(p)
+                except OSError:
+                    pass
+            if not dry and here != self.root / "journal" and self.root / "journal" in here.parents:
+                try: here.rmdir()   # sadece boşsa başarılı olur
+                except OSError: pass
+        if gone and not dry: self.cache.invalidate()
+        return gone
 
     def parse_tags(self, d: date) -> list[tuple[str,str]]:
         """
         Tags kutusundaki satırları [("exam","Sınav var"), ...] döndürür.
         Sadece destekli tag’leri kabul eder.
         """
+        return self.parse_tags_text(self.read_tags_text(d))
+
+    @classmethod
+    def parse_tags_text(cls, txt: str) -> list[tuple[str,str]]:
         out = []
-        txt = self.read_tags_text(d)
         for line in txt.splitlines():
-            m = self.TAG_LINE.match(line)
+            m = cls.TAG_LINE.match(line)
             if not m: continue
             tg = (m.group("tag1") or m.group("tag2") or m.group("tag3") or "").lower()
             if tg in ALL_TAGS:
@@ -90,7 +612,117 @@ class AgendaFS:
 
     def day_has_any_tag(self, d: date) -> list[str]:
         """Ay görünümü için sadece var olan taglerin isimleri (renk noktaları için)."""
-        return [t for t,_ in self.parse_tags(d)]
+        return [t for t,_ in self.month_tags(d.year, d.month).get(ymd(d), [])]
+
+    # tag index (ay bazlı, kalıcı): <agenda_dir>/.index/tags/YYYY-MM.json
+    #   {"YYYY-MM-DD": {"mtime": <ns>, "tags": [[tag, text], ...]}, ...}
+    def _tag_index_path(self, key: str) -> Path:
+        return self.root / ".index" / "tags" / f"{key}.json"
+
+    def _load_tag_index(self, key: str) -> dict:
+        idx = self._tag_index.get(key)
+        if idx is None:
+            try: idx = json.loads(persist.writer().read_text(self._tag_index_path(key)))
+            except Exception: idx = {}
+            self._tag_index[key] = idx
+        return idx
+
+    def _save_tag_index(self, key: str):
+        if self._defer is not None: self._defer.add(("tags", key)); return
+        persist.writer().write_text(self._tag_index_path(key), json.dumps(self._tag_index.get(key, {}), ensure_ascii=False))
+
+    def _refresh_tag_index(self, key: str, stamps: dict[str,int]) -> dict:
+        """Ay indexini kayıt damgalarına (mtime) göre doğrular; sadece değişen günleri yeniden okur."""
+        idx = self._load_tag_index(key)
+        dirty = False
+        for day in [k for k in idx if k.startswith(key) and k not in stamps]:
+            del idx[day]; self._post_day(day, ()); dirty = True
+        for day, mt in stamps.items():
+            if not day.startswith(key): continue
+            ent = idx.get(day)
+            if ent and ent.get("mtime") == mt: continue
+            txt = self.store.read("tags", date.fromisoformat(day))
+            pairs = self.parse_tags_text(txt)
+            idx[day] = {"mtime": mt, "tags": [list(x) for x in pairs]}
+            self._post_day(day, pairs); dirty = True
+        if dirty: self._save_tag_index(key)
+        return idx
+
+    def month_tags(self, y: int, m: int) -> dict[str, list[tuple[str,str]]]:
+        key = f"{y:04d}-{m:02d}"
+        idx = self._refresh_tag_index(key, self.store.scan("tags", [(y, m)]))
+        return {day: [tuple(x) for x in ent["tags"]] for day, ent in idx.items() if ent["tags"]}
+
+    # ters tag index (bellekte): {tag: [(gün, metin), ...]} gün sıralı; ay indexlerinden bir kez kurulur,
+    # sonra ay indexi her değiştiğinde (yazım / damgası değişen günün yeniden okunması) gün gün düzeltilir
+    def _tag_postings(self) -> dict[str, list[tuple[str,str]]]:
+        if self._postings is None:
+            self._postings, self._day_tags = {}, {}
+            months = sorted({(d.year, d.month) for d in self.store.entries("tags")})
+            stamps = self.store.scan("tags", months) if months else {}
+            for y, m in months:
+                for day, ent in self._refresh_tag_index(f"{y:04d}-{m:02d}", stamps).items():
+                    self._post_day(day, ent["tags"])
+        return self._postings
+
+    def _post_day(self, day: str, pairs):
+        if self._postings is None: return
+        for tg, tx in self._day_tags.pop(day, ()):
+            lst = self._postings.get(tg, [])
+            i = bisect.bisect_left(lst, (day, tx))
+            if i < len(lst) and lst[i] == (day, tx): del lst[i]
+        pairs = [tuple(x) for x in pairs]
+        if pairs: self._day_tags[day] = pairs
+        for tg, tx in pairs: bisect.insort(self._postings.setdefault(tg, []), (day, tx))
+
+    # yıl özeti (kalıcı): <agenda_dir>/.index/stats2-YYYY.json  {"YYYY-MM-DD": [tag_sayısı, journal_uzunluğu]}
+    # Bir kez iter_range ile kurulur, sonra write_journal/write_tags_text ile yerinde güncellenir.
+    # (stats-YYYY.json: eski düzen günlerini saymayan önceki sürüm; yeniden kurulurken silinir)
+    def _stats_path(self, y: int) -> Path:
+        return self.root / ".index" / f"stats2-{y:04d}.json"
+
+    def year_stats(self, y: int) -> dict[str, list[int]]:
+        if y not in self._stats:
+            try: self._stats[y] = json.loads(persist.writer().read_text(self._stats_path(y)))
+            except Exception:
+                self._stats[y] = self._build_stats(y); self._save_stats(y)
+                old = self.root / ".index" / f"stats-{y:04d}.json"
+                if old.exists(): persist.writer().unlink(old)
+        return self._stats[y]
+
+    def _build_stats(self, y: int) -> dict[str, list[int]]:
+        st = {}
+        for d, texts in self.iter_range(date(y, 1, 1), date(y, 12, 31), kinds=("journal", "tags"), workers=4):
+            ent = [len(self.parse_tags_text(texts["tags"])), len(texts["journal"].strip())]
+            if any(ent): st[ymd(d)] = ent
+        return st
+
+    def _save_stats(self, y: int):
+        if self._defer is not None: self._defer.add(("stats", y)); return
+        persist.writer().write_text(self._stats_path(y), json.dumps(self._stats.get(y, {})))
+
+    def _bump_stats(self, d: date, col: int, val: int):
+        """Kaydedilen günün özetini güncelle. Sadece görünen değer (tag sayısı / seviye) değişince diske yazılır."""
+        if d.year not in self._stats and not persist.writer().exists(self._stats_path(d.year)): return   # ilk açılışta zaten taranır
+        st = self.year_stats(d.year); key = ymd(d)
+        old = st.get(key, [0, 0])
+        if old[col] == val: return
+        ent = list(old); ent[col] = val
+        if any(ent): st[key] = ent
+        else: st.pop(key, None)
+        if col == 0 or heat_level(old[1]) != heat_level(val): self._save_stats(d.year)
+
+    def range_tags(self, start: date, end: date) -> dict[str, list[tuple[str,str]]]:
+        """[start, end] aralığındaki günlerin tagleri; tek klasör listesi + ay başına bir index okuması."""
+        months = list(iter_months(start, end))
+        stamps = self.store.scan("tags", months)
+        lo, hi = ymd(start), ymd(end)
+        out = {}
+        for y, m in months:
+            for day, ent in self._refresh_tag_index(f"{y:04d}-{m:02d}", stamps).items():
+                if lo <= day <= hi and ent["tags"]:
+                    out[day] = [tuple(x) for x in ent["tags"]]
+        return out
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Ay hücresi
@@ -101,6 +733,10 @@ class DayCell(QtWidgets.QFrame):
         self.setFixedHeight(72); self.setObjectName("daycell"); self.setCursor(QtCore.Qt.PointingHandCursor)
 
     def set_colors(self, cols: list[str]): self.colors = cols; self.update()
+    def set_day(self, d: date, in_month: bool, cols: list[str]):
+        """Hücreyi yeniden kullan: sadece değişen durum varsa yeniden boya."""
+        if d == self.d and in_month == self.in_month and cols == self.colors: return
+        self.d = d; self.in_month = in_month; self.colors = cols; self.update()
     def mousePressEvent(self, e: QtGui.QMouseEvent):
         if e.button()==QtCore.Qt.LeftButton: self.clicked.emit(self.d)
 
@@ -147,6 +783,12 @@ class MonthView(QtWidgets.QWidget):
         self.w=QtWidgets.QWidget(); self.g=QtWidgets.QGridLayout(self.w)
         self.g.setHorizontalSpacing(10); self.g.setVerticalSpacing(10); self.g.setContentsMargins(6,4,6,4)
 
+        # 42 hücre bir kez kurulur; rebuild() sadece tarih/renk günceller
+        self.cells: list[DayCell] = []
+        for i,(d,in_m) in enumerate(iter_month_grid(self.cur.year, self.cur.month)):
+            cell=DayCell(d,in_m); cell.clicked.connect(self.go_day)
+            self.g.addWidget(cell, i//7, i%7); self.cells.append(cell)
+
         v=QtWidgets.QVBoxLayout(self); v.setContentsMargins(0,0,0,0); v.setSpacing(8)
         v.addLayout(t); v.addWidget(self.w,1)
 
@@ -165,22 +807,195 @@ class MonthView(QtWidgets.QWidget):
         self.cur = date.today().replace(day=1)
         self.rebuild()
 
+    watch = {"tags"}
+    def visible_range(self) -> tuple[date, date]:
+        grid = list(iter_month_grid(self.cur.year, self.cur.month))
+        return grid[0][0], grid[-1][0]
+
     def rebuild(self):
         self.title.setText(self.cur.strftime("%B %Y"))
-        while self.g.count():
-            it=self.g.takeAt(0)
-            if it and it.widget(): it.widget().deleteLater()
-        r=c=0
-        for d,in_m in iter_month_grid(self.cur.year, self.cur.month):
-            cell=DayCell(d,in_m)
-            tags = self.afs.day_has_any_tag(d)
-            cell.set_colors([TAG_COLORS[t] for t in tags])
-            cell.clicked.connect(self.go_day)
-            self.g.addWidget(cell,r,c); c+=1
-            if c==7: c=0; r+=1
+        grid = list(iter_month_grid(self.cur.year, self.cur.month))
+        tags = self.afs.range_tags(grid[0][0], grid[-1][0])
+        for cell,(d,in_m) in zip(self.cells, grid):
+            cell.set_day(d, in_m, [TAG_COLORS[t] for t,_ in tags.get(ymd(d), [])])
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Saat ızgarası (timeline): sütun başına bir gün
+class TimeGrid(QtWidgets.QWidget):
+    """
+    Zamanlı kayıtları saat ızgarasında blok olarak çizer. Çakışan kayıtlar yan yana şeritlere
+    bölünür ve kırmızı kenarla işaretlenir. Çift tık → yeni kayıt, sağ tık → düzenle/sil.
+    """
+    edited = QtCore.Signal(object, object)      # (gün, yeni kayıt listesi)
+    RULER, HEAD = 40, 0
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.days: list[date] = []; self.items: dict[date, list[dict]] = {}
+        self._lanes: dict[date, list[tuple]] = {}    # gün → [(başlangıç, bitiş, şerit, şerit sayısı, çakışma, kayıt)]
+        self.clashes = 0
+        self.h0, self.h1 = 7, 23
+        self.setMinimumWidth(180); self.setMouseTracking(True)
+        self._block = QtGui.QColor(0,160,120,150); self._clash = QtGui.QColor("#E46060")
+        self._line = QtGui.QColor(0,255,150,40); self._fg = QtGui.QColor("#B8F8D0")
+
+    def set_days(self, days: list[date], items: dict[date, list[dict]], clashes: set | None = None):
+        """clashes: Timeline.conflict_keys() (verilmezse şerit kümesinden tahmin edilir)."""
+        self.days = list(days); self.items = {d: list(items.get(d, [])) for d in days}
+        hit = None if clashes is None else (lambda d, it: clash_key(d, it) in clashes)
+        self._lanes = {d: self._layout(self.items[d], d, hit) for d in self.days}
+        self.clashes = sum(1 for ls in self._lanes.values() for x in ls if x[4])
+        spans = [span(it) for its in self.items.values() for it in its]
+        self.h0 = min([7] + [s // 60 for s, _ in spans]); self.h1 = max([23] + [-(-e // 60) for _, e in spans])
+        self.update()
+
+    @staticmethod
+    def _layout(items: list[dict], d: date | None = None, hit=None) -> list[tuple]:
+        """Aralık grafiğini şeritlere böl: çakışma kümesi başına en az şerit (açgözlü)."""
+        out, cluster, lane_end, cl_end = [], [], [], -1
+        def close():
+            n = len(lane_end)
+            for x in cluster: out.append((*x[:3], n, n > 1 if hit is None else hit(d, x[3]), x[3]))
+        for it in sorted(items, key=span):
+            s, e = span(it)
+            if s >= cl_end and cluster: close(); cluster, lane_end = [], []
+            lane = next((i for i, le in enumerate(lane_end) if le <= s), None)
+            if lane is None: lane = len(lane_end); lane_end.append(e)
+            else: lane_end[lane] = e
+            cluster.append((s, e, lane, it)); cl_end = max(cl_end, e) if cluster[:-1] else e
+        if cluster: close()
+        return out
+
+    def _geom(self):
+        cols = max(1, len(self.days)); cw = (self.width() - self.RULER) / cols
+        ph = max(0.1, (self.height() - 2) / ((self.h1 - self.h0) * 60))   # piksel / dakika
+        return cw, ph
+
+    def _rect(self, col: int, s: int, e: int, lane: int, n: int) -> QtCore.QRectF:
+        cw, ph = self._geom(); w = (cw - 6) / n
+        return QtCore.QRectF(self.RULER + col*cw + 3 + lane*w, 1 + (s - self.h0*60)*ph, w - 1, max(4.0, (e - s)*ph - 1))
+
+    def paintEvent(self, ev):
+        p = QtGui.QPainter(self); p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        cw, ph = self._geom(); fm = p.fontMetrics()
+        for h in range(self.h0, self.h1 + 1):
+            y = 1 + (h - self.h0)*60*ph
+            p.setPen(self._line); p.drawLine(QtCore.QPointF(self.RULER, y), QtCore.QPointF(self.width(), y))
+            if h < self.h1:
+                p.setPen(self._fg); p.drawText(QtCore.QRectF(0, y, self.RULER - 4, fm.height()), QtCore.Qt.AlignRight, f"{h:02d}")
+        for col, d in enumerate(self.days):
+            x = self.RULER + col*cw
+            p.setPen(self._line); p.drawLine(QtCore.QPointF(x, 0), QtCore.QPointF(x, self.height()))
+            if d == date.today():
+                now = datetime.now(); y = 1 + (now.hour*60 + now.minute - self.h0*60)*ph
+                p.setPen(QtGui.QPen(QtGui.QColor(0,255,180,200), 1.5)); p.drawLine(QtCore.QPointF(x, y), QtCore.QPointF(x + cw, y))
+            for s, e, lane, n, clash, it in self._lanes.get(d, []):
+                r = self._rect(col, s, e, lane, n)
+                p.setPen(QtGui.QPen(self._clash, 1.5) if clash else QtCore.Qt.NoPen); p.setBrush(self._block); p.drawRoundedRect(r, 3, 3)
+                p.setPen(self._fg)
+                p.drawText(r.adjusted(3, 1, -2, 0), QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop | QtCore.Qt.TextWordWrap,
+                           f"{it.get('time')} {it.get('text', '')}")
+
+    def _hit(self, pos: QtCore.QPointF):
+        """(gün, dakika, kayıt | None)"""
+        cw, ph = self._geom()
+        if pos.x() < self.RULER or not self.days: return None, 0, None
+        col = min(len(self.days) - 1, int((pos.x() - self.RULER) // cw)); d = self.days[col]
+        minute = int(self.h0*60 + (pos.y() - 1) / ph)
+        for s, e, lane, n, clash, it in self._lanes.get(d, []):
+            if self._rect(col, s, e, lane, n).contains(pos): return d, minute, it
+        return d, minute, None
+
+    def mouseMoveEvent(self, e):
+        d, _, it = self._hit(e.position())
+        self.setToolTip(f"{it.get('time')}–{it.get('end', '')}  {it.get('text', '')}" if it else "")
+
+    def mouseDoubleClickEvent(self, e):
+        d, minute, it = self._hit(e.position())
+        if d is None: return
+        if it is not None: self._edit(d, it); return
+        s = max(0, min(24*60 - 30, minute // 30 * 30))
+        self._ask(d, f"{fmt_hm(s)}-{fmt_hm(min(24*60, s + 60))} ", None)
+
+    def contextMenuEvent(self, e):
+        d, minute, it = self._hit(QtCore.QPointF(e.pos()))
+        if d is None or it is None: return
+        m = QtWidgets.QMenu(self)
+        m.addAction("Edit…").triggered.connect(lambda: self._edit(d, it))
+        m.addAction("Delete").triggered.connect(lambda: self.edited.emit(d, [x for x in self.items[d] if x is not it]))
+        m.exec(e.globalPos())
+
+    def _edit(self, d: date, it: dict):
+        self._ask(d, f"{it.get('time')}-{it.get('end') or fmt_hm(span(it)[1])} {it.get('text', '')}", it)
+
+    def _ask(self, d: date, preset: str, old: dict | None):
+        txt, ok = QtWidgets.QInputDialog.getText(self, ymd(d), "HH:MM-HH:MM text", text=preset)
+        if not ok: return
+        new = parse_entry(txt)
+        if new is None: return
+        self.edited.emit(d, [x for x in self.items.get(d, []) if x is not old] + [new])
 
 # ────────────────────────────────────────────────────────────────────────────────
-# Hafta görünümü
+# Hafta görünümü: tek model (1 satır × 7 gün) + çizim delegesi
+class WeekModel(QtCore.QAbstractTableModel):
+    """Sütun = gün. Satırlar gün başına ((tag, metin), ...) olarak tutulur; sadece değişen sütun güncellenir."""
+    PairsRole = QtCore.Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.days: list[date] = [date.min] * 7
+        self.rows: list[tuple] = [()] * 7
+        self._bold = QtGui.QFont(); self._bold.setBold(True)
+        self._today = QtGui.QBrush(QtGui.QColor("#00FFB0"))
+
+    def rowCount(self, parent=QtCore.QModelIndex()): return 0 if parent.isValid() else 1
+    def columnCount(self, parent=QtCore.QModelIndex()): return 0 if parent.isValid() else 7
+
+    def data(self, idx, role=QtCore.Qt.DisplayRole):
+        if not idx.isValid(): return None
+        pairs = self.rows[idx.column()]
+        if role == self.PairsRole: return pairs
+        if role == QtCore.Qt.ToolTipRole and pairs: return "\n".join(f"#{t} {x}" for t, x in pairs)
+        return None
+
+    def headerData(self, sec, orient, role=QtCore.Qt.DisplayRole):
+        if orient != QtCore.Qt.Horizontal or not 0 <= sec < 7: return None
+        d = self.days[sec]
+        if role == QtCore.Qt.DisplayRole: return QtCore.QDate(d.year, d.month, d.day).toString("ddd dd")
+        if d == date.today():
+            if role == QtCore.Qt.FontRole: return self._bold
+            if role == QtCore.Qt.ForegroundRole: return self._today
+        return None
+
+    def set_week(self, days: list[date], rows: list[tuple]):
+        if days != self.days:
+            self.days = days; self.headerDataChanged.emit(QtCore.Qt.Horizontal, 0, 6)
+        for i, r in enumerate(rows):
+            if r == self.rows[i]: continue
+            self.rows[i] = r; ix = self.index(0, i)
+            self.dataChanged.emit(ix, ix, [self.PairsRole])
+
+class WeekDelegate(QtWidgets.QStyledItemDelegate):
+    """Tag satırlarını renkli, tek satır (kırpılmış) çizer; sığmayanlar "+N more" olur."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pens = {t: QtGui.QColor(c) for t, c in TAG_COLORS.items()}
+        self._plain = QtGui.QColor("#A0D8C8"); self._edge = QtGui.QColor(0,255,150,56)
+
+    def paint(self, p: QtGui.QPainter, opt, idx):
+        p.save()
+        r = opt.rect.adjusted(3, 3, -3, -3)
+        p.setPen(self._edge); p.setBrush(QtCore.Qt.NoBrush); p.drawRect(r)
+        pairs = idx.data(WeekModel.PairsRole) or ()
+        fm = opt.fontMetrics; lh = fm.height() + 2
+        x, y, w = r.left() + 6, r.top() + 6, r.width() - 12
+        for i, (tag, text) in enumerate(pairs):
+            if y + 2*lh > r.bottom() and i < len(pairs) - 1:
+                p.setPen(self._plain); p.drawText(x, y + fm.ascent(), f"+{len(pairs) - i} more"); break
+            p.setPen(self._pens.get(tag, self._plain))
+            p.drawText(x, y + fm.ascent(), fm.elidedText(text, QtCore.Qt.ElideRight, w)); y += lh
+        p.restore()
+
 class WeekView(QtWidgets.QWidget):
     go_day = QtCore.Signal(QtCore.QDate)
     def __init__(self, afs: AgendaFS):
@@ -193,62 +1008,157 @@ class WeekView(QtWidgets.QWidget):
         self.lbl=QtWidgets.QLabel()
         tb.addWidget(self.bprev); tb.addWidget(self.bnext); tb.addWidget(self.bthis); tb.addSpacing(8); tb.addWidget(self.lbl); tb.addStretch(1)
 
-        grid=QtWidgets.QGridLayout(); grid.setHorizontalSpacing(10); grid.setVerticalSpacing(6)
-        self.cols=[]
-        for i in range(7):
-            head=QtWidgets.QToolButton(objectName="weekhead")
-            head.clicked.connect(lambda _=False, idx=i: self._goto(idx))
-            grid.addWidget(head,0,i)
-            box=QtWidgets.QTextBrowser(objectName="weekcol"); box.setReadOnly(True)
-            grid.addWidget(box,1,i)
-            self.cols.append((head,box))
+        self.model = WeekModel(self)
+        self.table = QtWidgets.QTableView(objectName="weekgrid")
+        self.table.setModel(self.model); self.table.setItemDelegate(WeekDelegate(self.table))
+        self.table.setShowGrid(False); self.table.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        hh = self.table.horizontalHeader(); hh.setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        hh.setSectionsClickable(True); hh.setHighlightSections(False)
+        hh.sectionClicked.connect(self._goto)
+        self.table.doubleClicked.connect(lambda ix: self._goto(ix.column()))
+
+        self.grid = TimeGrid(); self.grid.edited.connect(self._timeline_edited)
+        split = QtWidgets.QSplitter(QtCore.Qt.Vertical); split.addWidget(self.table); split.addWidget(self.grid)
+        split.setStretchFactor(0, 1); split.setStretchFactor(1, 2)
 
         v=QtWidgets.QVBoxLayout(self); v.setContentsMargins(0,0,0,0); v.setSpacing(8)
-        v.addLayout(tb); v.addLayout(grid,1)
+        v.addLayout(tb); v.addWidget(split,1)
 
         self.bprev.clicked.connect(lambda: self._shift(-7))
         self.bnext.clicked.connect(lambda: self._shift(+7))
         self.bthis.clicked.connect(lambda: self._set(QtCore.QDate.currentDate()))
         self._refresh()
 
-        self.setStyleSheet("""
-        QToolButton#weekhead[today="true"] { color:#00FFB0; font-weight:700; border:1px solid rgba(0,255,160,.45); }
-        QTextBrowser#weekcol { border:1px solid rgba(0,255,150,.22); padding:6px; }
-        """)
-
     def _set(self, anyd: QtCore.QDate):
         self.week_start = anyd.addDays(-anyd.dayOfWeek()+1); self._refresh()
     def _shift(self, days:int): self._set(self.week_start.addDays(days))
     def _goto(self, idx:int): self.go_day.emit(self.week_start.addDays(idx))
 
+    watch = {"tags", "timeline"}
+    def visible_range(self) -> tuple[date, date]:
+        ws = self.week_start; start = date(ws.year(), ws.month(), ws.day())
+        return start, start + timedelta(days=6)
+    def rebuild(self): self._refresh()
+
     def _refresh(self):
         self.lbl.setText(f"Week of {self.week_start.toString('yyyy-MM-dd')}")
-        today = QtCore.QDate.currentDate()
-        for i,(head,box) in enumerate(self.cols):
-            d = self.week_start.addDays(i)
-            head.setText(d.toString("ddd dd"))
-            head.setProperty("today", "true" if d==today else "false")
-            head.style().unpolish(head); head.style().polish(head)
-
-            # Tags kutusundan satırları çek (sadece metin, renkli)
-            py = date(d.year(), d.month(), d.day())
-            pairs = self.afs.parse_tags(py)
-            if not pairs:
-                box.setHtml("")   # gereksiz metin yok
-                continue
-            lines = []
-            for tag, text in pairs:
-                col = TAG_COLORS.get(tag, "#A0D8C8")
-                lines.append(f"<span style='color:{col}'>{QtGui.QGuiApplication.translate('', text)}</span>")
-            box.setHtml("<br>".join(lines))
+        start, end = self.visible_range()
+        tags = self.afs.range_tags(start, end)     # ay indexinden; gün dosyası açılmaz
+        days = [start + timedelta(days=i) for i in range(7)]
+        self.model.set_week(days, [tuple(tags.get(ymd(d), ())) for d in days])
+        self.afs.timeline.ensure(start, end)
+        self.grid.set_days(days, {d: self.afs.timeline.day(d) for d in days}, self.afs.timeline.conflict_keys(start, end))
+        if self.grid.clashes: self.lbl.setText(f"{self.lbl.text()}  ·  ⚠ {self.grid.clashes} overlapping")
+
+    def _timeline_edited(self, d: date, items):
+        self.afs.write_timeline(d, items); self._refresh()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Yıl görünümü (ısı haritası)
+HEAT_COLORS = ["#082820", "#0E4A38", "#137058", "#1BA07A", "#2AD8A0"]   # journal seviyesi 0..4
+
+class YearHeatmap(QtWidgets.QWidget):
+    """53 hafta × 7 gün; tek paintEvent. Dolgu = journal uzunluğu, nokta = tag sayısı."""
+    clicked = QtCore.Signal(date)
+    LEFT, TOP = 28, 18
+
+    def __init__(self):
+        super().__init__(); self.year = date.today().year; self.stats: dict[str, list[int]] = {}
+        self.setMouseTracking(True); self.setCursor(QtCore.Qt.PointingHandCursor)
+        self.setMinimumHeight(7*12 + self.TOP + 8)
+
+    def set_data(self, y: int, stats: dict[str, list[int]]):
+        self.year = y; self.stats = stats; self.update()
+
+    def _geom(self) -> tuple[date, int]:
+        start = monday_of(date(self.year, 1, 1))
+        cs = max(8, min(22, (self.width() - self.LEFT - 4) // 54, (self.height() - self.TOP - 4) // 7))
+        return start, cs
+
+    def _day_at(self, pos: QtCore.QPoint) -> date | None:
+        start, cs = self._geom()
+        col, row = (pos.x() - self.LEFT) // cs, (pos.y() - self.TOP) // cs
+        if pos.x() < self.LEFT or pos.y() < self.TOP or not (0 <= row < 7): return None
+        d = start + timedelta(days=col*7 + row)
+        return d if d.year == self.year else None
+
+    def paintEvent(self, ev: QtGui.QPaintEvent):
+        p = QtGui.QPainter(self); p.setRenderHint(QtGui.QPainter.Antialiasing, True)
+        start, cs = self._geom(); today = date.today(); gap = max(1, cs // 8)
+        fills = [QtGui.QColor(c) for c in HEAT_COLORS]; dot = QtGui.QColor("#E0C060")
+        p.setPen(QtGui.QColor(120,200,160,160))
+        for i, name in enumerate(("Mon", "Wed", "Fri")):
+            p.drawText(QtCore.QRect(0, self.TOP + (i*2)*cs, self.LEFT-4, cs), QtCore.Qt.AlignRight|QtCore.Qt.AlignVCenter, name)
+        d = date(self.year, 1, 1)
+        while d.year == self.year:
+            off = (d - start).days; x = self.LEFT + (off // 7)*cs; y = self.TOP + (off % 7)*cs
+            if d.day == 1:
+                p.setPen(QtGui.QColor(120,200,160,160))
+                p.drawText(QtCore.QPoint(x, self.TOP - 5), d.strftime("%b"))
+            n, jlen = self.stats.get(ymd(d), (0, 0))
+            r = QtCore.QRectF(x, y, cs - gap, cs - gap)
+            p.setPen(QtCore.Qt.NoPen); p.setBrush(fills[heat_level(jlen)]); p.drawRect(r)
+            if n:
+                p.setBrush(dot); p.drawEllipse(r.center(), min(cs/2 - gap, 1.5 + n), min(cs/2 - gap, 1.5 + n))
+            if d == today:
+                p.setBrush(QtCore.Qt.NoBrush); p.setPen(QtGui.QPen(QtGui.QColor(0,255,180,200), 1.5)); p.drawRect(r)
+            d += timedelta(days=1)
+
+    def mouseMoveEvent(self, e: QtGui.QMouseEvent):
+        d = self._day_at(e.position().toPoint())
+        if d is None: QtWidgets.QToolTip.hideText(); return
+        n, jlen = self.stats.get(ymd(d), (0, 0))
+        QtWidgets.QToolTip.showText(e.globalPosition().toPoint(), f"{ymd(d)} · {n} tag · {jlen} chars", self)
+
+    def mousePressEvent(self, e: QtGui.QMouseEvent):
+        if e.button() != QtCore.Qt.LeftButton: return
+        d = self._day_at(e.position().toPoint())
+        if d is not None: self.clicked.emit(d)
+
+class YearView(QtWidgets.QWidget):
+    go_day = QtCore.Signal(date)
+    def __init__(self, afs: AgendaFS):
+        super().__init__(); self.afs=afs; self.year=date.today().year
+
+        t=QtWidgets.QHBoxLayout()
+        self.bprev=QtWidgets.QToolButton(text="◄"); self.bnext=QtWidgets.QToolButton(text="►"); self.bthis=QtWidgets.QToolButton(text="This Year")
+        for b in (self.bprev,self.bnext,self.bthis): b.setObjectName("navbtn")
+        self.title=QtWidgets.QLabel("--"); f=self.title.font(); f.setBold(True); self.title.setFont(f)
+        self.info=QtWidgets.QLabel()
+        t.addWidget(self.bprev); t.addSpacing(6); t.addWidget(self.title); t.addSpacing(6); t.addWidget(self.bnext)
+        t.addSpacing(10); t.addWidget(self.bthis); t.addStretch(1); t.addWidget(self.info)
+
+        self.map = YearHeatmap(); self.map.clicked.connect(self.go_day)
+        v=QtWidgets.QVBoxLayout(self); v.setContentsMargins(0,0,0,0); v.setSpacing(8)
+        v.addLayout(t); v.addWidget(self.map,1)
+
+        self.bprev.clicked.connect(lambda: self._set(self.year-1))
+        self.bnext.clicked.connect(lambda: self._set(self.year+1))
+        self.bthis.clicked.connect(lambda: self._set(date.today().year))
+
+    def _set(self, y: int):
+        self.year = y; self.rebuild()
+
+    watch = {"tags", "journal"}
+    def visible_range(self) -> tuple[date, date]:
+        return date(self.year, 1, 1), date(self.year, 12, 31)
+
+    def rebuild(self):
+        st = self.afs.year_stats(self.year)
+        self.title.setText(str(self.year))
+        self.info.setText(f"{sum(1 for e in st.values() if e[1])} journal days · {sum(e[0] for e in st.values())} tags")
+        self.map.set_data(self.year, st)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Günlük görünümü
 class DayView(QtWidgets.QWidget):
-    changed = QtCore.Signal()
+    changed = QtCore.Signal(object, object)   # (gün, yazılan türler)
     def __init__(self, afs: AgendaFS):
-        super().__init__(); self.afs=afs; self._d=date.today()
-        self._tm = QtCore.QTimer(self); self._tm.setInterval(400); self._tm.setSingleShot(True); self._tm.timeout.connect(self._save_all)
+        super().__init__(); self.afs=afs; self.docs=afs.docs; self._d=date.today()
 
         # toolbar (Month/Week butonları KALDIRILDI)
         tb=QtWidgets.QHBoxLayout()
@@ -262,10 +1172,16 @@ class DayView(QtWidgets.QWidget):
         v=QtWidgets.QVBoxLayout(self); v.setContentsMargins(0,0,0,0); v.setSpacing(8)
         v.addLayout(tb)
 
-        # Journal (büyük)
-        v.addWidget(QtWidgets.QLabel("Journal (Daily notes)"))
+        # Journal (büyük) + saat ızgarası
+        top = QtWidgets.QHBoxLayout(); colJ = QtWidgets.QVBoxLayout(); colT = QtWidgets.QVBoxLayout()
+        top.addLayout(colJ, 3); top.addLayout(colT, 1)
+        v.addLayout(top, 3)
+        colJ.addWidget(QtWidgets.QLabel("Journal (Daily notes)"))
         self.journal = QtWidgets.QPlainTextEdit()
-        v.addWidget(self.journal, 3)
+        colJ.addWidget(self.journal, 1)
+        colT.addWidget(QtWidgets.QLabel("Timeline (double-click to add):"))
+        self.grid = TimeGrid(); self.grid.edited.connect(self._timeline_edited)
+        colT.addWidget(self.grid, 1)
 
         # alt: Plan + Tags (küçük kutular)
         row = QtWidgets.QHBoxLayout()
@@ -287,8 +1203,11 @@ class DayView(QtWidgets.QWidget):
         self.bprev.clicked.connect(lambda: self._set(self._d - timedelta(days=1)))
         self.bnext.clicked.connect(lambda: self._set(self._d + timedelta(days=1)))
         self.btoday.clicked.connect(lambda: self._set(date.today()))
-        for w in (self.journal, self.plan, self.tags):
-            w.textChanged.connect(self._tm.start)
+        # metinler ortak belge deposunda (sağ panel de aynı planı düzenler); yazım depo tarafından yapılır
+        self._panes = {"journal": self.journal, "plan": self.plan, "tags": self.tags}
+        for k, w in self._panes.items():
+            w.textChanged.connect(lambda k=k, w=w: self.docs.set(self._d, k, w.toPlainText(), self))
+        self.docs.changed.connect(self._doc_changed)
 
         self._set(self._d)
 
@@ -309,43 +1228,63 @@ class DayView(QtWidgets.QWidget):
 
     # state
     def _set(self, d: date):
-        self._d = d; self.lbl.setText(f"{ymd(d)} ({d.strftime('%a')})")
-        self.journal.blockSignals(True); self.journal.setPlainText(self.afs.read_journal(d)); self.journal.blockSignals(False)
-        self.plan.blockSignals(True); self.plan.setPlainText(self.afs.read_plan(d)); self.plan.blockSignals(False)
-        self.tags.blockSignals(True); self.tags.setPlainText(self.afs.read_tags_text(d)); self.tags.blockSignals(False)
+        self._d = d
+        texts = self.docs.day(d)
+        for k in self._panes: set_text_keep_cursor(self._panes[k], texts[k])
+        self._grid(d, parse_day(texts["timeline"]))
+        self.afs.prefetch_around(d)
 
-    def _save_all(self):
-        self.afs.write_journal(self._d, self.journal.toPlainText())
-        self.afs.write_plan(self._d, self.plan.toPlainText())
-        self.afs.write_tags_text(self._d, self.tags.toPlainText())
-        self.changed.emit()
+    def _grid(self, d: date, items: list[dict]):
+        self.grid.set_days([d], {d: items}, self.afs.timeline.conflict_keys(d, d))
+        self.lbl.setText(f"{ymd(d)} ({d.strftime('%a')})" + (f"  ·  ⚠ {self.grid.clashes} overlapping" if self.grid.clashes else ""))
+
+    def _timeline_edited(self, d: date, items):
+        self.afs.write_timeline(d, items)
+        self._grid(d, self.afs.read_timeline(d))
+        self.changed.emit(d, {"timeline"})
+
+    def _doc_changed(self, d: date, kind: str, source):
+        """Başka bir editörden / dışarıdan gelen değişiklik: açık gündeyse kutuyu güncelle."""
+        if source is self or d != self._d: return
+        if kind in self._panes: set_text_keep_cursor(self._panes[kind], self.docs.text(d, kind))
+        elif kind == "timeline": self._grid(d, self.afs.read_timeline(d))
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Ana Ajanda
 class AgendaPage(QtWidgets.QWidget):
-    def __init__(self, fs, parent=None):
+    def __init__(self, fs, parent=None, afs=None):
         super().__init__(parent)
-        self.afs = AgendaFS(fs)
+        self.afs = afs or AgendaFS(fs)     # ana pencere ortak AgendaFS'i verir (sağ panel / hatırlatıcılar)
 
         bar=QtWidgets.QHBoxLayout()
-        self.bMonth=QtWidgets.QToolButton(text="Month"); self.bWeek=QtWidgets.QToolButton(text="Week"); self.bDay=QtWidgets.QToolButton(text="Day")
-        for b in (self.bMonth,self.bWeek,self.bDay): b.setObjectName("navbtn")
-        bar.addWidget(self.bMonth); bar.addWidget(self.bWeek); bar.addWidget(self.bDay); bar.addStretch(1)
+        self.bYear=QtWidgets.QToolButton(text="Year"); self.bMonth=QtWidgets.QToolButton(text="Month"); self.bWeek=QtWidgets.QToolButton(text="Week"); self.bDay=QtWidgets.QToolButton(text="Day")
+        for b in (self.bYear,self.bMonth,self.bWeek,self.bDay): b.setObjectName("navbtn")
+        bar.addWidget(self.bYear); bar.addWidget(self.bMonth); bar.addWidget(self.bWeek); bar.addWidget(self.bDay); bar.addStretch(1)
 
         self.stack = QtWidgets.QStackedWidget()
-        self.vMonth = MonthView(self.afs); self.vWeek = WeekView(self.afs); self.vDay = DayView(self.afs)
-        self.stack.addWidget(self.vMonth); self.stack.addWidget(self.vWeek); self.stack.addWidget(self.vDay)
+        self.vYear = YearView(self.afs); self.vMonth = MonthView(self.afs); self.vWeek = WeekView(self.afs); self.vDay = DayView(self.afs)
+        self.stack.addWidget(self.vYear); self.stack.addWidget(self.vMonth); self.stack.addWidget(self.vWeek); self.stack.addWidget(self.vDay)
 
         lay=QtWidgets.QVBoxLayout(self); lay.setContentsMargins(8,8,8,8); lay.setSpacing(8)
         lay.addLayout(bar); lay.addWidget(self.stack,1)
 
+        self.bYear.clicked.connect(lambda: self.stack.setCurrentWidget(self.vYear))
         self.bMonth.clicked.connect(lambda: self.stack.setCurrentWidget(self.vMonth))
         self.bWeek.clicked.connect(lambda: self.stack.setCurrentWidget(self.vWeek))
         self.bDay.clicked.connect(lambda: self.stack.setCurrentWidget(self.vDay))
 
+        self.vYear.go_day.connect(self._goto_day)
         self.vMonth.go_day.connect(self._goto_day)
         self.vWeek.go_day.connect(self._goto_day)
-        self.vDay.changed.connect(self._refresh_overviews)
+        # genel görünümler tembel yenilenir: değişen günler biriktirilir, görünüm gösterilince
+        # ve sadece değişen gün görünür aralığına düşüyorsa yeniden çizilir
+        self._overviews = (self.vYear, self.vMonth, self.vWeek)
+        self._stale: dict[QtWidgets.QWidget, set[date]] = {v: set() for v in self._overviews}
+        self._stale[self.vYear].add(date.today())   # yıl özeti (gerekirse ilk tarama) ilk gösterimde
+        self.vDay.changed.connect(self._day_changed)
+        self.afs.docs.saved.connect(self._day_changed)
+        self.afs.cache.refreshed.connect(self._day_refreshed)
+        self.stack.currentChanged.connect(lambda i: self._flush_view(self.stack.widget(i)))
 
         # Açılışta Day
         self.stack.setCurrentWidget(self.vDay)
@@ -354,5 +1293,18 @@ class AgendaPage(QtWidgets.QWidget):
         d = date(qd.year(), qd.month(), qd.day()) if isinstance(qd, QtCore.QDate) else qd
         self.vDay._set(d); self.stack.setCurrentWidget(self.vDay)
 
-    def _refresh_overviews(self):
-        self.vMonth.rebuild(); self.vWeek._refresh()
+    def _day_changed(self, d: date, kinds):
+        for v in self._overviews:
+            if v.watch & set(kinds): self._stale[v].add(d)
+        self._flush_view(self.stack.currentWidget())
+
+    def _flush_view(self, v):
+        days = self._stale.get(v)
+        if not days: return
+        lo, hi = v.visible_range()
+        hit = any(lo <= d <= hi for d in days); days.clear()
+        if hit: v.rebuild()
+
+    def _day_refreshed(self, d: date):
+        """Gün dışarıdan değişti (önbellek doğrulaması)."""
+        self._day_changed(d, agenda_store.KINDS)
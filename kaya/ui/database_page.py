@@ -2,6 +2,7 @@
 from PySide6 import QtWidgets, QtCore, QtGui
 from pathlib import Path
 from .db_service import DBService
+from ..services import persist
 from .person_card import PersonCard
 
 # --- Modül tipleri (ana hub) ---
@@ -270,3 +271,10 @@ class DatabasePage(QtWidgets.QWidget):
         if self.current_type == "people":
             self.db.delete_person(rec_id)
             self._reload()
+
+    # --------- Vault değişimi ---------
+    def teardown(self):
+        """Bekleyen kişi kaydını yaz, veritabanı bağlantısını kapat."""
+        self.person_card.save(force=False)
+        persist.writer().drain()
+        self.db.close()
@@ -3,6 +3,9 @@ from pathlib import Path
 import shutil
 import time
 
+from ..services import persist
+from ..services.asset_store import store_for
+
 # ---- Basit editör: sağ tıkta "Resim Ekle…" + drag&drop görüntü kopyalama ----
 class ImagePlain(QtWidgets.QPlainTextEdit):
     def __init__(self, insert_image_cb, parent=None):
@@ -100,10 +103,8 @@ class FilesPage(QtWidgets.QWidget):
         self.ed.textChanged.connect(self._deb)
 
         self._p = None
-        self._tm = QtCore.QTimer(self)
-        self._tm.setInterval(600)
-        self._tm.setSingleShot(True)
-        self._tm.timeout.connect(self._save)
+        self._wb = persist.writer()
+        self._wb.failed.connect(self._save_failed)
 
         # Ağaç: sağ tık menüsü (boş alan + öğe)
         self.tree.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
@@ -118,10 +119,8 @@ class FilesPage(QtWidgets.QWidget):
         self.tree.clicked.connect(self.toggle_dir)
 
     # ---------- Yardımcılar ----------
-    def _assets_dir(self) -> Path:
-        d = self.root / "assets"
-        d.mkdir(exist_ok=True)
-        return d
+    def _assets(self):
+        return store_for(self.root.parent)      # vault geneli içerik adresli depo (<workspace>/assets)
 
     def _slug(self, s: str) -> str:
         bad = '<>:"/\\|?*'
@@ -213,15 +212,11 @@ class FilesPage(QtWidgets.QWidget):
     # ---------- Editor: resim ekleme ----------
     def _insert_image_into_note(self, src: Path):
         try:
-            assets = self._assets_dir()
-            dst = assets / src.name
-            i = 1
-            while dst.exists():
-                dst = assets / f"{src.stem}_{i}{src.suffix}"
-                i += 1
-            dst.write_bytes(src.read_bytes())
+            assets = self._assets()
+            blob = assets.put(src)
+            rel = assets.ref(blob, self._p or self.root / "_")
             cur = self.ed.textCursor()
-            cur.insertText(f"![{dst.stem}](assets/{dst.name})\n")
+            cur.insertText(f"![{src.stem}]({rel})\n")
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Hata", f"Resim eklenemedi:\n{e}")
 
@@ -233,11 +228,12 @@ class FilesPage(QtWidgets.QWidget):
         except Exception:
             rel = p
         self.bc.setText(str(rel))
+        self._save()
         self._p = None
         self.ed.blockSignals(True)
         try:
             if p.is_file() and p.suffix.lower() in ('.md', '.txt'):
-                self.ed.setPlainText(p.read_text(encoding='utf-8'))
+                self.ed.setPlainText(self._wb.read_text(p))
                 self._p = p
             else:
                 self.ed.setPlainText('')
@@ -247,12 +243,16 @@ class FilesPage(QtWidgets.QWidget):
 
     def _deb(self):
         if self._p:
-            self._tm.start()
+            self._wb.write_later(self._p, self.ed.toPlainText, 600)
 
     def _save(self):
-        if not self._p:
-            return
+        # bekleyen debounce'u hemen kuyruğa al (yazım arka planda)
+        if self._p:
+            self._wb.fire(self._p)
+
+    def _save_failed(self, key: str, msg: str):
         try:
-            self._p.write_text(self.ed.toPlainText(), encoding='utf-8')
-        except Exception as e:
-            QtWidgets.QMessageBox.warning(self, 'Save Error', str(e))
+            Path(key).relative_to(self.root)
+        except ValueError:
+            return
+        QtWidgets.QMessageBox.warning(self, 'Save Error', f"{key}\n{msg}")
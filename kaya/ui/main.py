@@ -1,19 +1,66 @@
 # kaya/ui/main.py
-from PySide6 import QtWidgets, QtGui
-from ..core.config import APP_NAME, FILES, PROJECTS, AGENDA, MEDIA
-from ..services.fs_items import FSPaths, FSService
+import builtins, importlib.util, shutil, sys, time
+from contextlib import contextmanager
+from pathlib import Path
+_T0 = time.perf_counter()
+
+# ---------------- Import ölçümü (--bench-startup) ----------------
+# -X importtime benzeri: her yeni modül için öz süre (alt importlar hariç) ve toplam süre.
+# Bench modunda aşağıdaki importlardan önce kurulur → ana modülün kendi importları da ölçülür.
+_IMPORTS = None     # [(modül, öz s, toplam s, aşama)]
+_PHASE = "startup"  # ilk pencereden sonra "deferred"
+
+def _trace_imports():
+    global _IMPORTS
+    if _IMPORTS is not None: return
+    _IMPORTS = []
+    real, stack = builtins.__import__, []
+    def hook(name, globals=None, locals=None, fromlist=(), level=0):
+        try: full = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__")) if level else name
+        except (ImportError, ValueError): full = name
+        if full in sys.modules:      # "from . import x": yeni olan alt modül
+            full = next((f"{full}.{x}" for x in fromlist or () if f"{full}.{x}" not in sys.modules), None)
+        if full is None: return real(name, globals, locals, fromlist, level)
+        stack.append(0.0); t = time.perf_counter()
+        try: return real(name, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - t; child = stack.pop()
+            if stack: stack[-1] += total
+            _IMPORTS.append((full, total - child, total, _PHASE))
+    builtins.__import__ = hook
+
+if "--bench-startup" in sys.argv: _trace_imports()
+
+from PySide6 import QtWidgets, QtGui, QtCore
+from ..core.config import APP_NAME
+from ..core import vaults
+from ..services.fs_items import FSService
 from ..terminal.commands import register_default_commands
 
-from .files_page import FilesPage
-from .agenda_page import AgendaPage
-from .projects_page import ProjectsPage
-from .right_panel import RightPanel
+# Açılışta sadece konsol sayfası yüklenir; diğer sayfalar (files/agenda/projects/database),
+# sağ panel, hatırlatıcılar ve vault izleyicisi ilk ihtiyaçta import edilip kurulur.
 from .terminal_page import TerminalPage
-from .commands_palette import CommandPalette
-from .database_page import DatabasePage
+from .commands_palette import CommandPalette, show_toast
 
 # Tema servisi (retro QSS + accent switch)
 from ..services.theme_service import ThemeService
+from ..services import persist
+
+_IMPORT_S = time.perf_counter() - _T0
+
+# ---------------- Açılış ölçümü (--bench-startup) ----------------
+_BENCH = None       # [(etiket, saniye)] — sadece bench modunda dolu
+
+@contextmanager
+def _timed(label: str):
+    if _BENCH is None:
+        yield; return
+    t = time.perf_counter()
+    try: yield
+    finally: _BENCH.append((label, time.perf_counter() - t))
+
+# Tembel sayfalar: anahtar → sınıf adı (nav sırası)
+_PAGES = {"files": "FilesPage", "agenda": "AgendaPage", "projects": "ProjectsPage", "db": "DatabasePage"}
 
 
 class Kaya(QtWidgets.QMainWindow):
@@ -22,11 +69,16 @@ class Kaya(QtWidgets.QMainWindow):
         self.setWindowTitle(APP_NAME)
         self.resize(1360, 860)
 
-        paths = FSPaths(FILES, PROJECTS, AGENDA, MEDIA)
-        self.fs = FSService(paths)
+        # Vault: sadece açılan vault bağlanır (klasörleri o an açılır); fs.p vault değişiminde güncellenir
+        self.vault = vaults.get(vaults.current_name())
+        self.fs = FSService(self.vault.mount())
+
+        # Arka plan yazıcısı (UI thread'inde kurulur; kapanışta kuyruğu boşaltır)
+        self.writer = persist.writer()
+        self.writer.failed.connect(self._save_failed)
 
         cw = QtWidgets.QWidget(); self.setCentralWidget(cw)
-        root = QtWidgets.QHBoxLayout(cw); root.setContentsMargins(8,8,8,8); root.setSpacing(8)
+        self._root = root = QtWidgets.QHBoxLayout(cw); root.setContentsMargins(8,8,8,8); root.setSpacing(8)
 
         # ---------------- Left Nav ----------------
         left = QtWidgets.QFrame(); left.setMaximumWidth(100); left.setMinimumWidth(88)
@@ -52,29 +104,28 @@ class Kaya(QtWidgets.QMainWindow):
         # ---------------- Center Stack ----------------
         self.stack = QtWidgets.QStackedWidget()
 
-        self.p_cons = TerminalPage(self._bus())
-        self.p_files = FilesPage(FILES)
-        self.p_ag = AgendaPage(self.fs)
-        self.p_proj = ProjectsPage(PROJECTS, self.fs)
-        self.p_db = DatabasePage(self.fs)
-
-        for p in (self.p_cons, self.p_files, self.p_ag, self.p_proj, self.p_db):
-            self.stack.addWidget(p)
+        with _timed("build TerminalPage"):
+            self.p_cons = TerminalPage(self._bus())
+        self.stack.addWidget(self.p_cons)
 
-        # ---------------- Right Panel ----------------
-        self.right = RightPanel(self.fs)
-        self.right.setMinimumWidth(280); self.right.setMaximumWidth(340)
+        # Sağ panel yeri (panel ilk boyamadan sonra kurulur; genişlik sabit → yerleşim zıplamaz)
+        self._side = QtWidgets.QStackedWidget()
+        self._side.setMinimumWidth(280); self._side.setMaximumWidth(340)
 
         root.addWidget(left)
         root.addWidget(self.stack, 1)
-        root.addWidget(self.right)
+        root.addWidget(self._side)
+
+        # ---------------- Vault sayfaları + Right Panel ----------------
+        self.watcher = None
+        self._mount_pages()
 
         # ---------------- Nav Logic ----------------
         b_cons.clicked.connect(lambda: self.stack.setCurrentWidget(self.p_cons))
-        b_files.clicked.connect(lambda: self.stack.setCurrentWidget(self.p_files))
-        b_ag.clicked.connect(lambda: self.stack.setCurrentWidget(self.p_ag))
-        b_proj.clicked.connect(lambda: self.stack.setCurrentWidget(self.p_proj))
-        b_db.clicked.connect(lambda: self.stack.setCurrentWidget(self.p_db))
+        b_files.clicked.connect(lambda: self.show_page("files"))
+        b_ag.clicked.connect(lambda: self.show_page("agenda"))
+        b_proj.clicked.connect(lambda: self.show_page("projects"))
+        b_db.clicked.connect(lambda: self.show_page("db"))
 
         b_cons.setChecked(True)
         self.stack.setCurrentWidget(self.p_cons)
@@ -87,10 +138,10 @@ class Kaya(QtWidgets.QMainWindow):
         def open_palette():
             acts = [
                 ('Go: Console',  lambda: self.stack.setCurrentWidget(self.p_cons)),
-                ('Go: Files',    lambda: self.stack.setCurrentWidget(self.p_files)),
-                ('Go: Agenda',   lambda: self.stack.setCurrentWidget(self.p_ag)),
-                ('Go: Projects', lambda: self.stack.setCurrentWidget(self.p_proj)),
-                ('Go: Database', lambda: self.stack.setCurrentWidget(self.p_db)),
+                ('Go: Files',    lambda: self.show_page("files")),
+                ('Go: Agenda',   lambda: self.show_page("agenda")),
+                ('Go: Projects', lambda: self.show_page("projects")),
+                ('Go: Database', lambda: self.show_page("db")),
             ]
             CommandPalette(self, acts).exec()
 
@@ -98,8 +149,153 @@ class Kaya(QtWidgets.QMainWindow):
         QtGui.QShortcut(QtGui.QKeySequence('Ctrl+K'), self, open_palette)
 
         # ---------------- Tema servisi (açılışta uygula) ----------------
-        self._theme_service = ThemeService(self)          # ← ana pencereyi ver
-        self._theme_service.apply_saved_or_default()      # ← kayıtlı yoksa 'green'
+        with _timed("ThemeService"):
+            self._theme_service = ThemeService(self)          # ← ana pencereyi ver
+            self._theme_service.apply_saved_or_default()      # ← kayıtlı yoksa 'green'
+
+    # ---------------- Sayfalar (ilk gösterimde kurulur) ----------------
+    def page(self, key: str):
+        """Sayfayı döndür; ilk çağrıda modülünü import edip kurar."""
+        w = self._pages.get(key)
+        if w is None:
+            w = self._pages[key] = self._make_page(key)
+            self.stack.addWidget(w)
+        return w
+
+    def show_page(self, key: str):
+        self.stack.setCurrentWidget(self.page(key))
+
+    def _make_page(self, key: str):
+        p, name = self.fs.p, _PAGES[key]
+        with _timed(f"import {name}"):
+            if key == "files":    from .files_page import FilesPage as C
+            elif key == "agenda": from .agenda_page import AgendaPage as C
+            elif key == "projects": from .projects_page import ProjectsPage as C
+            else:                 from .database_page import DatabasePage as C
+        with _timed(f"build {name}"):
+            if key == "files":    return C(p.files_dir)
+            if key == "agenda":   return C(self.fs, afs=self.afs)
+            if key == "projects": return C(p.projects_dir, self.fs)
+            return C(self.fs)
+
+    p_files = property(lambda self: self.page("files"))
+    p_ag    = property(lambda self: self.page("agenda"))
+    p_proj  = property(lambda self: self.page("projects"))
+    p_db    = property(lambda self: self.page("db"))
+
+    @property
+    def afs(self):
+        """Vault'un ortak AgendaFS'i (ajanda sayfası, sağ panel, hatırlatıcılar, terminal)."""
+        if self._afs is None:
+            with _timed("import AgendaFS"):
+                from .agenda_page import AgendaFS
+            with _timed("build AgendaFS"):
+                self._afs = AgendaFS(self.fs)
+                self._afs.set_watched(self.watcher is not None)
+        return self._afs
+
+    @property
+    def search(self):
+        """Vault'un tam metin arama indexi (files, projects, agenda); izleyici olaylarıyla güncellenir."""
+        if self._search is None:
+            from ..services.search_index import SearchIndex
+            p = self.fs.p
+            self._search = SearchIndex(p.files_dir, p.projects_dir)
+            self._search.watched = self.watcher is not None
+            self.afs.attach_search(self._search)
+        return self._search
+
+    # ---------------- Vault bağlama / değiştirme ----------------
+    def _mount_pages(self):
+        """Vault'a bağlanır; sayfalar ilk gösterimde, sağ panel ilk boyamadan sonra kurulur."""
+        self._pages = {}; self._afs = self._search = None
+        self.right = self.reminders = None
+        self.setWindowTitle(f"{APP_NAME} — {self.vault.name}")
+        if self.isVisible(): QtCore.QTimer.singleShot(0, self._mount_side)
+        # Vault izleyicisi (ilk tarama pencere açıldıktan sonra)
+        QtCore.QTimer.singleShot(500, self._start_watcher)
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        QtCore.QTimer.singleShot(50, self._mount_side)     # ilk boyamadan sonra
+
+    def _mount_side(self):
+        if self.right is not None: return
+        with _timed("import RightPanel"):
+            from .right_panel import RightPanel
+            from ..services.reminders import ReminderScheduler
+        afs = self.afs
+        with _timed("build RightPanel"):
+            self.right = RightPanel(self.fs, afs)
+        self.reminders = ReminderScheduler(afs, self)   # exam/birthday/event hatırlatıcıları
+        self._side.addWidget(self.right)
+
+    def _unmount_pages(self):
+        """Bekleyen yazımlar diske iner; izleyici, hatırlatıcılar, indexler ve DB bağlantısı kapanır."""
+        self.writer.flush()
+        if self.watcher is not None:
+            self.watcher.close(); self.watcher.deleteLater(); self.watcher = None
+        if self.reminders is not None: self.reminders.stop(); self.reminders.deleteLater()
+        if self._afs is not None: self._afs.close()
+        if self._search is not None: self._search.close()
+        if "db" in self._pages: self._pages["db"].teardown()
+        if "kaya.services.asset_store" in sys.modules:
+            sys.modules["kaya.services.asset_store"].close_store(self.vault.workspace)
+        for w in self._pages.values():
+            self.stack.removeWidget(w); w.deleteLater()
+        if self.right is not None: self._side.removeWidget(self.right); self.right.deleteLater()
+
+    def open_vault(self, name: str, create: bool = False) -> str:
+        """Vault'a geç (create=True → yoksa oluştur). Sonuç mesajı döndürür."""
+        v = vaults.get(name)
+        if v == self.vault: return f"Already in vault: {name}"
+        if not v.exists() and not create: return f"No such vault: {name} (use: vault new {name})"
+        page = next((k for k, w in self._pages.items() if self.stack.currentWidget() is w), None)
+        self._unmount_pages()
+        self.vault = v
+        self.fs.p = v.mount()
+        vaults.set_current(v.name)
+        self._mount_pages()
+        if page: self.show_page(page)
+        return f"Opened vault: {v.name}"
+
+    def restore_workspace(self, staged: str):
+        """Hazırlanmış görüntü klasörünü açık vault'un workspace'i yap (vault kapatılıp yeniden bağlanır)."""
+        from ..services import snapshots
+        staged = Path(staged)
+        if staged.parent != self.vault.root:          # hazırlık sürerken vault değişti
+            shutil.rmtree(staged, ignore_errors=True); return
+        page = next((k for k, w in self._pages.items() if self.stack.currentWidget() is w), None)
+        self._unmount_pages()
+        try: snapshots.swap(self.vault.workspace, staged)
+        except OSError as ex: show_toast(self, f"Restore failed: {ex}")
+        self.fs.p = self.vault.mount()
+        self._mount_pages()
+        if page: self.show_page(page)
+
+    def _start_watcher(self):
+        if self.watcher is not None: return
+        from ..services.vault_watcher import VaultWatcher
+        from ..services.asset_store import store_for
+        w = self.vault.workspace
+        self.watcher = VaultWatcher(w, ignore=[w / "database", w / "assets"], parent=self)
+        self.watcher.changed.connect(self._on_vault_events)
+        if self._afs is not None: self._afs.set_watched(True)
+        self.watcher.changed.connect(store_for(w).apply)
+        idx = self.search                   # ilk tam doğrulama arka planda; sonrası olaylarla
+        idx.watched = True
+        self.watcher.changed.connect(idx.apply)
+        idx.start_build()
+
+    def _on_vault_events(self, events):
+        # sadece kurulmuş olanlara ilet (kurulmamış sayfa açılırken diski zaten okur)
+        if self._afs is not None: self._afs.on_vault_events(events)
+        if "projects" in self._pages: self._pages["projects"].on_vault_events(events)
+
+    def _save_failed(self, key: str, msg: str):
+        # not/proje editörleri kendi uyarısını gösterir; ajanda, kişi kayıtları vb. için bildirim
+        if any(key.startswith(str(d)) for d in (self.fs.p.files_dir, self.fs.p.projects_dir)): return
+        show_toast(self, f"Kaydedilemedi: {key} — {msg}")
 
     # ---------------------------------------------------------------------------
 
@@ -148,8 +344,43 @@ class Kaya(QtWidgets.QMainWindow):
 
 
 # ---------------------------------------------------------------------------
-def run():
-    app = QtWidgets.QApplication([])
-    w = Kaya()
-    w.show()
+def run(argv=None):
+    """Uygulamayı başlat. `--bench-startup`: açılış adımlarının sürelerini yazdırıp çık."""
+    global _BENCH
+    argv = sys.argv[1:] if argv is None else list(argv)
+    bench = "--bench-startup" in argv
+    if bench: _BENCH = [("import kaya.ui.main", _IMPORT_S)]; _trace_imports()
+    t0 = time.perf_counter()
+    with _timed("QApplication"):
+        app = QtWidgets.QApplication(sys.argv[:1])
+    with _timed("build Kaya"):
+        w = Kaya()
+    with _timed("show + first paint"):
+        w.show(); app.processEvents()
+    if bench:
+        first = time.perf_counter() - t0 + _IMPORT_S
+        QtCore.QTimer.singleShot(0, lambda: _bench_report(app, w, first))
     app.exec()
+
+def _bench_report(app, w, first: float):
+    """Ertelenen adımları (sağ panel, sayfalar) da kurup ölç; adım ve import tablolarını yazdır, çık."""
+    global _PHASE
+    _PHASE = "deferred"
+    n = len(_BENCH)
+    w._mount_side()
+    for key in _PAGES: w.page(key)
+    app.processEvents()
+    rows = _BENCH[:n] + [("-- deferred --", None)] + _BENCH[n:]
+    print(f"{'step':<28}{'ms':>10}")
+    for label, s in rows:
+        print(f"{label:<28}{'':>10}" if s is None else f"{label:<28}{s * 1000:>10.1f}")
+    print(f"{'first window (total)':<28}{first * 1000:>10.1f}")
+    # en pahalı 25 import (toplam süreye göre); kaya modüllerinin hepsi ayrıca görünür
+    rows = sorted(_IMPORTS, key=lambda r: -r[2])
+    rows = rows[:25] + [r for r in rows[25:] if r[0].startswith("kaya.") and r[2] >= 0.001]
+    print(f"\n{'import':<44}{'self ms':>10}{'total ms':>10}  phase")
+    for mod, own, total, phase in rows:
+        print(f"{mod:<44}{own * 1000:>10.1f}{total * 1000:>10.1f}  {phase}")
+    print(f"{'modules imported':<44}{len(_IMPORTS):>10}   startup {sum(r[3] == 'startup' for r in _IMPORTS)}")
+    w.writer.flush()
+    app.quit()
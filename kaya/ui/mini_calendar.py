@@ -8,9 +8,13 @@ class MiniCalendar(QtWidgets.QCalendarWidget):
       - Sadece oklarla gezinme (tekerlek devre dışı)
       - Ay dışı günler silik
       - Satır yüksekliği: bulunduğun aya göre 5 ya da 6 hafta görünümü için otomatik ayarlanır
+      - Tag noktaları: set_markers(fn) → fn(yıl, ay) = {"YYYY-MM-DD": [renk, ...]}; sayfa başına bir kez sorulur
     """
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._markers = None
+        self._marks: dict[str, list[QtGui.QColor]] = {}
+        self._marks_page = None
 
         # Görünüm
         self.setGridVisible(False)
@@ -28,6 +32,7 @@ class MiniCalendar(QtWidgets.QCalendarWidget):
 
         # Ay değişince yükseklik ve boyamayı güncelle
         self.currentPageChanged.connect(lambda y, m: self._fit_height(y, m))
+        self.currentPageChanged.connect(lambda y, m: self.refresh_markers())
 
         # İlk yükseklik ayarı
         d = self.selectedDate()
@@ -48,6 +53,35 @@ class MiniCalendar(QtWidgets.QCalendarWidget):
             painter.setPen(QtCore.Qt.NoPen)
             painter.drawRect(rect)
             painter.restore()
+        cols = self._page_marks().get(date.toString("yyyy-MM-dd"))
+        if cols:
+            painter.save()
+            painter.setRenderHint(QtGui.QPainter.Antialiasing); painter.setPen(QtCore.Qt.NoPen)
+            r = 2; step = 2*r + 2
+            x = rect.center().x() - (len(cols) * step - 2) / 2 + r; y = rect.bottom() - r - 2
+            for c in cols:
+                painter.setBrush(c); painter.drawEllipse(QtCore.QPointF(x, y), r, r); x += step
+            painter.restore()
+
+    # ---- Tag noktaları ----
+    def set_markers(self, fn):
+        self._markers = fn; self.refresh_markers()
+
+    def refresh_markers(self):
+        """Tag verisi değişti: sayfanın işaretlerini bir sonraki çizimde yeniden sor."""
+        self._marks_page = None; self.updateCells()
+
+    def _page_marks(self) -> dict:
+        page = (self.yearShown(), self.monthShown())
+        if self._markers is None or self._marks_page == page: return self._marks
+        y, m = page; marks = {}
+        for yy, mm in ((y - (m == 1), 12 if m == 1 else m - 1), (y, m), (y + (m == 12), 1 if m == 12 else m + 1)):
+            try: src = self._markers(yy, mm)
+            except Exception: src = {}
+            for day, colors in src.items():
+                marks[day] = [QtGui.QColor(c) for c in list(dict.fromkeys(colors))[:4]]
+        self._marks, self._marks_page = marks, page
+        return marks
 
     # ---- Özel yardımcılar ----
     def _style_nav(self):
@@ -1,7 +1,9 @@
 # kaya/ui/person_card.py
-from PySide6 import QtWidgets, QtCore, QtGui
+from PySide6 import QtWidgets
 import json
 
+from ..services import persist
+
 class PersonCard(QtWidgets.QFrame):
     def __init__(self, db, parent=None):
         super().__init__(parent)
@@ -43,20 +45,34 @@ class PersonCard(QtWidgets.QFrame):
         self.notes.setMinimumHeight(120)
         v.addWidget(self.notes, 1)
 
-        # debounce timer
-        self._tm = QtCore.QTimer(self)
-        self._tm.setInterval(600); self._tm.setSingleShot(True)
-        self._tm.timeout.connect(self._save)
+        # debounce + veritabanı yazımı arka plandaki yazıcıda
+        self._wb = persist.writer()
+        self._loading = False
 
         for w in (self.e_name, self.e_dob, self.e_country, self.e_city, self.e_edu, self.e_family):
-            w.textChanged.connect(lambda: self._tm.start())
-        self.notes.textChanged.connect(lambda: self._tm.start())
+            w.textChanged.connect(self._changed)
+        self.notes.textChanged.connect(self._changed)
 
     # public
     def load_person(self, pid: int):
+        self.save(force=False)                              # önceki kişinin bekleyen kaydı
+        if self._wb.is_pending(("person", pid)): self._wb.flush(2.0)   # aynı kişi: kuyruktaki hali oku
         self.pid = pid
         r = self.db.get_person(pid)
         if not r: return
+        self._loading = True
+        try: self._fill(r)
+        finally: self._loading = False
+
+    def save(self, force: bool = True):
+        """Bekleyen kaydı hemen kuyruğa al; force → bekleyen yoksa da yaz."""
+        if not self.pid: return
+        key = ("person", self.pid)
+        if self._wb.is_pending(key): self._wb.fire(key)
+        elif force: self._wb.submit(key, self._job())
+
+    # private
+    def _fill(self, r: dict):
         self.e_name.setText(r.get('name',''))
         self.e_dob.setText(r.get('dob',''))
         self.e_country.setText(r.get('country',''))
@@ -73,9 +89,17 @@ class PersonCard(QtWidgets.QFrame):
         except Exception:
             self.notes.setPlainText('')
 
-    # private
-    def _save(self):
-        if not self.pid: return
+    def _changed(self):
+        if self.pid and not self._loading:
+            self._wb.submit_later(("person", self.pid), self._job, 600)
+
+    def hideEvent(self, e):
+        self.save(force=False)                              # diyalog kapanıyor / sayfa değişiyor
+        super().hideEvent(e)
+
+    def _job(self):
+        """UI thread'inde alanları oku → yazıcı thread'inde çalışacak güncelleme."""
+        pid = self.pid
         data = {
             'name': self.e_name.text().strip(),
             'dob': self.e_dob.text().strip(),
@@ -85,4 +109,4 @@ class PersonCard(QtWidgets.QFrame):
             'family': [x.strip() for x in self.e_family.text().split(',') if x.strip()],
             'meta': {'notes': self.notes.toPlainText()},
         }
-        self.db.update_person(self.pid, data)
+        return lambda: self.db.update_person(pid, data)
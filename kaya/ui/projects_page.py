@@ -3,6 +3,9 @@ from PySide6 import QtWidgets, QtCore, QtGui
 from pathlib import Path
 import json, shutil, datetime, os, re, uuid
 
+from ..services import persist
+from ..services.asset_store import store_for
+
 # ----------------- Genel sabitler -----------------
 META_DIR  = ".kaya"
 META_FILE = "project.json"
@@ -72,11 +75,10 @@ class ProjectProxyFilter(QtCore.QSortFilterProxyModel):
 # ----------------- küçük yardımcılar -----------------
 def now_iso(): return datetime.datetime.now().isoformat(timespec="seconds")
 def read_json(p: Path, default: dict):
-    try: return json.loads(p.read_text(encoding="utf-8"))
+    try: return json.loads(persist.writer().read_text(p))      # kuyruktaki (henüz yazılmamış) hali dahil
     except Exception: return dict(default)
 def write_json(p: Path, data: dict):
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    persist.atomic_write_text(p, json.dumps(data, ensure_ascii=False, indent=2))
 def ensure_unique_path(p: Path) -> Path:
     if not p.exists(): return p
     stem, suf = p.stem, p.suffix
@@ -513,8 +515,8 @@ class ProjectDetail(QtWidgets.QWidget):
         self.editor_workspace.addWidget(self.editor)
         self.editor_workspace.addWidget(self.preview)
         self.editor_workspace.setSizes([520, 240])
-        self._tm = QtCore.QTimer(self); self._tm.setInterval(600); self._tm.setSingleShot(True)
-        self._tm.timeout.connect(self._save)
+        self._wb = persist.writer()
+        self._wb.failed.connect(self._save_failed)
         self.editor.textChanged.connect(self._on_editor_changed)
         self.stack.addWidget(self.editor_workspace)
 
@@ -572,7 +574,7 @@ class ProjectDetail(QtWidgets.QWidget):
 
         self.btn_attach.clicked.connect(self._action_attach_file)
         self.btn_insert_img.clicked.connect(self._action_insert_image)
-        self.btn_save.clicked.connect(self._save)
+        self.btn_save.clicked.connect(self.save)
         self.btn_gallery_import.clicked.connect(lambda: self._action_import_image(self.gallery_dir))
         self.btn_gallery_prev.clicked.connect(self._gallery_prev)
         self.btn_gallery_next.clicked.connect(self._gallery_next)
@@ -600,6 +602,29 @@ class ProjectDetail(QtWidgets.QWidget):
         root_src = self.fs_model.index(str(self.proj_dir))
         self.tree.setRootIndex(self.proxy.mapFromSource(root_src))
 
+    def on_vault_events(self, events):
+        """Vault izleyicisi: dışarıdan değişen açık not (bekleyen kayıt yoksa) ve galeri güncellenir."""
+        mine = [e for e in events if e.under(self.proj_dir)]
+        if not mine: return
+        for e in mine:
+            if e.kind == "moved" and e.src == self._note_path:          # not dışarıda yeniden adlandırıldı
+                self._note_path = e.path; self.file_lbl.setText(str(e.path.relative_to(self.proj_dir)))
+            elif e.kind in ("modified", "created", "moved") and e.path == self._note_path and not self._wb.is_pending(e.path):
+                try: txt = e.path.read_text(encoding="utf-8")
+                except Exception: continue
+                if txt == self.editor.toPlainText(): continue
+                pos = self.editor.textCursor().position()
+                self._loading_note = True
+                try: self.editor.setPlainText(txt); self._update_preview()
+                finally: self._loading_note = False
+                c = self.editor.textCursor(); c.setPosition(min(pos, len(txt))); self.editor.setTextCursor(c)
+        if any(e.under(self.gallery_dir) for e in mine):
+            ok = 0 <= self._gallery_index < len(self._gallery_files)
+            self._refresh_gallery(self._gallery_files[self._gallery_index] if ok else None, show=False)
+
+    def _assets(self):
+        return store_for(self.proj_dir.parent.parent)      # <workspace>/assets
+
     def _resolve_inside_project(self, target: Path) -> Path | None:
         return safe_child_path(self.proj_dir, target)
 
@@ -639,11 +664,12 @@ class ProjectDetail(QtWidgets.QWidget):
         if self._loading_note:
             return
         self._update_preview()
-        self._tm.start()
+        self._wb.write_later(self._note_path, self._note_text, 600)
 
     def _update_preview(self):
         text = self.editor.toPlainText()
         if self._note_path.suffix.lower() == ".md":
+            self.preview.setSearchPaths([str(self._note_path.parent)])   # göreli görsel yolları (../../assets/…)
             self.preview.setMarkdown(text)
         else:
             self.preview.setPlainText(text)
@@ -653,12 +679,13 @@ class ProjectDetail(QtWidgets.QWidget):
         if safe_note is None:
             QtWidgets.QMessageBox.warning(self, "Open", "Geçersiz dosya yolu.")
             return
+        self._wb.fire(self._note_path)          # önceki notun bekleyen kaydı
         self._note_path = safe_note
         self.file_lbl.setText(str(safe_note.relative_to(self.proj_dir)))
         self._loading_note = True
         try:
             try:
-                self.editor.setPlainText(safe_note.read_text(encoding="utf-8"))
+                self.editor.setPlainText(self._wb.read_text(safe_note))
             except Exception:
                 self.editor.setPlainText("")
             self._update_preview()
@@ -688,14 +715,20 @@ class ProjectDetail(QtWidgets.QWidget):
                     QtWidgets.QMessageBox.information(self, "Open", f"Desteklenmeyen biçim: {p.suffix}")
             # klasöre çift tık: hiçbir şey yapma
 
-    def _save(self):
-        try:
-            self._note_path.parent.mkdir(parents=True, exist_ok=True)
-            self._note_path.write_text(self.editor.toPlainText(), encoding="utf-8")
-            self.meta["updated_at"] = now_iso()
-            write_json(self.proj_dir / META_DIR / META_FILE, self.meta)
-        except Exception as ex:
-            QtWidgets.QMessageBox.warning(self, "Save", f"Kaydedilemedi:\n{ex}")
+    def _note_text(self) -> str:
+        """Yazıcı debounce'u dolunca: editör metni + meta (updated_at) kuyruğa."""
+        self.meta["updated_at"] = now_iso()
+        self._wb.write_text(self.proj_dir / META_DIR / META_FILE, json.dumps(self.meta, ensure_ascii=False, indent=2))
+        return self.editor.toPlainText()
+
+    def save(self, force: bool = True):
+        """Notu + meta'yı hemen kuyruğa al (yazım arka planda, atomik); force=False → sadece bekleyen kayıt."""
+        if self._wb.is_pending(self._note_path): self._wb.fire(self._note_path)
+        elif force: self._wb.write_text(self._note_path, self._note_text())
+
+    def _save_failed(self, key: str, msg: str):
+        if Path(key) == self._note_path or self.proj_dir in Path(key).parents:
+            QtWidgets.QMessageBox.warning(self, "Save", f"Kaydedilemedi:\n{key}\n{msg}")
 
     # ---- Context actions ----
     def _action_new_note(self, target_dir: Path):
@@ -748,11 +781,7 @@ class ProjectDetail(QtWidgets.QWidget):
         try:
             last_dst = None
             for fn in files:
-                src = Path(fn)
-                dst = ensure_unique_path(target_dir / src.name)
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
-                last_dst = dst
+                last_dst = self._assets().import_into(Path(fn), target_dir)   # aynı görsel ikinci kez kopyalanmaz
             self._refresh_tree()
             self._refresh_gallery(last_dst)
         except Exception as ex:
@@ -805,11 +834,11 @@ class ProjectDetail(QtWidgets.QWidget):
         if not fn:
             return
         src = Path(fn)
-        dst = ensure_unique_path(self.gallery_dir / src.name)
         try:
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            rel = dst.relative_to(self._note_path.parent).as_posix()
+            assets = self._assets()
+            blob = assets.put(src)
+            dst = assets.import_into(src, self.gallery_dir, blob)      # galeride de görünsün
+            rel = assets.ref(blob, self._note_path)                     # not sabit blob yolunu kullanır
             cur = self.editor.textCursor()
             cur.insertText(f"\n![{src.stem}]({rel})\n")
             self.editor.setTextCursor(cur)
@@ -817,7 +846,7 @@ class ProjectDetail(QtWidgets.QWidget):
         except Exception as ex:
             QtWidgets.QMessageBox.warning(self, "Insert Image", f"Eklenemedi:\n{ex}")
 
-    def _refresh_gallery(self, prefer: Path | None = None):
+    def _refresh_gallery(self, prefer: Path | None = None, show: bool = True):
         self.gallery_dir.mkdir(parents=True, exist_ok=True)
         self._gallery_files = sorted([p for p in self.gallery_dir.rglob("*") if p.is_file() and is_image_file(p)])
         self.gallery_list.blockSignals(True)
@@ -833,6 +862,10 @@ class ProjectDetail(QtWidgets.QWidget):
             self.gallery_caption.setText("No image selected")
             return
         pick = prefer if prefer in self._gallery_files else self._gallery_files[0]
+        if not show:          # sadece liste tazelendi (izleyici); görsel yüklenmez, yarım kopyalanmış dosya uyarı açmaz
+            self._gallery_index = self._gallery_files.index(prefer) if prefer in self._gallery_files else -1
+            self.gallery_list.blockSignals(True); self.gallery_list.setCurrentRow(self._gallery_index); self.gallery_list.blockSignals(False)
+            return
         self._open_gallery_path(pick)
 
     def _open_gallery_path(self, p: Path):
@@ -995,6 +1028,7 @@ class ProjectsPage(QtWidgets.QWidget):
     def __init__(self, projects_dir: Path, fs=None, parent=None):
         super().__init__(parent)
         self.projects_dir = projects_dir; self.fs = fs
+        self._projects: dict[Path, dict] | None = None     # proje klasörü → meta (izleyici olaylarıyla güncellenir)
         self.templates_dir = (projects_dir.parent / "templates")
         self.templates_dir.mkdir(parents=True, exist_ok=True)
         self.projects_dir.mkdir(parents=True, exist_ok=True)
@@ -1063,21 +1097,46 @@ class ProjectsPage(QtWidgets.QWidget):
         self._refresh()
 
     # ------------- tarama -------------
+    def _read_project(self, d: Path) -> dict:
+        # Öncelik: .kaya/project.json; yoksa kökte project.json (eski projeler)
+        meta_path = d / META_DIR / META_FILE
+        if not meta_path.exists():
+            meta_path = d / META_FILE
+        meta=read_json(meta_path, DEFAULT_META)
+        if not meta.get("name"): meta["name"]=d.name
+        if not meta.get("created_at"): meta["created_at"]=now_iso()
+        if not meta.get("updated_at"): meta["updated_at"]=meta["created_at"]
+        return meta
+
     def _scan_projects(self):
-        out=[]
-        if not self.projects_dir.exists(): return out
-        for d in sorted(self.projects_dir.iterdir()):
-            if not d.is_dir(): continue
-            # Öncelik: .kaya/project.json; yoksa kökte project.json (eski projeler)
-            meta_path = d / META_DIR / META_FILE
-            if not meta_path.exists():
-                meta_path = d / META_FILE
-            meta=read_json(meta_path, DEFAULT_META)
-            if not meta.get("name"): meta["name"]=d.name
-            if not meta.get("created_at"): meta["created_at"]=now_iso()
-            if not meta.get("updated_at"): meta["updated_at"]=meta["created_at"]
-            out.append((d,meta))
-        return out
+        """Projeler önbellekten; ilk çağrıda klasör bir kez taranır, sonra _reload / izleyici olaylarıyla güncellenir."""
+        if self._projects is None:
+            self._projects = {}
+            if self.projects_dir.exists():
+                for d in self.projects_dir.iterdir():
+                    if d.is_dir(): self._projects[d] = self._read_project(d)
+        return sorted(self._projects.items())
+
+    def _reload(self, d: Path):
+        """Tek projeyi yeniden oku (silinmişse önbellekten çıkar)."""
+        if self._projects is None: return
+        if d.is_dir(): self._projects[d] = self._read_project(d)
+        else: self._projects.pop(d, None)
+
+    def on_vault_events(self, events):
+        """Vault izleyicisi: sadece klasörü ya da meta dosyası değişen projeler yeniden okunur."""
+        touched = set()
+        for e in events:
+            for p in (e.path, e.src):
+                if p is None: continue
+                try: rel = p.relative_to(self.projects_dir)
+                except ValueError: continue
+                if len(rel.parts) == 1 or (rel.parts and rel.name == META_FILE):
+                    touched.add(self.projects_dir / rel.parts[0])
+        if self._detail_widget is not None: self._detail_widget.on_vault_events(events)
+        if not touched or self._projects is None: return
+        for d in touched: self._reload(d)
+        if self.stack.currentWidget() is not self.page_detail: self._refresh()
 
     # ------------- UI yenile -------------
     def _refresh(self):
@@ -1160,6 +1219,7 @@ class ProjectsPage(QtWidgets.QWidget):
             f"# {name}\n\n- Hedefler\n- Notlar\n- Sonraki adımlar\n",
             encoding="utf-8"
         )
+        self._reload(pdir)
         self._refresh()
 
     def _copy_tree(self, src: Path, dst: Path):
@@ -1178,6 +1238,7 @@ class ProjectsPage(QtWidgets.QWidget):
         meta=read_json(meta_path, DEFAULT_META)
         self._list_page_index = self.stack.currentIndex()
         if getattr(self, "_detail_widget", None) is not None:
+            self._detail_widget.save(force=False)
             self._detail_widget.setParent(None)
             self._detail_widget.deleteLater()
         self._detail_widget = ProjectDetail(proj_dir, meta, self)
@@ -1189,6 +1250,8 @@ class ProjectsPage(QtWidgets.QWidget):
     def _close_project(self):
         self.stack.setCurrentIndex(getattr(self, "_list_page_index", 0))
         self.hdr_wrap.show()
+        if self._detail_widget is not None:
+            self._detail_widget.save(force=False); self._reload(self._detail_widget.proj_dir)   # updated_at
         self._refresh()
 
     # ------------- proje sil -------------
@@ -1207,6 +1270,7 @@ class ProjectsPage(QtWidgets.QWidget):
             shutil.rmtree(proj_dir)
         except Exception as ex:
             QtWidgets.QMessageBox.warning(self, "Delete Project", f"Silinemedi:\n{ex}")
+        self._reload(proj_dir)
         self._refresh()
 
 # ----------------- Yeni Proje Dialog -----------------
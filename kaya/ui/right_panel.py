@@ -1,10 +1,19 @@
 # kaya/ui/right_panel.py
 from PySide6 import QtWidgets, QtCore
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from pathlib import Path
+from datetime import date
 from .mini_calendar import MiniCalendar
+from .agenda_common import TAG_COLORS, set_text_keep_cursor
 import random
 
+# QtMultimedia (backend/codec yüklemesi pahalı) ilk çalmada import edilir → _multimedia()
+QMediaPlayer = QAudioOutput = None
+
+def _multimedia():
+    global QMediaPlayer, QAudioOutput
+    if QMediaPlayer is None:
+        from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
+
 def fmt(ms: int) -> str:
     if not ms or ms <= 0:
         return "00:00"
@@ -12,9 +21,10 @@ def fmt(ms: int) -> str:
     return f"{s//60:02d}:{s%60:02d}"
 
 class RightPanel(QtWidgets.QWidget):
-    def __init__(self, fs, parent=None):
+    def __init__(self, fs, afs, parent=None):
         super().__init__(parent)
         self.fs = fs
+        self.afs = afs          # ajanda ile aynı plan kaydı: ortak belge deposu (afs.docs) üzerinden
         self._i = -1
         self._dragging = False
 
@@ -53,13 +63,12 @@ class RightPanel(QtWidgets.QWidget):
 
         # ===== Timers =====
         self._clk = QtCore.QTimer(self); self._clk.setInterval(1000); self._clk.timeout.connect(self._tick); self._clk.start(); self._tick()
-        self._sv = QtCore.QTimer(self); self._sv.setSingleShot(True); self._sv.setInterval(500); self._sv.timeout.connect(self._save)
-        self._plan_path=None
+        self._plan_day=None
 
         # ===== Media backend =====
         self.audio = None
         self.player = None
-        self._build_player()  # ilk player
+        # player ilk çalmada kurulur (_start_track → _build_player)
 
         # Playlist
         self._pl: list[Path] = []
@@ -76,7 +85,11 @@ class RightPanel(QtWidgets.QWidget):
 
         # ===== Signals =====
         self.btoday.clicked.connect(self.today); self.cal.selectionChanged.connect(self.load_day)
-        self.plan.textChanged.connect(lambda: self._sv.start())
+        self.plan.textChanged.connect(self._edited)
+        self.afs.docs.changed.connect(self._doc_changed)
+        self.afs.docs.saved.connect(lambda d, kinds: "tags" in kinds and self.cal.refresh_markers())
+        self.cal.set_markers(lambda y, m: {day: [TAG_COLORS[t] for t, _ in pairs if t in TAG_COLORS]
+                                           for day, pairs in self.afs.month_tags(y, m).items()})
 
         self.list.itemClicked.connect(self._on_single_click)          # tek tık: sadece seç
         self.list.itemDoubleClicked.connect(self._on_double_click)    # çift tık: çal/baştan
@@ -96,7 +109,7 @@ class RightPanel(QtWidgets.QWidget):
         self.today()
         if self._pl:
             self.list.setCurrentRow(0); self._i = 0
-        self._sync_play_icon(self.player.playbackState() if self.player else QMediaPlayer.PlaybackState.StoppedState)
+        self._sync_play_icon(None)
 
     # ===== Player lifecycle =====
     def _build_player(self):
@@ -127,6 +140,7 @@ class RightPanel(QtWidgets.QWidget):
             self.audio = None
 
         # Yeni backend
+        _multimedia()
         self.audio = QAudioOutput(self)
         self.player = QMediaPlayer(self)
         self.player.setAudioOutput(self.audio)
@@ -143,15 +157,15 @@ class RightPanel(QtWidgets.QWidget):
     def _tick(self): self.clock.setText(QtCore.QTime.currentTime().toString("HH:mm"))
     def today(self): self.cal.setSelectedDate(QtCore.QDate.currentDate()); self.load_day()
     def load_day(self):
-        d=self.cal.selectedDate(); ymd=f"{d.year():04d}-{d.month():02d}-{d.day():02d}"; p=self.fs.day_note(ymd); self._plan_path=p
-        self.plan.blockSignals(True)
-        try: self.plan.setPlainText(p.read_text(encoding='utf-8'))
-        except Exception: self.plan.setPlainText('')
-        self.plan.blockSignals(False)
-    def _save(self):
-        if self._plan_path:
-            try: self._plan_path.write_text(self.plan.toPlainText(), encoding='utf-8')
-            except Exception: pass
+        d=self.cal.selectedDate(); self._plan_day=date(d.year(), d.month(), d.day())
+        try: set_text_keep_cursor(self.plan, self.afs.docs.text(self._plan_day, "plan"))
+        except Exception: set_text_keep_cursor(self.plan, '')
+    def _edited(self):
+        if self._plan_day: self.afs.docs.set(self._plan_day, "plan", self.plan.toPlainText(), self)
+    def _doc_changed(self, d, kind, source):
+        if source is self: return
+        if kind == "plan" and d == self._plan_day: set_text_keep_cursor(self.plan, self.afs.docs.text(d, "plan"))
+        elif kind == "tags" and source is None: self.cal.refresh_markers()
 
     # ===== Playlist yardımcıları =====
     def _current_path(self) -> Path|None:
@@ -186,7 +200,7 @@ class RightPanel(QtWidgets.QWidget):
     def _on_double_click(self, it):
         row = self.list.row(it)
         # aynı şarkı çalıyorsa başa sar
-        if self.player and self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState and row == self._i:
+        if self._playing() and row == self._i:
             self._start_track(row)   # restart
             return
         # aksi halde seç ve başlat
@@ -198,8 +212,7 @@ class RightPanel(QtWidgets.QWidget):
     def _on_play_pause(self):
         if not self._pl: return
         if self._i < 0: self._i = 0; self.list.setCurrentRow(0)
-        state = self.player.playbackState() if self.player else QMediaPlayer.PlaybackState.StoppedState
-        if state == QMediaPlayer.PlaybackState.PlayingState:
+        if self._playing():
             self.player.pause()
         else:
             # Eğer daha önce kaynak yüklenmediyse veya pause sonrası deadlock oluyorsa güvenli başlat
@@ -256,5 +269,8 @@ class RightPanel(QtWidgets.QWidget):
             except Exception: pass
 
     # ===== UI sync =====
+    def _playing(self) -> bool:
+        return self.player is not None and self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+
     def _sync_play_icon(self, state):
-        self.play.setText("■" if state == QMediaPlayer.PlaybackState.PlayingState else "▶")
+        self.play.setText("■" if state is not None and state == QMediaPlayer.PlaybackState.PlayingState else "▶")
@@ -20,7 +20,8 @@ QTreeView, QTableWidget {{
 QTreeView::item:selected, QTableWidget::item:selected {{ background:{sel}; color:{fg}; }}
 QSplitter::handle {{ background:{edge}; }}
 QFrame#daycell {{ background:{panel}; border:1px solid {edge}; }}
-QToolButton#weekhead {{ border:1px solid {edge}; }}
+QTableView#weekgrid {{ background:{panel}; border:none; }}
+QTableView#weekgrid QHeaderView::section {{ background:{panel}; border:1px solid {edge}; padding:4px; }}
 QToolBar {{ background:{panel}; border:1px solid {edge}; }}
 QMenu {{ background:{panel}; border:1px solid {edge}; }}
 QMenu::item:selected {{ background:{sel}; }}